@@ -0,0 +1,191 @@
+"""입장 제어 — 무거운 엔드포인트의 동시 실행 수를 묶고, 넘치면 기다리게 하거나 바로 503을 돌려준다.
+
+월말에 여러 명이 월 리뷰·이커머스 상세를 동시에 열면 컨테이너 하나가 프레임 사본과 집계 중간값으로
+메모리를 다 쓴다. 무거운 요청은 풀(POOLS)별 세마포어 + 전체 상한(HEAVY_TOTAL)을 통과해야 실행된다.
+
+- 자리가 없으면 풀별 대기열(queue)에서 최대 ADMISSION_WAIT_SECONDS 기다린다.
+  대기열이 차 있거나 시간 안에 자리가 안 나면 503 + Retry-After.
+- 가벼운 요청(health, 파일 목록, 옵션, 설정 등)은 풀에 속하지 않아 줄을 서지 않는다. 무거운 요청이
+  FastAPI 스레드풀(40)을 다 차지하지 못하도록 HEAVY_TOTAL을 그보다 훨씬 작게 둔다 — 가벼운 요청이 우선.
+- 조건부 GET 미들웨어 안쪽에 둔다. 304로 끝나는 재검증은 집계를 하지 않으므로 줄을 서지 않는다.
+- 대기·거절 지표는 snapshot()으로 (GET /api/admission/metrics).
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from responses import FastJSONResponse
+
+ADMISSION_WAIT_SECONDS = 15.0  # 대기열에서 기다리는 최대 시간. 일 리뷰 화면의 요청 타임아웃(60s)보다 충분히 짧게
+RETRY_AFTER_MIN = 2
+HEAVY_TOTAL = 6                # 모든 풀 합계 동시 실행
+
+# (풀 이름, 경로 접두(/api 제거 후 — http_cache._route_path), 동시 실행, 대기열 길이). 위에서부터 첫 일치.
+POOLS = (
+    ("monthly-review", ("/monthly-review/summary/",), 2, 8),
+    ("daily-review", ("/daily-review/summary/", "/daily-review/backtest/",
+                      "/daily-review/pace/", "/daily-review/watch/"), 2, 8),
+    ("ecommerce-details", ("/api/dashboard/ecommerce-details",), 2, 8),
+    ("dashboard-batch", ("/api/dashboard/batch",), 2, 4),
+    # 입력하는 대로 부르는 상품 검색 — 위젯 풀과 나눠 한 사람의 타이핑이 위젯 대기열을 채우지 않게.
+    # 새 키 입력이 이전 요청을 대신하므로 대기열은 짧게
+    ("product-search", ("/api/dashboard/product-search", "/api/dashboard/daily-product-search-sales"), 2, 4),
+    ("dashboard", ("/api/dashboard/",), 4, 16),
+)
+# 풀 접두와 겹치지만 가벼운 경로(계층 옵션은 캐시된 고유값 목록)
+EXEMPT = ("/api/dashboard/options", "/api/dashboard/channel-options")
+
+
+class _Gate:
+    """FIFO 세마포어 + 대기열 상한. 이벤트 루프 안에서만 쓴다(스레드 안전하지 않음)."""
+
+    def __init__(self, name: str, limit: int, queue: int):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.active = 0
+        self._waiters: deque = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.peak_waiting = 0
+        self._wait_total = 0.0
+        self._hold_total = 0.0
+        self._released = 0
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for f in self._waiters if not f.done())
+
+    async def acquire(self, timeout: float):
+        """자리를 얻으면 None, 못 얻으면 거절 사유('queue_full' | 'timeout')."""
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+            self.admitted += 1
+            return None
+        if timeout <= 0:
+            self.timed_out += 1
+            return "timeout"
+        if self.waiting >= self.queue:
+            self.rejected += 1
+            return "queue_full"
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            self._discard(fut)
+            self.timed_out += 1
+            return "timeout"
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()                 # 넘겨받은 자리를 돌려준다
+            self._discard(fut)
+            raise
+        self._wait_total += time.monotonic() - started
+        return None
+
+    def _discard(self, fut) -> None:
+        try:
+            self._waiters.remove(fut)
+        except ValueError:
+            pass
+
+    def release(self, held: Optional[float] = None) -> None:
+        """held: 실행에 쓴 시간(지표용). 실행 없이 자리만 돌려줄 때는 생략."""
+        if held is not None:
+            self._hold_total += held
+            self._released += 1
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)           # 자리를 그대로 다음 대기자에게 — active는 그대로
+                self.admitted += 1
+                return
+        self.active -= 1
+
+    def retry_after(self) -> int:
+        """대기열을 비우는 데 걸릴 대략의 초. 평균 점유 시간 × (대기 + 실행) / 동시 실행."""
+        avg_hold = self._hold_total / self._released if self._released else 1.0
+        return max(RETRY_AFTER_MIN, math.ceil(avg_hold * (self.waiting + self.active) / self.limit))
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit, "queue": self.queue,
+            "active": self.active, "waiting": self.waiting, "peak_waiting": self.peak_waiting,
+            "admitted": self.admitted, "rejected": self.rejected, "timed_out": self.timed_out,
+            "avg_wait_ms": round(self._wait_total / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "avg_hold_ms": round(self._hold_total / self._released * 1000, 1) if self._released else 0.0,
+        }
+
+
+_gates = {name: _Gate(name, limit, queue) for name, _, limit, queue in POOLS}
+_total = _Gate("total", HEAVY_TOTAL, sum(queue for *_, queue in POOLS))
+
+
+def pool_of(path: str):
+    from http_cache import _route_path
+    route = _route_path(path)
+    if route.startswith(EXEMPT):
+        return None
+    for name, prefixes, _, _ in POOLS:
+        if route.startswith(prefixes):
+            return name
+    return None
+
+
+def snapshot() -> dict:
+    return {"pools": {name: gate.snapshot() for name, gate in _gates.items()}, "total": _total.snapshot(),
+            "wait_seconds": ADMISSION_WAIT_SECONDS}
+
+
+async def _reject(scope, receive, send, gate: _Gate, reason: str) -> None:
+    response = FastJSONResponse(
+        {"detail": "요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.", "pool": gate.name, "reason": reason},
+        status_code=503,
+        headers={"Retry-After": str(gate.retry_after())},
+    )
+    await response(scope, receive, send)
+
+
+class AdmissionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "POST"):
+            await self.app(scope, receive, send)
+            return
+        name = pool_of(scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        gate = _gates[name]
+        deadline = time.monotonic() + ADMISSION_WAIT_SECONDS
+        reason = await gate.acquire(ADMISSION_WAIT_SECONDS)
+        if reason:
+            await _reject(scope, receive, send, gate, reason)
+            return
+        try:
+            reason = await _total.acquire(deadline - time.monotonic())
+        except BaseException:
+            gate.release()                     # 전체 상한을 기다리다 취소돼도 풀 자리는 돌려준다
+            raise
+        if reason:
+            gate.release()
+            await _reject(scope, receive, send, _total, reason)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            held = time.monotonic() - started
+            _total.release(held)
+            gate.release(held)
@@ -0,0 +1,147 @@
+"""협조적 취소 — 요청별 시간 예산과 클라이언트 연결 종료 감지.
+
+사용자가 화면을 떠나도 수 초짜리 집계(이커머스 상세, 월·일 리뷰)는 끝까지 돌고, 한 요청이 얼마나
+오래 돌 수 있는지도 제한이 없었다. 무거운 경로(admission.POOLS)는 BudgetMiddleware가 요청마다
+CancelToken을 contextvar로 심는다. 집계 코드는 단계 경계에서 checkpoint()를 부른다 —
+예산을 넘겼거나 연결이 끊겼으면 RequestCancelled가 나서 남은 단계를 건너뛴다.
+
+- 스레드풀(run_in_threadpool, 스트리밍 이터레이터)은 contextvar를 복사하므로 토큰이 그대로 따라간다.
+  직접 만든 실행기에 넘길 때는 contextvars.copy_context().run으로 감싼다(dashboard_batch).
+- 프로세스 풀(heavy_pool)에는 마감 시각과 작업별 취소 플래그를 넘긴다. 워커는 같은 마감으로 스스로
+  멈추고, 연결이 끊기면 부모가 플래그를 세워 그 작업만 멈춘다.
+- 단계마다 채워지는 중간 캐시(월 리뷰 집계·월별 summary, 일 리뷰 상태, 이커머스 세그먼트 결과)는
+  취소돼도 남는다. 다시 요청하면 남은 단계만 계산한다. 최종 응답은 끝까지 계산된 것만 결과 캐시에 들어간다.
+"""
+import asyncio
+import contextlib
+import contextvars
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+
+# 풀 이름(admission.POOLS) → 초. 대기열 시간은 포함하지 않는다(입장 후부터).
+BUDGETS = {
+    "monthly-review": 60,
+    "daily-review": 90,          # 백테스트 1년 구간
+    "ecommerce-details": 30,
+    "dashboard-batch": 60,
+    "product-search": 30,
+    "dashboard": 30,
+}
+
+_STATUS = {"budget": 504, "disconnect": 499}
+_DETAIL = {
+    "budget": "처리 시간이 제한을 넘어 중단했습니다. 범위를 줄이거나 잠시 후 다시 시도해 주세요.",
+    "disconnect": "클라이언트 연결이 끊겨 처리를 중단했습니다.",
+}
+
+
+class RequestCancelled(HTTPException):
+    """예산 초과(504) 또는 연결 종료(499)로 중단. 엔드포인트의 `except HTTPException: raise`를 그대로 통과한다."""
+
+    def __init__(self, reason: str):
+        super().__init__(status_code=_STATUS[reason], detail=_DETAIL[reason])
+        self.reason = reason
+
+    def __reduce__(self):          # 프로세스 풀 워커 → 부모로 넘어올 수 있게
+        return (RequestCancelled, (self.reason,))
+
+
+class CancelToken:
+    """deadline은 time.time() 기준(프로세스 간에 그대로 넘긴다). reason이 정해지면 취소 상태.
+
+    flag: 다른 프로세스가 세우는 취소 신호(is_set()이 있는 객체, 예: Manager Event). 서 있으면 연결 종료로 본다.
+    """
+
+    def __init__(self, deadline: Optional[float] = None, flag=None):
+        self.deadline = deadline
+        self.flag = flag
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str) -> None:
+        if self.reason is None:
+            self.reason = reason
+
+    @property
+    def cancelled(self) -> bool:
+        if self.reason is None and self.deadline is not None and time.time() >= self.deadline:
+            self.reason = "budget"
+        if self.reason is None and self.flag is not None and self.flag.is_set():
+            self.reason = "disconnect"
+        return self.reason is not None
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("request_cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current.get()
+
+
+def checkpoint() -> None:
+    """단계 경계. 현재 요청이 취소됐으면 RequestCancelled. 토큰이 없으면(테스트·스크립트) 아무것도 안 한다."""
+    token = _current.get()
+    if token is not None and token.cancelled:
+        raise RequestCancelled(token.reason)
+
+
+@contextlib.contextmanager
+def bind(token: Optional[CancelToken]):
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+class BudgetMiddleware:
+    """무거운 경로에 CancelToken을 심고, 연결 종료(http.disconnect)를 감시해 토큰을 취소한다.
+
+    요청 본문은 먼저 모두 받아 두었다가 앱에 그대로 넘긴다. 그 뒤의 receive는 감시 태스크가 읽는다.
+    입장 제어 안쪽에 둔다 — 예산은 대기열을 통과한 뒤부터 잰다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        from admission import pool_of
+        if scope["type"] != "http" or scope["method"] not in ("GET", "POST"):
+            await self.app(scope, receive, send)
+            return
+        budget = BUDGETS.get(pool_of(scope["path"]))
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+
+        pending = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return                                   # 대기 중에 이미 떠났다
+            pending.append(message)
+            if not message.get("more_body", False):
+                break
+
+        token = CancelToken(time.time() + budget)
+        disconnected = asyncio.Event()
+
+        async def watch():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            token.cancel("disconnect")
+            disconnected.set()
+
+        async def replay():
+            if pending:
+                return pending.pop(0)
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        watcher = asyncio.create_task(watch())
+        try:
+            with bind(token):
+                await self.app(scope, replay, send)
+        finally:
+            watcher.cancel()
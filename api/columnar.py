@@ -0,0 +1,156 @@
+"""열 방향 응답 형식 — format=columnar | arrow.
+
+이커머스 상세의 daily/monthly, 월 리뷰의 채널·브랜드 구조는 행 dict 배열이라 "Date", "판매액",
+"이익률" 같은 키가 수천 번 반복된다. 같은 내용을 열 배열로 바꿔 낸다.
+
+- columnar: 같은 키를 가진 dict들의 배열(레코드 배열)을
+  {"columns": [키...], "data": [[열0 값...], [열1 값...], ...], "length": n} 로 바꾼다.
+  레코드 안의 레코드 배열도 같은 규칙. 빈 배열·키가 섞인 배열·그 밖의 값은 그대로.
+- arrow: Apache Arrow IPC 스트림(application/vnd.apache.arrow.stream)을 이어 붙인 본문.
+  첫 스트림은 필드 없는 스키마 하나로, 메타데이터 "skeleton"에 응답 JSON이 들어 있다. 그 뒤로 레코드
+  배열(시리즈)의 모양(필드·타입 추론 결과)마다 스트림 하나 — 같은 모양의 시리즈는 행을 이어 붙인다
+  (이커머스 상세의 세그먼트별 daily/monthly). 골격의 시리즈 자리에는
+  {"$stream": k, "$offset": 행 시작, "$length": 행 수}(k = 골격 다음 k번째 스트림, 0부터)가 남는다.
+  반복이 많은 문자열 열(날짜·월)은 사전 인코딩. apache-arrow JS의 RecordBatchReader.readAll이 이어 붙인
+  스트림을 그대로 읽는다. ARROW_MIN_ROWS보다 짧거나 한 필드에 타입이 섞인 레코드 배열은 골격에 JSON 그대로 둔다.
+- 변환 결과도 결과 캐시에 둔다(shaped) — 큰 응답은 변환이 집계 못지않게 든다.
+"""
+import orjson
+from starlette.responses import Response
+
+from responses import dumps
+from result_cache import cached_result
+
+FORMATS = ("json", "columnar", "arrow")
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_MIN_ROWS = 16            # 이보다 짧은 시리즈는 스트림(스키마 메시지)보다 JSON이 작다
+
+
+def _records_keys(value):
+    """레코드 배열이면 키 목록, 아니면 None."""
+    if not isinstance(value, list) or not value or not isinstance(value[0], dict):
+        return None
+    keys = list(value[0])
+    for row in value:
+        if not isinstance(row, dict) or len(row) != len(keys) or any(k not in row for k in keys):
+            return None
+    return keys
+
+
+def to_columnar(obj):
+    """레코드 배열을 열 배열로(재귀). 원본은 건드리지 않는다 — 결과 캐시 항목을 그대로 넘겨도 된다."""
+    if isinstance(obj, dict):
+        return {k: to_columnar(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        keys = _records_keys(obj)
+        if keys is None:
+            return [to_columnar(v) for v in obj]
+        return {
+            "columns": keys,
+            "data": [[to_columnar(row[k]) for row in obj] for k in keys],
+            "length": len(obj),
+        }
+    return obj
+
+
+def _extract(obj, series: list):
+    """긴 레코드 배열을 Arrow 테이블로 series에 빼내고 그 자리에 {"$series": i}를 남긴 골격을 돌려준다."""
+    import pyarrow as pa
+
+    if isinstance(obj, dict):
+        return {k: _extract(v, series) for k, v in obj.items()}
+    if isinstance(obj, list):
+        if len(obj) >= ARROW_MIN_ROWS and _records_keys(obj) is not None:
+            try:
+                table = pa.Table.from_pylist(obj)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                table = None           # 한 필드에 타입이 섞였다 — JSON으로 둔다
+            if table is not None:
+                series.append(table)
+                return {"$series": len(series) - 1}
+        return [_extract(v, series) for v in obj]
+    return obj
+
+
+def _encode_strings(table):
+    """고유값이 행 수의 절반 이하인 문자열 열은 사전 인코딩(스트림당 사전 한 번)."""
+    import pyarrow as pa
+
+    columns = []
+    for column in table.columns:
+        column = column.combine_chunks()
+        if pa.types.is_string(column.type) and len(column.unique()) * 2 <= len(column):
+            column = column.dictionary_encode()
+        columns.append(column)
+    return pa.table(columns, names=table.column_names)
+
+
+def to_arrow(obj) -> bytes:
+    """골격 스트림 + 시리즈 모양별 스트림을 이어 붙인 Arrow IPC 바이트."""
+    import pyarrow as pa
+
+    series: list = []
+    skeleton = _extract(obj, series)
+    shapes: dict = {}                  # 스키마 → [시리즈 번호]
+    for i, table in enumerate(series):
+        shapes.setdefault(table.schema, []).append(i)
+    place = {}
+    for k, members in enumerate(shapes.values()):
+        offset = 0
+        for i in members:
+            place[i] = {"$stream": k, "$offset": offset, "$length": series[i].num_rows}
+            offset += series[i].num_rows
+
+    def fill(node):
+        if isinstance(node, dict):
+            return place[node["$series"]] if "$series" in node else {k: fill(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [fill(v) for v in node]
+        return node
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, pa.schema([], metadata={"skeleton": dumps(fill(skeleton))})):
+        pass
+    for members in shapes.values():
+        table = _encode_strings(pa.concat_tables([series[i] for i in members]))
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def shaped(endpoint: str, filename, params: dict, result, fmt: str, version=None):
+    """JSON 형태 결과를 fmt로. 변환 결과는 (endpoint, params + format) 키로 결과 캐시에 둔다.
+
+    fmt는 FORMATS 중 하나(엔드포인트에서 검증).
+    """
+    if fmt == "json":
+        return result
+    convert = to_columnar if fmt == "columnar" else to_arrow
+    body = cached_result(endpoint, filename, {**params, "format": fmt}, lambda: convert(result), version=version)
+    if fmt == "arrow":
+        return Response(content=body, media_type=ARROW_MEDIA_TYPE)
+    return body
+
+
+def from_arrow(data: bytes):
+    """to_arrow의 역변환(테스트·디버그용). 숫자 타입은 Arrow가 통일한 타입으로 돌아온다."""
+    import pyarrow as pa
+
+    source = pa.BufferReader(data)
+    head = pa.ipc.open_stream(source)
+    skeleton = orjson.loads(head.schema.metadata[b"skeleton"])
+    head.read_all()                    # 골격 스트림 끝(EOS)까지 — 다음 스트림 시작으로
+    streams = []
+    while source.tell() < len(data):
+        streams.append(pa.ipc.open_stream(source).read_all())
+
+    def fill(node):
+        if isinstance(node, dict):
+            if "$stream" in node:
+                return streams[node["$stream"]].slice(node["$offset"], node["$length"]).to_pylist()
+            return {k: fill(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [fill(v) for v in node]
+        return node
+
+    return fill(skeleton)
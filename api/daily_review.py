@@ -15,10 +15,14 @@ CSV의 '일별'은 소비자 주문일이 아니라 ERP 매출계상일이며(D2
 
 모든 상수는 260615.csv(418,049행) 3중 독립구현 백테스트로 확정했다. 근거는 각 상수 옆 주석 참조.
 """
+import base64
 import calendar
+import hashlib
+import json
 import logging
 import os
 import re
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
 from typing import Optional
 
@@ -27,11 +31,17 @@ import pandas as pd
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from cancellation import checkpoint
 from dashboard import get_dataframe, _resolve_file_hash
+from heavy_pool import run_heavy
 # 인프라 헬퍼는 월리뷰와 공유한다(복제 금지). monthly_review는 daily_review를 import하지 않으므로 순환 없음.
-from monthly_review import _ensure_file_on_disk, _load_targets, _resolve_api_key
+from monthly_review import (BRAND_TARGETS_FILE, PART_LABELS, PART_TO_TARGET_KEY, _cache_get, _cache_lock,
+                            _cache_put, _ensure_file_on_disk, _load_brand_targets, _load_targets, _resolve_api_key,
+                            _target_mtime)
+from responses import FastJSONRoute
+from result_cache import cached_result
 
-router = APIRouter(prefix="/daily-review", tags=["daily-review"])
+router = APIRouter(prefix="/daily-review", tags=["daily-review"], route_class=FastJSONRoute)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -70,11 +80,17 @@ ADJ_PRODUCT_CODE = "ZZZZ-ZZZZZ"   # 「금액 조정용」 ERP 조정 전표. 
 TARGET_FILE = "full_targets_extracted.csv"   # _load_targets는 인자가 없으면 None을 반환한다(monthly_review.py:112-113).
 
 NEEDED_COLS = ["일별", "채널구분", "거래처명", "품목그룹1", "품목코드", "품목명[규격]", "판매액"]
+OPTIONAL_COLS = ["파트구분"]   # 없으면 파트별 페이스만 억제한다(/pace/)
 WEEKDAY_KO = ["월", "화", "수", "목", "금", "토", "일"]
 UNCLASSIFIED = "미분류"    # 채널구분이 비었거나 '0'인 행. 매출에는 남기되 채널로 세지 않는다.
 BEVENT_GAP_MONTHS = 12     # B군 계상 지연 판정에 쓸 간격 표본 기간
 TOP_VENDORS = 8            # 주요 거래처 감시 패널에 상시 표시할 A군 거래처 수(60일 순매출 상위)
 TOP_PRODUCTS = 8           # 주요 상품 감시 패널에 표시할 A군 상품(SKU) 수
+WATCH_LEVELS = {"vendors": "거래처명", "products": "품목코드"}   # 전체 감시표(/watch/*) 축 → 엔티티 키
+WATCH_PAGE_SIZE = 50       # 전체 감시표 기본 페이지 크기
+WATCH_PAGE_MAX = 500
+WATCH_SORTS = ("net_60d", "net", "deviation", "ref_n", "name")
+BACKTEST_MAX_DAYS = 366    # 백테스트 1회 최대 구간(달력일). 상수 재검증은 1년 단위로 돌린다.
 BRANDS = ["마이비", "누비", "쏭레브"]   # 월 리뷰의 3대 브랜드(품목그룹1). 상시 감시 대상.
 # ★ 심화 감시(거래처/브랜드/상품)는 전부 A군 채널로 스코프한다. 배치 채널(쿠팡 사입·다이소)을 포함하면
 #   브랜드 일별이 오염된다(마이비 전채널 CV 1.68 → A군 스코프 0.68). 48회차 재검증 결과.
@@ -131,7 +147,7 @@ def _prep(filename: str) -> pd.DataFrame:
     if missing:
         raise HTTPException(status_code=400, detail=f"CSV에 컬럼이 없습니다: {missing}")
 
-    df = raw[NEEDED_COLS].copy()          # dashboard.py:695-705가 캐시 프레임을 in-place로 건드리는 전례가 있어 반드시 복사본을 쓴다
+    df = raw[NEEDED_COLS + [c for c in OPTIONAL_COLS if c in raw.columns]].copy()          # dashboard.py:695-705가 캐시 프레임을 in-place로 건드리는 전례가 있어 반드시 복사본을 쓴다
     if not pd.api.types.is_datetime64_any_dtype(df["일별"]):
         df["일별"] = pd.to_datetime(df["일별"], errors="coerce")
     df = df.dropna(subset=["일별"])
@@ -143,29 +159,51 @@ def _prep(filename: str) -> pd.DataFrame:
     df["거래처명"] = df["거래처명"].astype(str)   # 거래처 식별은 항상 R열(거래처명). C열 '거래처' 사용 금지.
     df["품목그룹1"] = df["품목그룹1"].astype(str)  # 브랜드
     df["품목코드"] = df["품목코드"].astype(str)
+    if "파트구분" in df.columns:
+        df["파트구분"] = df["파트구분"].astype(str).str.strip()
     return df
 
 
-def _watch_row(piv_ref: pd.DataFrame, name, tgt: pd.Timestamp, refs: pd.DatetimeIndex) -> dict:
-    """엔티티 하나의 '같은 요일 8주 범위 위치'. 심화 감시(거래처/브랜드/상품) 공통.
+def _ref_matrix(piv: pd.DataFrame, tgt: pd.Timestamp, refs: pd.DatetimeIndex) -> tuple[np.ndarray, np.ndarray]:
+    """(참조일 × 엔티티) 행렬과 대상일 벡터. 참조일에 계상이 없으면 0."""
+    return (piv.reindex(refs, fill_value=0.0).to_numpy(dtype=float),
+            piv.loc[tgt].to_numpy(dtype=float))
 
-    유효관측(같은 요일 계상일) < REF_MIN_VALID면 위치를 단정하지 않고 '표본 부족'.
+
+def _ref_stats(ref: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """열 방향 (유효관측 수, min, max, median). 0-채움 값은 유효관측으로 세지 않지만 min/max/median은 8슬롯 전부로 계산.
+
+    참조표본이 비면(같은 요일 정상코어일이 아직 없음) 통계는 NaN.
     """
-    v = piv_ref[name].reindex(refs, fill_value=0.0).to_numpy(dtype=float)
-    x = float(piv_ref.loc[tgt, name])
-    ref_n = int((v != 0).sum())
-    if ref_n < REF_MIN_VALID:
-        pos = "표본 부족"
-    elif x > v.max():
-        pos = "범위 상단 초과"
-    elif x < v.min():
-        pos = "범위 하단 미만"
-    else:
-        pos = "범위 내"
+    valid = (ref != 0).sum(axis=0)
+    if ref.shape[0] == 0:
+        empty = np.full(ref.shape[1], np.nan)
+        return valid, empty, empty, empty
+    return valid, ref.min(axis=0), ref.max(axis=0), np.median(ref, axis=0)
+
+
+def _ref_positions(piv_ref: pd.DataFrame, tgt: pd.Timestamp, refs: pd.DatetimeIndex,
+                   min_valid: int = REF_MIN_VALID) -> pd.DataFrame:
+    """엔티티 전체의 '같은 요일 8주 범위 위치'를 행렬 한 장으로. 심화 감시(거래처/브랜드/상품) 공통.
+
+    유효관측(같은 요일 계상일) < min_valid면 위치를 단정하지 않고 '표본 부족'.
+    """
+    ref, x = _ref_matrix(piv_ref, tgt, refs)
+    valid, lo, hi, med = _ref_stats(ref)
+    position = np.select([valid < min_valid, x > hi, x < lo],
+                         ["표본 부족", "범위 상단 초과", "범위 하단 미만"], "범위 내")
+    return pd.DataFrame({"net": x, "ref_min": lo, "ref_max": hi, "ref_median": med,
+                         "ref_n": valid, "position": position}, index=piv_ref.columns)
+
+
+def _watch_row(positions: pd.DataFrame, name) -> dict:
+    """_ref_positions 결과에서 엔티티 하나의 응답 행."""
+    r = positions.loc[name]
+    num = (lambda v: None if pd.isna(v) else float(v))
     return {
-        "net": x,
-        "ref_min": float(v.min()), "ref_max": float(v.max()), "ref_median": float(np.median(v)),
-        "ref_n": ref_n, "position": pos,
+        "net": float(r["net"]),
+        "ref_min": num(r["ref_min"]), "ref_max": num(r["ref_max"]), "ref_median": num(r["ref_median"]),
+        "ref_n": int(r["ref_n"]), "position": str(r["position"]),
     }
 
 
@@ -234,57 +272,72 @@ def _classify_with_hysteresis(piv: pd.DataFrame, stats: dict) -> pd.DataFrame:
 
 # ---------------------------------------------------------------- 월진행률 프로파일
 
-def _month_curve(month_net: pd.Series, year: int, month: int) -> Optional[np.ndarray]:
-    """한 달의 누적 진척 곡선을 '달력형'으로 만들어 진행률 그리드(0.01~1.00)에 보간.
-
-    ★ 관측일에만 점을 찍고 갭을 직선 보간하면 주말 구간에서 곡선이 미리 상승해
-      앵커가 2~8%p 부풀려진다(DOM12가 토·일인 달에서만 어긋난다). 계상 없는 날은 누적을 유지한다.
-    """
-    dim = calendar.monthrange(year, month)[1]
-    daily = np.zeros(dim + 1)
-    for d, v in month_net.items():
-        daily[d.day] = float(v)
-    cum = np.cumsum(daily)
-    total = cum[dim]
-    if total <= 0:
-        return None
-    xs = np.array([0.0] + [d / dim for d in range(1, dim + 1)])
-    ys = np.array([0.0] + [cum[d] / total for d in range(1, dim + 1)])
-    return np.interp(GRID, xs, ys)
+GRID = np.arange(0.01, 1.0001, 0.01)
 
 
-GRID = np.arange(0.01, 1.0001, 0.01)
+def _month_curves(daily: pd.Series, data_max: pd.Timestamp) -> tuple[list[pd.Period], np.ndarray]:
+    """학습 후보월 전부의 누적 진척 곡선을 (월 × 100 그리드) 배열 한 장으로. 파일·스코프당 한 번만 만든다.
 
+    daily = 일별 순매출(계상일 오름차순). 대상월과 무관한 학습창 조건은 여기서 거른다:
+    완결월 · unique date >= 18 · 월 >= 2025-01 · 순매출 > 0. '대상월 이전'은 _profile이 행을 잘라 적용한다.
 
-def _build_profile(df: pd.DataFrame, target_month: pd.Period) -> Optional[dict]:
-    """학습창: 완결월 중 unique date >= 18 AND 월 >= 2025-01 AND 순매출 > 0. 대상월 제외."""
-    data_max = df["일별"].max()
-    g = df.groupby(df["일별"].dt.to_period("M"))
-    curves, months = [], []
-    for period, sub in g:
-        if period >= target_month:
-            continue
+    곡선은 '달력형'이다. ★ 관측일에만 점을 찍고 갭을 직선 보간하면 주말 구간에서 곡선이 미리 상승해
+    앵커가 2~8%p 부풀려진다(DOM12가 토·일인 달에서만 어긋난다). 계상 없는 날은 누적을 유지한다.
+    """
+    periods = daily.index.to_period("M")
+    _, starts, counts = np.unique(periods.asi8, return_index=True, return_counts=True)
+    days = daily.index.day.to_numpy()
+    values = daily.to_numpy(dtype=float)
+
+    keep, rows = [], []
+    for a, n in zip(starts, counts):
+        period = periods[a]
         if str(period) < PROFILE_START:
             continue
         if pd.Timestamp(period.end_time.date()) > data_max:      # 완결월만
             continue
-        if sub["일별"].nunique() < PROFILE_MIN_UNIQUE_DAYS:
+        if n < PROFILE_MIN_UNIQUE_DAYS:
+            continue
+        if daily.iloc[a:a + n].sum() <= 0:
             continue
-        net_by_day = sub.groupby("일별")["판매액"].sum()
-        if net_by_day.sum() <= 0:
+        keep.append(period)
+        rows.append((a, n))
+
+    cal = np.zeros((len(keep), 32))                            # (월 × 1~31일). 계상 없는 날은 0 → 누적 유지
+    for i, (a, n) in enumerate(rows):
+        cal[i, days[a:a + n]] = values[a:a + n]
+    cum = np.cumsum(cal, axis=1)
+
+    months, curves = [], []
+    for i, period in enumerate(keep):
+        dim = period.days_in_month
+        total = cum[i, dim]
+        if total <= 0:
             continue
-        c = _month_curve(net_by_day, period.year, period.month)
-        if c is not None:
-            curves.append(c)
-            months.append(str(period))
-    if len(curves) < PROFILE_MIN_MONTHS:
+        xs = np.concatenate([[0.0], np.arange(1, dim + 1) / dim])
+        ys = np.concatenate([[0.0], cum[i, 1:dim + 1] / total])
+        months.append(period)
+        curves.append(np.interp(GRID, xs, ys))
+    return months, (np.vstack(curves) if curves else np.empty((0, len(GRID))))
+
+
+def _profile_from_curves(months: list[pd.Period], curves: np.ndarray, target_month: pd.Period) -> Optional[dict]:
+    """학습창: _month_curves 후보 중 대상월 이전 월. PROFILE_MIN_MONTHS 미만이면 None."""
+    sel = [i for i, m in enumerate(months) if m < target_month]
+    if len(sel) < PROFILE_MIN_MONTHS:
         return None
 
-    arr = np.vstack(curves)
+    arr = curves[sel]
     med = np.maximum.accumulate(np.median(arr, axis=0))          # 단조 증가 보정을 셋 다에 적용해 구현 간 차이를 원천 제거
     p25 = np.maximum.accumulate(np.percentile(arr, 25, axis=0))
     p75 = np.maximum.accumulate(np.percentile(arr, 75, axis=0))
-    return {"med": med, "p25": p25, "p75": p75, "months": months}
+    return {"med": med, "p25": p25, "p75": p75, "months": [str(months[i]) for i in sel]}
+
+
+def _build_profile(df: pd.DataFrame, target_month: pd.Period) -> Optional[dict]:
+    """프레임 하나로 대상월 프로파일을 바로 만든다(캐시 없이 쓰는 경로)."""
+    months, curves = _month_curves(df.groupby("일별")["판매액"].sum(), df["일별"].max())
+    return _profile_from_curves(months, curves, target_month)
 
 
 def _profile_at(profile: dict, progress: float) -> tuple[float, float, float]:
@@ -333,26 +386,20 @@ def _bevent_gap_status(days_since: int, gaps) -> dict:
 
 def _detect(piv: pd.DataFrame, target: pd.Timestamp, refs: pd.DatetimeIndex,
             gate: float, allow_surge: bool) -> list[dict]:
-    """같은 요일 8슬롯 참조표본 대비 범위 이탈 + 절대금액 게이트."""
+    """같은 요일 8슬롯 참조표본 대비 범위 이탈 + 절대금액 게이트.
+
+    (참조일 × 엔티티) 행렬 한 장으로 전 엔티티를 판정한다 — 거래처·SKU 수천 개도 채널 20개와 같은 한 번의 연산.
+    """
     out = []
     if len(refs) == 0 or target not in piv.index:
         return out
-    ref_vec = piv.reindex(refs, fill_value=0.0)
-    tgt = piv.loc[target]
-
-    for ent in piv.columns:
-        v = ref_vec[ent].to_numpy(dtype=float)
-        valid = int((v != 0).sum())                  # 0-채움 값은 유효관측으로 세지 않는다
-        if valid < REF_MIN_VALID:
-            continue
-        x = float(tgt[ent])
-        lo, hi, med = float(v.min()), float(v.max()), float(np.median(v))   # min/max/median은 8슬롯 전부로 계산
-        if allow_surge and x > hi and (x - med) >= gate:
-            kind = "surge"
-        elif x < lo and (med - x) >= gate:
-            kind = "drop"
-        else:
-            continue
+    ref, x = _ref_matrix(piv, target, refs)
+    valid, lo, hi, med = _ref_stats(ref)
+    surge = allow_surge & (x > hi) & ((x - med) >= gate)
+    drop = (x < lo) & ((med - x) >= gate)
+    for k in np.flatnonzero((valid >= REF_MIN_VALID) & (surge | drop)):   # 전 엔티티를 한 번에 판정, 카드는 걸린 것만
+        ent = piv.columns[k]
+        kind = "surge" if surge[k] else "drop"
         if isinstance(ent, str):
             entity = entity_display = ent          # 채널 레벨: 별칭 없음
         else:
@@ -364,79 +411,149 @@ def _detect(piv: pd.DataFrame, target: pd.Timestamp, refs: pd.DatetimeIndex,
             "entity": entity,
             "entity_display": entity_display,
             "kind": kind,
-            "value": x,
-            "ref_min": lo,
-            "ref_max": hi,
-            "ref_median": med,
-            "ref_valid": valid,
-            "gap": (x - hi) if kind == "surge" else (lo - x),
+            "value": float(x[k]),
+            "ref_min": float(lo[k]),
+            "ref_max": float(hi[k]),
+            "ref_median": float(med[k]),
+            "ref_valid": int(valid[k]),
+            "gap": float(x[k] - hi[k]) if kind == "surge" else float(lo[k] - x[k]),
         })
     return sorted(out, key=lambda r: -abs(r["gap"]))
 
 
-# ---------------------------------------------------------------- 엔드포인트
+# ---------------------------------------------------------------- 파일별 상태 캐시
+# 전처리 · 코어일 · 채널 피벗 · 60일 롤링 통계 · 히스테리시스 판정은 파일 내용에만 의존하고 대상일과 무관하다.
+# 롤링·히스테리시스는 앞에서부터 한 줄씩 진행하므로 전 기간으로 한 번 돌린 결과의 i행 = 대상일까지 잘라 돌린 결과의 i행.
+# 파일 해시 키라 재업로드 시 자동으로 새 키 → 무효화 불필요(월 리뷰 캐시와 같은 규약).
+# 상태 하나가 전처리 프레임 사본 + 피벗·큐브·감시표라 월 리뷰 summary보다 훨씬 크다 — 최근 몇 파일만 둔다.
+_STATE_CACHE_SIZE = 3
+_state_cache: "OrderedDict[str, dict]" = OrderedDict()
 
-@router.get("/summary/")
-def get_daily_review_summary(
-    filename: Optional[str] = Query(None, description="미지정 시 파일명 YYMMDD가 가장 큰 파일"),
-    target_date: Optional[str] = Query(None, description="YYYY-MM-DD. 미지정 시 최신 코어 계상일"),
-):
-    fname = filename or _latest_filename()
-    df = _prep(fname)
-    file_hash = _resolve_file_hash(fname, os.path.join(BASE_DIR, "uploads", fname))
-
-    core, normal = _core_days(df)
-    if len(normal) < AB_WINDOW:
-        return {"status": "no_data", "meta": {"filename": fname},
-                "message": f"정상 코어일이 {len(normal)}개뿐입니다(최소 {AB_WINDOW}개 필요)."}
 
-    data_max = df["일별"].max()
-    latest_core = core[-1]
+def clear_review_cache(file_hash: Optional[str] = None) -> None:
+    """일 리뷰 상태 캐시 비우기 (캐시 클리어 엔드포인트용). file_hash를 주면 그 파일 항목만."""
+    with _cache_lock:
+        if file_hash:
+            _state_cache.pop(file_hash, None)
+        else:
+            _state_cache.clear()
 
-    # ---- 대상일 결정
-    if target_date:
-        try:
-            tgt = pd.Timestamp(datetime.strptime(target_date, "%Y-%m-%d").date())
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"잘못된 날짜 포맷: {target_date} (YYYY-MM-DD)")
-        if tgt not in core:
-            prior = core[core < tgt]
-            return {
-                "status": "non_core_day",
-                "meta": {"filename": fname, "target_date": target_date,
-                         "weekday": WEEKDAY_KO[tgt.weekday()]},
-                "suggestion": str(prior[-1].date()) if len(prior) else None,
-                "message": f"{target_date}({WEEKDAY_KO[tgt.weekday()]})은 계상일이 아닙니다.",
-            }
-        target_source = "user"
-    else:
-        tgt = latest_core
-        target_source = "auto_latest"
 
-    dim = calendar.monthrange(tgt.year, tgt.month)[1]
-    dom = tgt.day
-    progress = dom / dim
-    is_eom = (dom == dim)
-    prior_core = core[core < tgt]
-    gap_days = (tgt - prior_core[-1]).days if len(prior_core) else None
-    post_gap = gap_days is not None and gap_days >= POST_GAP_DAYS
-
-    # ---- A/B 판정 (정상 코어일 기준, 히스테리시스 적용)
-    normal_upto = normal[normal <= tgt]
-    piv_ch = (df[df["일별"].isin(normal_upto)]
+def _build_state(df: pd.DataFrame) -> dict:
+    core, normal = _core_days(df)
+    piv_ch = (df[df["일별"].isin(normal)]
               .groupby(["일별", "채널구분"])["판매액"].sum()
               .unstack(fill_value=0.0)
-              .reindex(normal_upto, fill_value=0.0))
+              .reindex(normal, fill_value=0.0))
     stats = _channel_stats(piv_ch)
-    state = _classify_with_hysteresis(piv_ch, stats)
+    return {
+        "df": df,
+        "day_rows": df.groupby("일별").indices,          # 일자 → 행 위치(오름차순). 대상일 주변만 잘라 쓸 때 전표 스캔을 피한다.
+        "core": core,
+        "normal": normal,
+        "piv_ch": piv_ch,
+        "stats": stats,
+        "state": _classify_with_hysteresis(piv_ch, stats),
+        "code_first": df.drop_duplicates(["품목코드", "채널구분"]),   # (품목코드, 채널) 첫 행 — A군이 바뀌어도 상품명 첫 등장을 재현
+        "normal_by_weekday": {wd: normal[normal.weekday == wd] for wd in range(7)},   # 참조표본 색인
+        # (계상일 × 채널) 일 순매출. 코어일 큐브와 달리 비코어일도 싣는다 — B군 계상은 주말·공휴일에도 잡힌다.
+        "accrual": df.groupby(["일별", "채널구분"])["판매액"].sum().unstack(fill_value=0.0),
+        "cubes": {},                                      # (코어일 × 엔티티) 큐브. _cube가 키별로 처음 요청될 때 채운다.
+        "watch": OrderedDict(),                           # (축, 대상일) → 전체 감시표. _watch_table 참조.
+        "pace": {},                                       # 스코프 → 월 진척 곡선·월 순매출. _pace_curves 참조.
+        "data_max": df["일별"].max(),
+    }
 
-    # 대상일이 정상코어일이 아니면(=월말) 직전 정상코어일의 판정을 쓴다
-    class_day = tgt if tgt in normal_upto else normal_upto[-1]
-    ci = normal_upto.get_loc(class_day)
 
+def _review_state(fname: str) -> tuple[Optional[str], dict]:
+    """(파일 해시, 상태). 같은 내용이면 전처리·A/B 판정을 건너뛴다."""
+    if not _ensure_file_on_disk(fname):
+        raise HTTPException(status_code=404, detail=f"파일 없음: {fname}")
+    file_hash = _resolve_file_hash(fname, os.path.join(BASE_DIR, "uploads", fname))
+    st = _cache_get(_state_cache, file_hash) if file_hash else None
+    if st is not None:
+        return file_hash, st
+    df = _prep(fname)
+    checkpoint()
+    st = _build_state(df)
+    if file_hash:
+        _cache_put(_state_cache, file_hash, st, size=_STATE_CACHE_SIZE)
+    return file_hash, st
+
+
+def _rows_on(st: dict, days) -> pd.DataFrame:
+    """지정 일자들의 행(원본 행 순서 유지). df[df["일별"].isin(days)]와 같다."""
+    rows = st["day_rows"]
+    idx = [rows[d] for d in days if d in rows]
+    if not idx:
+        return st["df"].iloc[:0]
+    return st["df"].iloc[np.sort(np.concatenate(idx))]
+
+
+def _cube(st: dict, keys: tuple, adj_free: bool = False) -> pd.DataFrame:
+    """(코어일 × 엔티티) 순매출 큐브. 참조표본·대상일은 모두 코어일이라 행을 잘라 쓰기만 하면 된다.
+
+    대상일마다 9일치 행을 다시 피벗하는 것과 값이 같다(같은 그룹의 같은 행을 같은 순서로 합산).
+    창 안에 계상이 없는 엔티티는 0열로 남지만 유효관측 0이라 판정에서 빠진다.
+    """
+    memo = st["cubes"]
+    key = (keys, adj_free)
+    if key not in memo:
+        df = st["df"]
+        if adj_free:
+            df = df[df["품목코드"] != ADJ_PRODUCT_CODE]
+        memo[key] = _entity_series(df, st["core"], list(keys))
+    return memo[key]
+
+
+# ---------------------------------------------------------------- 대상일 단위 판정 (summary · backtest 공통)
+
+def _split(sub: pd.DataFrame) -> dict:
+    """총매출 / 반품 / 순매출 3분할."""
+    pos = float(sub.loc[sub["판매액"] > 0, "판매액"].sum())
+    neg = float(sub.loc[sub["판매액"] < 0, "판매액"].sum())
+    return {"gross": pos, "returns": neg, "net": pos + neg}
+
+
+def _day_context(st: dict, tgt: pd.Timestamp) -> dict:
+    """대상일의 달력 위치와 직전 코어일 간격."""
+    core = st["core"]
+    dim = calendar.monthrange(tgt.year, tgt.month)[1]
+    k = core.searchsorted(tgt)                         # core[:k] = 대상일 이전 코어일
+    prior = core[k - 1] if k else None
+    gap_days = (tgt - prior).days if prior is not None else None
+    return {
+        "dim": dim, "dom": tgt.day, "progress": tgt.day / dim, "is_eom": tgt.day == dim,
+        "prior_core": prior, "gap_days": gap_days,
+        "post_gap": gap_days is not None and gap_days >= POST_GAP_DAYS,
+    }
+
+
+def _day_flags(ctx: dict, total: dict) -> list[str]:
+    """반품 배치일 / 월말 마감 / 연휴 직후 플래그."""
+    return_batch = (abs(total["returns"]) >= RETURN_BATCH_MIN
+                    and abs(total["returns"]) >= total["gross"] * RETURN_BATCH_RATIO)
+    flags = []
+    if ctx["is_eom"]:
+        flags.append("month_end_batch")
+    if ctx["post_gap"]:
+        flags.append("post_gap")
+    if return_batch:
+        flags.append("return_batch")
+    return flags
+
+
+def _classify_day(st: dict, tgt: pd.Timestamp) -> tuple[list[dict], int]:
+    """(대상일의 채널 A/B 판정 목록, 판정 행 위치).
+
+    대상일이 정상코어일이 아니면(=월말) 직전 정상코어일의 판정을 쓴다. 어느 쪽이든 normal[k-1].
+    """
+    piv_ch, stats, state = st["piv_ch"], st["stats"], st["state"]
+    ci = int(st["normal"].searchsorted(tgt, side="right")) - 1
     channels = []
-    for c in piv_ch.columns:
-        j = piv_ch.columns.get_loc(c)
+    if ci < 0:
+        return channels, ci
+    for j, c in enumerate(piv_ch.columns):
         is_a = bool(state.iat[ci, j])
         cv = float(stats["cv"].iat[ci, j]) if pd.notna(stats["cv"].iat[ci, j]) else None
         days_seen = int(stats["days_seen"].iat[ci, j]) if pd.notna(stats["days_seen"].iat[ci, j]) else 0
@@ -452,86 +569,373 @@ def get_daily_review_summary(
             "net_60d": float(stats["net60"].iat[ci, j]),
             "allow_daily_series": is_a,
         })
+    return channels, ci
+
+
+def _ref_slots(st: dict, tgt: pd.Timestamp) -> pd.DatetimeIndex:
+    """참조표본: 같은 요일 · 직전 REF_SLOTS개 정상 코어일 (요일별 색인에서 잘라낸다)."""
+    same_wd = st["normal_by_weekday"][tgt.weekday()]
+    k = same_wd.searchsorted(tgt)
+    return pd.DatetimeIndex(same_wd[max(0, k - REF_SLOTS):k])
+
+
+def _a_scope(cube: pd.DataFrame, a_channels: list[str]) -> pd.DataFrame:
+    """큐브에서 A군 채널 소속 열만. 첫 레벨이 항상 채널구분."""
+    if isinstance(cube.columns, pd.MultiIndex):
+        return cube.loc[:, cube.columns.get_level_values(0).isin(a_channels)]
+    return cube.loc[:, cube.columns.isin(a_channels)]
+
+
+def _anomalies(st: dict, tgt: pd.Timestamp, refs: pd.DatetimeIndex, a_channels: list[str],
+               ctx: dict) -> tuple[list[dict], Optional[str]]:
+    """예외 판정 (A군 한정, 조정 전표 제외). (예외 카드, 억제 사유)."""
+    if ctx["is_eom"]:
+        return [], "월말 마감 계상일 — 전 채널이 동시 계상되므로 예외 판정을 실시하지 않습니다."
+    ref_days = pd.DatetimeIndex(list(refs) + [tgt])
+    allow_surge = not ctx["post_gap"]
+    anomalies = []
+    for level, keys, gate in (("channel", ("채널구분",), GATE_CHANNEL),
+                              ("account", ("채널구분", "거래처명"), GATE_ACCOUNT)):
+        piv = _a_scope(_cube(st, keys, adj_free=True), a_channels).loc[ref_days]
+        for r in _detect(piv, tgt, refs, gate, allow_surge):
+            r["level"] = level
+            anomalies.append(r)
+    anomalies.sort(key=lambda r: -abs(r["gap"]))
+    suppressed = None
+    if ctx["post_gap"]:
+        suppressed = f"직전 계상일과 {ctx['gap_days']}일 간격 — 밀린 마감이 하루에 실릴 수 있어 급증 판정을 실시하지 않습니다."
+    return anomalies, suppressed
+
+
+def _bgroup_events(st: dict, tgt: pd.Timestamp, b_channels: list[str]) -> list[dict]:
+    """B군 계상 이벤트 (금액 추이 없음. 이벤트만.)
+
+    (계상일 × 채널) 행렬을 대상일까지 잘라 전 B군 채널의 최종 계상일·경과일·12개월 계상 간격을 한 번에 낸다.
+    """
+    acc = st["accrual"]
+    days = acc.index
+    k = days.searchsorted(tgt, "right")                  # days[:k] = 대상일 이하
+    # 계상 간격은 최근 12개월 표본으로만 본다. 전 기간을 쓰면 과거의 다른 계상 리듬이 섞인다.
+    j0 = days.searchsorted(tgt - pd.DateOffset(months=BEVENT_GAP_MONTHS), "left")
+    vals = acc[b_channels].to_numpy(dtype=float)[:k]
+    hit = vals != 0
+    seen = hit.any(axis=0)
+    last = k - 1 - np.argmax(hit[::-1], axis=0)          # 채널별 마지막 계상 행
+    ords = days[:k].to_numpy().astype("datetime64[D]").astype(np.int64)
+    col, row = np.nonzero(hit[j0:].T)                    # 채널 순 → 일자 순
+    cuts = np.flatnonzero(np.diff(col)) + 1
+    gaps_by = {int(ch[0]): np.diff(ords[j0 + r]) for ch, r in zip(np.split(col, cuts), np.split(row, cuts)) if len(ch)}
+    today = vals[k - 1] if k and days[k - 1] == tgt else np.zeros(len(b_channels))
+
+    b_events = []
+    for i, c in enumerate(b_channels):
+        if not seen[i]:
+            continue
+        days_since = int((tgt - days[last[i]]).days)
+        status = _bevent_gap_status(days_since, gaps_by.get(i, np.array([], dtype=np.int64)))
+        b_events.append({
+            "channel": c,
+            "kind": status["kind"],
+            "dormant": status["dormant"],
+            "today_net": float(today[i]),
+            "last_accrual_date": str(days[last[i]].date()),
+            "last_accrual_net": float(vals[last[i], i]),
+            "days_since": days_since,
+            "message": status["message"],
+        })
+    # 확인(check) → 정상(info) → 휴면(dormant) 순. 죽어가는 채널은 맨 아래로.
+    b_events.sort(key=lambda e: (e["kind"] != "check", e["dormant"], -abs(e["today_net"])))
+    return b_events
+
+
+def _scope_rows(rows: pd.DataFrame, scope: tuple) -> pd.DataFrame:
+    """페이스 스코프로 행을 거른다. ("all", None) | ("part", 파트구분 라벨) | ("brand", 품목그룹1)."""
+    kind, value = scope
+    if kind == "part":
+        return rows[rows["파트구분"] == value]
+    if kind == "brand":
+        return rows[rows["품목그룹1"] == value]
+    return rows
+
+
+def _pace_curves(st: dict, scope: tuple) -> dict:
+    """스코프별 (후보월, 누적 곡선 배열, 월 순매출표). 파일 해시당 한 번 만들고 대상월별 프로파일은 그 안에 메모한다."""
+    memo = st["pace"]
+    if scope not in memo:
+        rows = _scope_rows(st["df"], scope)
+        months, curves = _month_curves(rows.groupby("일별")["판매액"].sum(), st["data_max"])
+        memo[scope] = {
+            "months": months,
+            "curves": curves,
+            "month_net": rows.groupby(rows["일별"].dt.to_period("M"))["판매액"].sum(),
+            "profiles": {},
+        }
+    return memo[scope]
+
+
+def _target_lookup(targets: Optional[pd.DataFrame], part_key: str) -> dict:
+    """목표 파일 → {'YYYY-MM': 목표}. 같은 월이 여러 줄이면 첫 줄."""
+    if targets is None:
+        return {}
+    rows = targets[targets["파트"] == part_key].drop_duplicates("월")
+    return dict(zip(rows["월"], rows["목표"].astype(float)))
+
+
+def _pace_model(st: dict, period: pd.Period, target_of: dict, scope: tuple = ("all", None)) -> dict:
+    """대상월 단위로 고정인 페이스 재료: 진척 프로파일 + 학습월 목표 달성률(base rate).
+
+    대상일과 무관하므로 같은 달의 여러 날(backtest)은 한 번 만든 것을 재사용한다.
+    """
+    cv = _pace_curves(st, scope)
+    if period not in cv["profiles"]:
+        cv["profiles"][period] = _profile_from_curves(cv["months"], cv["curves"], period)
+    profile = cv["profiles"][period]
+    base_rate = None
+    if profile is not None and target_of:
+        # base rate — 목표비를 신호등으로 못 쓰는 이유를 숫자로 병기한다(달성률 평균이 100%를 크게 밑돈다).
+        rates = []
+        for m in profile["months"]:
+            t = target_of.get(m)
+            if t is not None and t > 0:
+                rates.append(float(cv["month_net"].get(pd.Period(m, freq="M"), 0.0)) / t)
+        if rates:
+            base_rate = {
+                "mean_achievement": round(float(np.mean(rates)) * 100, 1),
+                "hit_100_count": int(sum(1 for r in rates if r >= 1.0)),
+                "n_months": len(rates),
+            }
+    return {"profile": profile, "base_rate": base_rate}
+
+
+def _mtd_pace(st: dict, tgt: pd.Timestamp, ctx: dict, target_of: dict, model: dict,
+              scope: tuple = ("all", None)) -> dict:
+    """MTD 페이스. model은 대상월·같은 스코프의 _pace_model 결과."""
+    profile = model["profile"]
+    dom, dim, progress, is_eom = ctx["dom"], ctx["dim"], ctx["progress"], ctx["is_eom"]
+    mtd = _split(_scope_rows(_rows_on(st, pd.date_range(tgt.replace(day=1), tgt)), scope))
+    month_str = f"{tgt.year}-{tgt.month:02d}"
+    tval = target_of.get(month_str)
+
+    stale = st["core"][-1] < tgt
+    pace = {
+        "month": month_str, "as_of_date": str(tgt.date()), "dom": dom, "days_in_month": dim,
+        "progress_ratio": round(progress, 4), "mtd": mtd, "target": tval,
+        "achievement_pct": round(mtd["net"] / tval * 100, 1) if tval else None,
+        "is_month_final": bool(is_eom),
+        "expected_share": None, "expected_mtd_band": None, "band_position": None,
+        "pace_index": None, "base_rate": None, "learned_months": None, "suppressed_reason": None,
+    }
+    if profile is None:
+        pace["suppressed_reason"] = "학습 가능한 완결월이 부족합니다."
+    elif tval is None:
+        # 브랜드 목표는 목표 파일이 아니라 brand_targets.csv에서 온다 — 고칠 파일을 가리킨다
+        source = os.path.basename(BRAND_TARGETS_FILE) if scope[0] == "brand" else "목표 파일"
+        pace["suppressed_reason"] = f"{month_str} 목표가 {source}에 없습니다."
+    else:
+        pace["learned_months"] = profile["months"]
+        # 밴드가 억제되는 날에도 반드시 보여야 하므로 밴드 계산 밖에서 붙인다.
+        pace["base_rate"] = model["base_rate"]
+
+        if is_eom:
+            # 진행률 100%면 기대 밴드가 목표 한 점으로 붕괴한다. 밴드가 아니라 달성률로 말해야 한다.
+            pace["suppressed_reason"] = "월 최종일 — 기대 밴드 대신 달성률로 표시합니다."
+        elif dom < PACE_BAND_MIN_DOM:
+            pace["suppressed_reason"] = f"월초(DOM {dom})는 예측 오차가 30%를 넘어 밴드를 표시하지 않습니다."
+        else:
+            med, p25, p75 = _profile_at(profile, progress)
+            low, high = tval * p25, tval * p75
+            pace["expected_share"] = {"med": round(med * 100, 1), "p25": round(p25 * 100, 1), "p75": round(p75 * 100, 1)}
+            pace["expected_mtd_band"] = {"low": low, "high": high}
+            pace["band_position"] = ("밴드 하회" if mtd["net"] < low
+                                     else "밴드 상회" if mtd["net"] > high else "밴드 내")
+            if dom >= PACE_INDEX_MIN_DOM and med > 0:
+                pace["pace_index"] = round(mtd["net"] / (tval * med) * 100, 1)
+    if stale:
+        pace["suppressed_reason"] = "데이터가 대상일까지 도착하지 않았습니다. 페이스 지표를 표시하지 않습니다."
+        pace["expected_mtd_band"] = pace["band_position"] = pace["pace_index"] = None
+    return pace
+
+
+def _main_channel(rows: pd.DataFrame, key: str) -> pd.Series:
+    """엔티티 → 대표 채널(행 수 최빈, 동률이면 먼저 등장한 채널).
+
+    엔티티마다 value_counts().index[0]를 부르는 것과 같은 규칙을 groupby 한 번으로.
+    """
+    g = rows.groupby([key, "채널구분"], sort=False).size().reset_index(name="n")
+    g["first"] = np.arange(len(g))                     # (엔티티, 채널) 첫 등장 순서
+    g = g.sort_values([key, "n", "first"], ascending=[True, False, True], kind="stable")
+    return g.drop_duplicates(key).set_index(key)["채널구분"]
+
+
+def _watch_table(st: dict, tgt: pd.Timestamp, level: str) -> tuple[pd.DataFrame, pd.DatetimeIndex]:
+    """(A군 스코프 엔티티 **전체**의 60일 순매출 + 같은 요일 8주 범위 위치, 참조일). 전체 감시표 /watch/* 용.
+
+    summary의 top-N 패널과 같은 규약(A군 · 같은 요일 8슬롯 · 유효관측 6)을 창 안 모든 엔티티에 적용한다.
+    행렬 한 장으로 계산하므로 비용은 top-N과 거의 같다. (파일, 대상일, 축)별로 상태 캐시에 보관해 페이지 넘김은 재계산하지 않는다.
+    """
+    memo = st["watch"]
+    cached = _cache_get(memo, (level, tgt))
+    if cached is not None:
+        return cached
+
+    key = WATCH_LEVELS[level]
+    channels, ci = _classify_day(st, tgt)
     a_channels = [c["name"] for c in channels if c["group"] == "A"]
+    refs = _ref_slots(st, tgt)
+    ref_days = pd.DatetimeIndex(list(refs) + [tgt])
+    win60 = st["normal"][max(0, ci - AB_WINDOW + 1):ci + 1]
+
+    ref_df = _rows_on(st, ref_days)
+    a_ref = ref_df[ref_df["채널구분"].isin(a_channels)]
+    win_df = _rows_on(st, win60)
+    a_win = win_df[win_df["채널구분"].isin(a_channels)]
+
+    net60 = a_win.groupby(key)["판매액"].sum()
+    piv = _entity_series(a_ref, ref_days, [key])
+    piv = piv.reindex(columns=piv.columns.union(net60.index), fill_value=0.0)   # 창 안에만 있고 참조일엔 없는 엔티티도 싣는다
+    tbl = _ref_positions(piv, tgt, refs)
+    tbl.index.name = key
+    tbl.insert(0, "net_60d", net60.reindex(tbl.index, fill_value=0.0))
+    tbl["deviation"] = np.select([tbl["position"] == "범위 상단 초과", tbl["position"] == "범위 하단 미만"],
+                                 [tbl["net"] - tbl["ref_max"], tbl["ref_min"] - tbl["net"]], 0.0)
+    # 대표 채널은 summary와 같이 60일 창 기준. 창 밖(참조일에만 계상)이면 참조일 행으로 보충.
+    tbl["channel"] = (_main_channel(a_win, key).reindex(tbl.index)
+                      .fillna(_main_channel(a_ref, key).reindex(tbl.index)))
+    if level == "vendors":
+        tbl["display"] = [_alias(n) for n in tbl.index]
+    else:
+        code_first = st["code_first"]
+        names = (code_first[code_first["채널구분"].isin(a_channels)]
+                 .drop_duplicates("품목코드").set_index("품목코드")["품목명[규격]"])
+        tbl["display"] = [str(names.get(c, c)) for c in tbl.index]
+    _cache_put(memo, (level, tgt), (tbl, refs))
+    return tbl, refs
 
-    # ---- 계상 현황 (총매출 / 반품 / 순매출 3분할, A군·B군 각각)
-    day_df = df[df["일별"] == tgt]
 
-    def split(sub):
-        pos = float(sub.loc[sub["판매액"] > 0, "판매액"].sum())
-        neg = float(sub.loc[sub["판매액"] < 0, "판매액"].sum())
-        return {"gross": pos, "returns": neg, "net": pos + neg}
+def _parse_day(value: str) -> pd.Timestamp:
+    try:
+        return pd.Timestamp(datetime.strptime(value, "%Y-%m-%d").date())
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"잘못된 날짜 포맷: {value} (YYYY-MM-DD)")
+
 
+def _non_core_day(fname: str, target_date: str, tgt: pd.Timestamp, core: pd.DatetimeIndex) -> dict:
+    prior = core[core < tgt]
+    return {
+        "status": "non_core_day",
+        "meta": {"filename": fname, "target_date": target_date,
+                 "weekday": WEEKDAY_KO[tgt.weekday()]},
+        "suggestion": str(prior[-1].date()) if len(prior) else None,
+        "message": f"{target_date}({WEEKDAY_KO[tgt.weekday()]})은 계상일이 아닙니다.",
+    }
+
+
+# ---------------------------------------------------------------- 엔드포인트
+
+@router.get("/summary/")
+def get_daily_review_summary(
+    filename: Optional[str] = Query(None, description="미지정 시 파일명 YYMMDD가 가장 큰 파일"),
+    target_date: Optional[str] = Query(None, description="YYYY-MM-DD. 미지정 시 최신 코어 계상일"),
+):
+    fname = filename or _latest_filename()
+    # 응답은 (파일 내용, 대상일, 목표 파일)의 순수 함수 — 결과 캐시에서 바로 꺼낸다.
+    return cached_result("daily-review/summary", fname, {"target_date": target_date},
+                         lambda: run_heavy("daily_review", "_daily_summary", fname, target_date),
+                         version=_target_mtime(TARGET_FILE))
+
+
+def _daily_summary(fname: str, target_date: Optional[str]) -> dict:
+    file_hash, st = _review_state(fname)
+    core, normal = st["core"], st["normal"]
+    if len(normal) < AB_WINDOW:
+        return {"status": "no_data", "meta": {"filename": fname},
+                "message": f"정상 코어일이 {len(normal)}개뿐입니다(최소 {AB_WINDOW}개 필요)."}
+
+    data_max = st["data_max"]
+    latest_core = core[-1]
+
+    # ---- 대상일 결정
+    if target_date:
+        tgt = _parse_day(target_date)
+        if tgt not in core:
+            return _non_core_day(fname, target_date, tgt, core)
+        target_source = "user"
+    else:
+        tgt = latest_core
+        target_source = "auto_latest"
+
+    ctx = _day_context(st, tgt)
+    dim, dom, progress = ctx["dim"], ctx["dom"], ctx["progress"]
+    prior_core, gap_days = ctx["prior_core"], ctx["gap_days"]
+
+    # ---- A/B 판정 (정상 코어일 기준, 히스테리시스 적용) — 전 기간 판정을 캐시에서 대상일 행으로 인덱싱
+    piv_ch, stats = st["piv_ch"], st["stats"]
+    channels, ci = _classify_day(st, tgt)
+    normal_upto = normal[:ci + 1]
+    class_day = normal_upto[-1]
+    a_channels = [c["name"] for c in channels if c["group"] == "A"]
+
+    # ---- 계상 현황 (총매출 / 반품 / 순매출 3분할, A군·B군 각각)
+    day_df = _rows_on(st, [tgt])
     a_df = day_df[day_df["채널구분"].isin(a_channels)]
     b_df = day_df[~day_df["채널구분"].isin(a_channels)]
-    snap = {"a_group": split(a_df), "b_group": split(b_df), "total": split(day_df)}
+    snap = {"a_group": _split(a_df), "b_group": _split(b_df), "total": _split(day_df)}
 
     # ---- 참조표본: 같은 요일 · 직전 8개 정상 코어일
-    same_wd = normal[(normal < tgt) & (pd.Series(normal).dt.weekday.values == tgt.weekday())]
-    refs = pd.DatetimeIndex(same_wd[-REF_SLOTS:])
+    refs = _ref_slots(st, tgt)
     ref_days = pd.DatetimeIndex(list(refs) + [tgt])
+    ref_df = _rows_on(st, ref_days)
 
-    ch_piv_ref = _entity_series(df, ref_days, ["채널구분"])
+    ch_piv_ref = _entity_series(ref_df, ref_days, ["채널구분"])
+    ch_pos = _ref_positions(ch_piv_ref, tgt, refs, min_valid=0)    # 채널 표는 '표본 부족' 없이 위치만
     a_rows = []
     for c in a_channels:
         if c not in ch_piv_ref.columns:
             continue
-        v = ch_piv_ref[c].reindex(refs, fill_value=0.0).to_numpy(dtype=float)
-        x = float(ch_piv_ref.loc[tgt, c])
-        pos = "범위 내"
-        if len(v) and x > v.max():
-            pos = "범위 상단 초과"
-        elif len(v) and x < v.min():
-            pos = "범위 하단 미만"
         j = piv_ch.columns.get_loc(c) if c in piv_ch.columns else None
         a_rows.append({
             "channel": c,
-            "net": x,
-            "ref_min": float(v.min()) if len(v) else None,
-            "ref_max": float(v.max()) if len(v) else None,
-            "ref_median": float(np.median(v)) if len(v) else None,
-            "ref_n": int((v != 0).sum()),
-            "position": pos,
+            **_watch_row(ch_pos, c),
             "high_variance": bool(j is not None and pd.notna(stats["cv"].iat[ci, j]) and stats["cv"].iat[ci, j] > 1.0),
         })
     snap["a_channels"] = sorted(a_rows, key=lambda r: -r["net"])
     snap["ref_dates"] = [str(d.date()) for d in refs]
     snap["footnote"] = "일별은 ERP 매출계상일입니다. 실제 주문일·출고일이 아닙니다."
 
+    checkpoint()
     # ---- 주요 거래처 감시 (A군 채널 소속 거래처 top-N, 상시). 월리뷰가 상시 파는 거래처 축을 일 단위로.
     # 채널 표와 같은 '같은 요일 8주 범위 위치' 규약. 별칭은 표시 전용, 매칭은 R열 exact.
-    a_only = df[df["채널구분"].isin(a_channels)]
+    a_ref = ref_df[ref_df["채널구분"].isin(a_channels)]
     win60 = normal_upto[-AB_WINDOW:] if len(normal_upto) >= AB_WINDOW else normal_upto
-    a_win = a_only[a_only["일별"].isin(win60)]
+    win_df = _rows_on(st, win60)
+    a_win = win_df[win_df["채널구분"].isin(a_channels)]
     net_by_vendor = a_win.groupby("거래처명")["판매액"].sum().sort_values(ascending=False)
-    # 거래처 → 대표 채널(창 안 최빈)
-    ven_channel = (a_win.groupby("거래처명")["채널구분"]
-                   .agg(lambda s: s.value_counts().index[0]) if not a_win.empty else {})
     top_names = [n for n in net_by_vendor.head(TOP_VENDORS).index if net_by_vendor[n] > 0]
-    ven_piv_ref = _entity_series(a_only, ref_days, ["거래처명"])
+    # 거래처 → 대표 채널(창 안 최빈). 표시할 top-N만 센다.
+    ven_channel = _main_channel(a_win[a_win["거래처명"].isin(top_names)], "거래처명")
+    ven_pos = _ref_positions(_entity_series(a_ref, ref_days, ["거래처명"]), tgt, refs)
     vendor_rows = []
     for name in top_names:
-        if name not in ven_piv_ref.columns:
+        if name not in ven_pos.index:
             continue
         vendor_rows.append({
             "account": name,
             "account_display": _alias(name),
             "channel": str(ven_channel[name]) if name in ven_channel else None,
             "net_60d": float(net_by_vendor[name]),
-            **_watch_row(ven_piv_ref, name, tgt, refs),
+            **_watch_row(ven_pos, name),
         })
     snap["top_vendors"] = vendor_rows
 
     # ---- 주요 브랜드 감시 (3대 브랜드, A군 스코프). 월 리뷰의 1차 조직축을 일 단위로.
     # A군 스코프 필수: 마이비 순매출 67.9%가 배치라 전 채널로는 오염. A군 한정 시 일CV 마이비 0.68/누비 0.65(48회차).
-    a_brand = a_only[a_only["품목그룹1"].isin(BRANDS)]
-    br_piv_ref = _entity_series(a_brand, ref_days, ["품목그룹1"])
-    br_win = (a_brand[a_brand["일별"].isin(win60)]
+    br_pos = _ref_positions(_entity_series(a_ref[a_ref["품목그룹1"].isin(BRANDS)], ref_days, ["품목그룹1"]), tgt, refs)
+    br_win = (a_win[a_win["품목그룹1"].isin(BRANDS)]
               .groupby(["일별", "품목그룹1"])["판매액"].sum().unstack("품목그룹1", fill_value=0.0)
               .reindex(win60, fill_value=0.0))
     brand_rows = []
     for b in BRANDS:                                  # 고정 순서(매출 축이 아니라 브랜드 정체성 축)
-        if b not in br_piv_ref.columns:
+        if b not in br_pos.index:
             continue
         col = br_win[b] if b in br_win.columns else pd.Series(0.0, index=win60)
         nz = col[col != 0]
@@ -541,153 +945,46 @@ def get_daily_review_summary(
             "net_60d": float(col.sum()),
             "cv": round(cv, 2) if cv is not None else None,
             "high_variance": bool(cv is not None and cv > 1.0),
-            **_watch_row(br_piv_ref, b, tgt, refs),
+            **_watch_row(br_pos, b),
         })
     snap["top_brands"] = brand_rows
 
     # ---- 주요 상품 감시 (A군 상품 top-N, 60일 순매출 상위). 월 리뷰가 파는 SKU 축을 일 단위로.
     # 예외 카드로 올리지 않는다: 상품 예외는 연 101건(0건인 날 45%)이라 '조용한 날은 짧게' 원칙을 깬다(48회차).
     # 감시 패널로만 — 히어로 SKU가 움직이면 보이되 예외 소음은 안 만든다.
-    prod_win = a_only[a_only["일별"].isin(win60)]
-    net_by_prod = prod_win.groupby("품목코드")["판매액"].sum().sort_values(ascending=False)
-    name_by_code = a_only.drop_duplicates("품목코드").set_index("품목코드")["품목명[규격]"]
+    net_by_prod = a_win.groupby("품목코드")["판매액"].sum().sort_values(ascending=False)
+    code_first = st["code_first"]
+    name_by_code = (code_first[code_first["채널구분"].isin(a_channels)]
+                    .drop_duplicates("품목코드").set_index("품목코드")["품목명[규격]"])
     top_codes = [c for c in net_by_prod.head(TOP_PRODUCTS).index if net_by_prod[c] > 0]
-    pr_piv_ref = _entity_series(a_only, ref_days, ["품목코드"])
+    pr_pos = _ref_positions(_entity_series(a_ref, ref_days, ["품목코드"]), tgt, refs)
     product_rows = []
     for code in top_codes:
-        if code not in pr_piv_ref.columns:
+        if code not in pr_pos.index:
             continue
         product_rows.append({
             "code": code,
             "name": str(name_by_code.get(code, code)),
             "net_60d": float(net_by_prod[code]),
-            **_watch_row(pr_piv_ref, code, tgt, refs),
+            **_watch_row(pr_pos, code),
         })
     snap["top_products"] = product_rows
 
     # ---- 반품 배치일 / 월말 마감 플래그
-    tot = snap["total"]
-    return_batch = (abs(tot["returns"]) >= RETURN_BATCH_MIN
-                    and abs(tot["returns"]) >= tot["gross"] * RETURN_BATCH_RATIO)
-    flags = []
-    if is_eom:
-        flags.append("month_end_batch")
-    if post_gap:
-        flags.append("post_gap")
-    if return_batch:
-        flags.append("return_batch")
+    flags = _day_flags(ctx, snap["total"])
 
+    checkpoint()
     # ---- 예외 판정 (A군 한정, 조정 전표 제외)
-    anomalies, suppressed = [], None
-    if is_eom:
-        suppressed = "월말 마감 계상일 — 전 채널이 동시 계상되므로 예외 판정을 실시하지 않습니다."
-    else:
-        adj_free = df[(df["품목코드"] != ADJ_PRODUCT_CODE) & (df["채널구분"].isin(a_channels))]
-        allow_surge = not post_gap
-        ch_piv = _entity_series(adj_free, ref_days, ["채널구분"])
-        ac_piv = _entity_series(adj_free, ref_days, ["채널구분", "거래처명"])
-        for r in _detect(ch_piv, tgt, refs, GATE_CHANNEL, allow_surge):
-            r["level"] = "channel"
-            anomalies.append(r)
-        for r in _detect(ac_piv, tgt, refs, GATE_ACCOUNT, allow_surge):
-            r["level"] = "account"
-            anomalies.append(r)
-        anomalies.sort(key=lambda r: -abs(r["gap"]))
-        if post_gap:
-            suppressed = f"직전 계상일과 {gap_days}일 간격 — 밀린 마감이 하루에 실릴 수 있어 급증 판정을 실시하지 않습니다."
+    anomalies, suppressed = _anomalies(st, tgt, refs, a_channels, ctx)
 
     # ---- B군 계상 이벤트 (금액 추이 없음. 이벤트만.)
-    b_events = []
-    gap_since = tgt - pd.DateOffset(months=BEVENT_GAP_MONTHS)
-    for c in [x["name"] for x in channels if x["group"] == "B"]:
-        s = df[df["채널구분"] == c].groupby("일별")["판매액"].sum()
-        s = s[(s != 0) & (s.index <= tgt)]
-        if s.empty:
-            continue
-        last = s.index.max()
-        days_since = int((tgt - last).days)
-        # 계상 간격은 최근 12개월 표본으로만 본다. 전 기간을 쓰면 과거의 다른 계상 리듬이 섞인다.
-        recent = s[s.index >= gap_since]
-        gaps = np.diff([d.toordinal() for d in recent.index])
-        status = _bevent_gap_status(days_since, gaps)
-        b_events.append({
-            "channel": c,
-            "kind": status["kind"],
-            "dormant": status["dormant"],
-            "today_net": float(s.get(tgt, 0.0)),
-            "last_accrual_date": str(last.date()),
-            "last_accrual_net": float(s.loc[last]),
-            "days_since": days_since,
-            "message": status["message"],
-        })
-    # 확인(check) → 정상(info) → 휴면(dormant) 순. 죽어가는 채널은 맨 아래로.
-    b_events.sort(key=lambda e: (e["kind"] != "check", e["dormant"], -abs(e["today_net"])))
+    b_events = _bgroup_events(st, tgt, [x["name"] for x in channels if x["group"] == "B"])
 
     # ---- MTD 페이스
-    m_start = tgt.replace(day=1)
-    mtd_df = df[(df["일별"] >= m_start) & (df["일별"] <= tgt)]
-    mtd = split(mtd_df)
     month_str = f"{tgt.year}-{tgt.month:02d}"
-
-    targets = _load_targets(TARGET_FILE)
-    tval = None
-    if targets is not None:
-        row = targets[(targets["월"] == month_str) & (targets["파트"] == "전체")]
-        if not row.empty:
-            tval = float(row["목표"].iloc[0])
-
-    profile = _build_profile(df, pd.Period(month_str, freq="M"))
+    target_of = _target_lookup(_load_targets(TARGET_FILE), "전체")
+    pace = _mtd_pace(st, tgt, ctx, target_of, _pace_model(st, pd.Period(month_str, freq="M"), target_of))
     stale = latest_core < tgt
-    pace = {
-        "month": month_str, "as_of_date": str(tgt.date()), "dom": dom, "days_in_month": dim,
-        "progress_ratio": round(progress, 4), "mtd": mtd, "target": tval,
-        "achievement_pct": round(mtd["net"] / tval * 100, 1) if tval else None,
-        "is_month_final": bool(is_eom),
-        "expected_share": None, "expected_mtd_band": None, "band_position": None,
-        "pace_index": None, "base_rate": None, "learned_months": None, "suppressed_reason": None,
-    }
-    if profile is None:
-        pace["suppressed_reason"] = "학습 가능한 완결월이 부족합니다."
-    elif tval is None:
-        pace["suppressed_reason"] = f"{month_str} 목표가 목표 파일에 없습니다."
-    else:
-        pace["learned_months"] = profile["months"]
-
-        # base rate — 목표비를 신호등으로 못 쓰는 이유를 숫자로 병기한다(달성률 평균이 100%를 크게 밑돈다).
-        # 밴드가 억제되는 날에도 반드시 보여야 하므로 밴드 계산 밖에서 구한다.
-        rates = []
-        for m in profile["months"]:
-            r = targets[(targets["월"] == m) & (targets["파트"] == "전체")]
-            if r.empty:
-                continue
-            t = float(r["목표"].iloc[0])
-            actual = float(df[df["일별"].dt.to_period("M") == pd.Period(m, freq="M")]["판매액"].sum())
-            if t > 0:
-                rates.append(actual / t)
-        if rates:
-            pace["base_rate"] = {
-                "mean_achievement": round(float(np.mean(rates)) * 100, 1),
-                "hit_100_count": int(sum(1 for r in rates if r >= 1.0)),
-                "n_months": len(rates),
-            }
-
-        if is_eom:
-            # 진행률 100%면 기대 밴드가 목표 한 점으로 붕괴한다. 밴드가 아니라 달성률로 말해야 한다.
-            pace["suppressed_reason"] = "월 최종일 — 기대 밴드 대신 달성률로 표시합니다."
-        elif dom < PACE_BAND_MIN_DOM:
-            pace["suppressed_reason"] = f"월초(DOM {dom})는 예측 오차가 30%를 넘어 밴드를 표시하지 않습니다."
-        else:
-            med, p25, p75 = _profile_at(profile, progress)
-            low, high = tval * p25, tval * p75
-            pace["expected_share"] = {"med": round(med * 100, 1), "p25": round(p25 * 100, 1), "p75": round(p75 * 100, 1)}
-            pace["expected_mtd_band"] = {"low": low, "high": high}
-            pace["band_position"] = ("밴드 하회" if mtd["net"] < low
-                                     else "밴드 상회" if mtd["net"] > high else "밴드 내")
-            if dom >= PACE_INDEX_MIN_DOM and med > 0:
-                pace["pace_index"] = round(mtd["net"] / (tval * med) * 100, 1)
-    if stale:
-        pace["suppressed_reason"] = "데이터가 대상일까지 도착하지 않았습니다. 페이스 지표를 표시하지 않습니다."
-        pace["expected_mtd_band"] = pace["band_position"] = pace["pace_index"] = None
 
     # ---- 데이터 신선도
     file_dt = None
@@ -724,7 +1021,7 @@ def get_daily_review_summary(
             "weekday": WEEKDAY_KO[tgt.weekday()],
             "dom": dom, "days_in_month": dim, "progress_ratio": round(progress, 4),
             "day_flags": flags,
-            "prior_core_date": str(prior_core[-1].date()) if len(prior_core) else None,
+            "prior_core_date": str(prior_core.date()) if prior_core is not None else None,
             "gap_days": gap_days,
         },
         "data_freshness": freshness,
@@ -748,6 +1045,302 @@ def get_daily_review_summary(
     }
 
 
+@router.get("/backtest/")
+def get_daily_review_backtest(
+    filename: Optional[str] = Query(None, description="미지정 시 파일명 YYMMDD가 가장 큰 파일"),
+    start_date: Optional[str] = Query(None, description="YYYY-MM-DD. 미지정 시 end_date 기준 최근 1년"),
+    end_date: Optional[str] = Query(None, description="YYYY-MM-DD. 미지정 시 최신 코어 계상일"),
+):
+    """구간 안의 모든 코어 계상일에 summary와 같은 판정(A/B군 · 예외 · B군 이벤트 · 페이스 밴드)을 낸다.
+
+    상수(GATE_* · REF_SLOTS · EXIT_STREAK 등) 재검증용. 대상일마다 처음부터 다시 계산하지 않는다:
+    A/B 판정은 캐시된 전 기간 롤링 통계·히스테리시스를 하루씩 인덱싱하고, 참조표본은 요일별 정상코어일 색인,
+    예외는 코어일 큐브에서 잘라 쓰며, 월진행률 프로파일·base rate는 월마다 한 번만 만든다.
+    심화 감시(거래처·브랜드·상품)는 판정이 아니라 표시 패널이라 포함하지 않는다.
+    """
+    fname = filename or _latest_filename()
+    return run_heavy("daily_review", "_daily_backtest", fname, start_date, end_date)
+
+
+def _daily_backtest(fname: str, start_date: Optional[str], end_date: Optional[str]) -> dict:
+    file_hash, st = _review_state(fname)
+    core, normal = st["core"], st["normal"]
+    if len(normal) < AB_WINDOW:
+        return {"status": "no_data", "meta": {"filename": fname},
+                "message": f"정상 코어일이 {len(normal)}개뿐입니다(최소 {AB_WINDOW}개 필요)."}
+
+    end = _parse_day(end_date) if end_date else core[-1]
+    start = _parse_day(start_date) if start_date else end - pd.Timedelta(days=BACKTEST_MAX_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail=f"start_date({start.date()})가 end_date({end.date()})보다 늦습니다.")
+    if (end - start).days + 1 > BACKTEST_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"백테스트 구간은 최대 {BACKTEST_MAX_DAYS}일입니다.")
+
+    target_of = _target_lookup(_load_targets(TARGET_FILE), "전체")
+    models: dict = {}
+    days = []
+    prev_groups: dict = {}
+    transitions: dict = {}
+    level_counts = {"channel": 0, "account": 0}
+    band_counts: dict = {}
+    for tgt in core[(core >= start) & (core <= end)]:
+        checkpoint()
+        channels, ci = _classify_day(st, tgt)
+        if ci < 0:
+            continue                                   # 첫 정상코어일 이전 — 판정 행이 없다
+        ctx = _day_context(st, tgt)
+        groups = {c["name"]: c["group"] for c in channels}
+        for name, g in groups.items():
+            if name in prev_groups and prev_groups[name] != g:
+                transitions[name] = transitions.get(name, 0) + 1
+        prev_groups = groups
+        a_channels = [c["name"] for c in channels if c["group"] == "A"]
+        b_channels = [c["name"] for c in channels if c["group"] == "B"]
+
+        refs = _ref_slots(st, tgt)
+        anomalies, suppressed = _anomalies(st, tgt, refs, a_channels, ctx)
+        for r in anomalies:
+            level_counts[r["level"]] += 1
+
+        period = tgt.to_period("M")
+        if period not in models:
+            models[period] = _pace_model(st, period, target_of)
+        pace = _mtd_pace(st, tgt, ctx, target_of, models[period])
+        if pace["band_position"]:
+            band_counts[pace["band_position"]] = band_counts.get(pace["band_position"], 0) + 1
+
+        days.append({
+            "date": str(tgt.date()),
+            "weekday": WEEKDAY_KO[tgt.weekday()],
+            "day_flags": _day_flags(ctx, _split(_rows_on(st, [tgt]))),
+            "a_group": a_channels,
+            "b_group": b_channels,
+            "ref_dates": [str(d.date()) for d in refs],
+            "anomalies": anomalies,
+            "anomalies_suppressed_reason": suppressed,
+            "bgroup_events": [
+                {"channel": e["channel"], "kind": e["kind"], "dormant": e["dormant"], "days_since": e["days_since"]}
+                for e in _bgroup_events(st, tgt, b_channels)
+            ],
+            "pace": {k: pace[k] for k in ("band_position", "pace_index", "achievement_pct",
+                                          "expected_share", "suppressed_reason")},
+        })
+
+    return {
+        "status": "ok",
+        "meta": {
+            "filename": fname, "file_hash": file_hash,
+            "start_date": str(start.date()), "end_date": str(end.date()), "n_days": len(days),
+            "constants": {
+                "ab_window": AB_WINDOW, "a_density_min": A_DENSITY_MIN, "a_days_min": A_DAYS_MIN,
+                "a_net_min": A_NET_MIN, "exit_net_min": EXIT_NET_MIN, "exit_density_min": EXIT_DENSITY_MIN,
+                "exit_streak": EXIT_STREAK, "gate_channel": GATE_CHANNEL, "gate_account": GATE_ACCOUNT,
+                "ref_slots": REF_SLOTS, "ref_min_valid": REF_MIN_VALID, "post_gap_days": POST_GAP_DAYS,
+            },
+        },
+        "totals": {
+            "ab_transitions": transitions,             # 채널별 A↔B 전환 횟수(G3: 전환 <= 2)
+            "anomaly_days": sum(1 for d in days if d["anomalies"]),
+            "anomalies": level_counts,
+            "bevent_checks": sum(1 for d in days for e in d["bgroup_events"] if e["kind"] == "check"),
+            "band_position": band_counts,
+        },
+        "days": days,
+    }
+
+
+
+@router.get("/pace/")
+def get_daily_review_pace(
+    filename: Optional[str] = Query(None, description="미지정 시 파일명 YYMMDD가 가장 큰 파일"),
+    target_date: Optional[str] = Query(None, description="YYYY-MM-DD. 미지정 시 최신 코어 계상일"),
+    brands: Optional[str] = Query(None, description="쉼표 구분 품목그룹1. 미지정 시 3대 브랜드"),
+):
+    """전사 · 파트 · 브랜드별 MTD 페이스 밴드. 규약은 summary의 pace와 같다.
+
+    스코프마다 월 진척 곡선 배열을 파일 해시당 한 번 만들고 대상월 프로파일은 그 배열에서 행만 골라
+    분위수를 내므로, 스코프를 늘려도 추가 비용은 스코프별 일 합계 한 번뿐이다.
+    목표: 전사·파트는 목표 파일(파트 = 전체/이커머스/오프라인), 브랜드는 brand_targets.csv.
+    """
+    fname = filename or _latest_filename()
+    return cached_result("daily-review/pace", fname, {"target_date": target_date, "brands": brands},
+                         lambda: run_heavy("daily_review", "_daily_pace", fname, target_date, brands),
+                         version=_target_mtime(TARGET_FILE))
+
+
+def _daily_pace(fname: str, target_date: Optional[str], brands: Optional[str]) -> dict:
+    file_hash, st = _review_state(fname)
+    core = st["core"]
+    if not len(core):
+        return {"status": "no_data", "meta": {"filename": fname}, "message": "코어 계상일이 없습니다."}
+    if target_date:
+        tgt = _parse_day(target_date)
+        if tgt not in core:
+            return _non_core_day(fname, target_date, tgt, core)
+    else:
+        tgt = core[-1]
+
+    ctx = _day_context(st, tgt)
+    period = tgt.to_period("M")
+    targets = _load_targets(TARGET_FILE)
+
+    def _block(scope: tuple, target_of: dict) -> dict:
+        return _mtd_pace(st, tgt, ctx, target_of, _pace_model(st, period, target_of, scope), scope)
+
+    parts = {}
+    for part, label in PART_LABELS.items():
+        if label is None:
+            continue
+        if "파트구분" not in st["df"].columns:
+            parts[part] = {"label": label, "suppressed_reason": "CSV에 '파트구분' 컬럼이 없습니다."}
+            continue
+        parts[part] = {"label": label, **_block(("part", label), _target_lookup(targets, PART_TO_TARGET_KEY[part]))}
+
+    brand_targets = _load_brand_targets()
+    brand_list = [b.strip() for b in brands.split(",") if b.strip()] if brands else BRANDS
+    return {
+        "status": "ok",
+        "meta": {"filename": fname, "file_hash": file_hash, "target_date": str(tgt.date()),
+                 "weekday": WEEKDAY_KO[tgt.weekday()]},
+        "total": _block(("all", None), _target_lookup(targets, "전체")),
+        "parts": parts,
+        "brands": {b: _block(("brand", b), {m: t[b] for m, t in brand_targets.items() if b in t})
+                   for b in brand_list},
+    }
+
+
+def _watch_cursor(offset: int, fingerprint: str) -> str:
+    raw = json.dumps({"o": offset, "f": fingerprint}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _watch_offset(cursor: Optional[str], fingerprint: str) -> int:
+    """cursor → offset. 다른 조회 조건(파일·대상일·정렬·필터)에서 받은 cursor는 거부한다."""
+    if not cursor:
+        return 0
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset, fp = int(data["o"]), data["f"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 cursor입니다.")
+    if fp != fingerprint or offset < 0:
+        raise HTTPException(status_code=400, detail="cursor가 현재 조회 조건과 맞지 않습니다. 첫 페이지부터 다시 조회하세요.")
+    return offset
+
+
+def _watch_page(level: str, filename: Optional[str], target_date: Optional[str], sort: str, order: str,
+                position: Optional[str], channel: Optional[str], q: Optional[str],
+                limit: int, cursor: Optional[str]) -> dict:
+    """전체 감시표 한 페이지 — 결과 캐시 경유. 키에 페이지 조건(정렬·필터·limit·cursor)을 모두 넣는다."""
+    fname = filename or _latest_filename()
+    params = {"target_date": target_date, "sort": sort, "order": order, "position": position,
+              "channel": channel, "q": q, "limit": limit, "cursor": cursor}
+    return cached_result(f"daily-review/watch/{level}", fname, params,
+                         lambda: run_heavy("daily_review", "_build_watch_page", fname, level, target_date, sort,
+                                           order, position, channel, q, limit, cursor))
+
+
+def _build_watch_page(fname: str, level: str, target_date: Optional[str], sort: str, order: str,
+                      position: Optional[str], channel: Optional[str], q: Optional[str],
+                      limit: int, cursor: Optional[str]) -> dict:
+    """감시표 한 페이지 계산. 정렬 동률은 엔티티 키 오름차순으로 고정해 페이지 경계가 흔들리지 않게 한다."""
+    if sort not in WATCH_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort는 {', '.join(WATCH_SORTS)} 중 하나여야 합니다.")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order는 asc 또는 desc여야 합니다.")
+
+    file_hash, st = _review_state(fname)
+    core, normal = st["core"], st["normal"]
+    if len(normal) < AB_WINDOW:
+        return {"status": "no_data", "meta": {"filename": fname},
+                "message": f"정상 코어일이 {len(normal)}개뿐입니다(최소 {AB_WINDOW}개 필요)."}
+    if target_date:
+        tgt = _parse_day(target_date)
+        if tgt not in core:
+            return _non_core_day(fname, target_date, tgt, core)
+    else:
+        tgt = core[-1]
+
+    tbl, refs = _watch_table(st, tgt, level)
+    key = WATCH_LEVELS[level]
+    view = tbl
+    if position:
+        view = view[view["position"].isin([p.strip() for p in position.split(",") if p.strip()])]
+    if channel:
+        view = view[view["channel"] == channel]
+    if q:
+        needle = q.strip().lower()
+        view = view[view.index.str.lower().str.contains(needle, regex=False)
+                    | view["display"].str.lower().str.contains(needle, regex=False)]
+    sort_col = "display" if sort == "name" else sort
+    view = (view.reset_index()
+            .sort_values([sort_col, key], ascending=[order == "asc", True], kind="stable", na_position="last"))
+
+    fingerprint = hashlib.sha1(json.dumps(
+        [file_hash, str(tgt.date()), level, sort, order, position, channel, q], ensure_ascii=False
+    ).encode()).hexdigest()[:16]
+    offset = _watch_offset(cursor, fingerprint)
+    page = view.iloc[offset:offset + limit]
+    num = (lambda v: None if pd.isna(v) else float(v))
+    name_field, display_field = ("account", "account_display") if level == "vendors" else ("code", "name")
+    items = [{
+        name_field: r[key],
+        display_field: r["display"],
+        "channel": None if pd.isna(r["channel"]) else str(r["channel"]),
+        "net_60d": float(r["net_60d"]),
+        "net": float(r["net"]),
+        "ref_min": num(r["ref_min"]), "ref_max": num(r["ref_max"]), "ref_median": num(r["ref_median"]),
+        "ref_n": int(r["ref_n"]),
+        "position": str(r["position"]),
+        "deviation": float(r["deviation"]),
+    } for r in page.to_dict("records")]
+    nxt = offset + len(items)
+    return {
+        "status": "ok",
+        "meta": {
+            "filename": fname, "file_hash": file_hash,
+            "target_date": str(tgt.date()), "weekday": WEEKDAY_KO[tgt.weekday()],
+            "ref_dates": [str(d.date()) for d in refs],
+            "total": int(len(view)), "entities": int(len(tbl)),
+            "sort": sort, "order": order, "limit": limit, "offset": offset,
+        },
+        "items": items,
+        "next_cursor": _watch_cursor(nxt, fingerprint) if nxt < len(view) else None,
+    }
+
+
+@router.get("/watch/vendors")
+def get_watch_vendors(
+    filename: Optional[str] = Query(None, description="미지정 시 파일명 YYMMDD가 가장 큰 파일"),
+    target_date: Optional[str] = Query(None, description="YYYY-MM-DD. 미지정 시 최신 코어 계상일"),
+    sort: str = Query("net_60d", description="net_60d | net | deviation | ref_n | name"),
+    order: str = Query("desc", description="asc | desc"),
+    position: Optional[str] = Query(None, description="쉼표 구분. 예: 범위 상단 초과,범위 하단 미만"),
+    channel: Optional[str] = Query(None, description="대표 채널(채널구분) exact"),
+    q: Optional[str] = Query(None, description="거래처명(원본·표시명) 부분 일치"),
+    limit: int = Query(WATCH_PAGE_SIZE, ge=1, le=WATCH_PAGE_MAX),
+    cursor: Optional[str] = Query(None, description="직전 응답의 next_cursor"),
+):
+    """A군 거래처 전체 감시표. summary의 top_vendors(상위 8)와 같은 규약을 롱테일까지."""
+    return _watch_page("vendors", filename, target_date, sort, order, position, channel, q, limit, cursor)
+
+
+@router.get("/watch/products")
+def get_watch_products(
+    filename: Optional[str] = Query(None, description="미지정 시 파일명 YYMMDD가 가장 큰 파일"),
+    target_date: Optional[str] = Query(None, description="YYYY-MM-DD. 미지정 시 최신 코어 계상일"),
+    sort: str = Query("net_60d", description="net_60d | net | deviation | ref_n | name"),
+    order: str = Query("desc", description="asc | desc"),
+    position: Optional[str] = Query(None, description="쉼표 구분. 예: 범위 상단 초과,범위 하단 미만"),
+    channel: Optional[str] = Query(None, description="대표 채널(채널구분) exact"),
+    q: Optional[str] = Query(None, description="품목코드·품목명 부분 일치"),
+    limit: int = Query(WATCH_PAGE_SIZE, ge=1, le=WATCH_PAGE_MAX),
+    cursor: Optional[str] = Query(None, description="직전 응답의 next_cursor"),
+):
+    """A군 상품(SKU) 전체 감시표. summary의 top_products(상위 8)와 같은 규약을 롱테일까지. 예외 카드가 아니라 표시 전용."""
+    return _watch_page("products", filename, target_date, sort, order, position, channel, q, limit, cursor)
+
+
 # ================================================================ AI 분석
 # 월 리뷰와 같은 구조(사용자 편집 지침 + Gemini)이나, **하드룰을 코드에 박는다**.
 # 이 페이지의 설계 전체가 "일 매출을 성과로 읽지 마라"인데, LLM은 두면 반드시 그걸 한다.
@@ -5,6 +5,11 @@ import calendar
 import logging
 import time
 import hashlib
+import fnmatch
+import threading
+from collections import OrderedDict
+
+from cancellation import checkpoint
 
 # In-memory cache for DataFrames, keyed by content SHA256 (filename as fallback)
 df_cache = {}
@@ -12,6 +17,16 @@ df_cache = {}
 # filename -> SHA256 hash mapping cache (avoids repeated DB lookups)
 _filename_hash_cache = {}
 
+# E-commerce details: (cube, per-segment results) per key like df_cache, most recent
+# DETAIL_CACHE_SIZE files only. Shared by request threads, the batch pool and the
+# materializer, so lookups and inserts hold _detail_cache_lock.
+DETAIL_CACHE_SIZE = 4
+_detail_cache = OrderedDict()
+_detail_cache_lock = threading.Lock()
+
+# Product-name search index (distinct names -> n-gram postings, row positions), keyed like df_cache
+_search_index_cache = {}
+
 
 def _resolve_file_hash(filename: str, file_path: str = None):
     """Resolve a filename to its current SHA256 hash.
@@ -119,6 +134,20 @@ def get_dataframe(filename: str):
     return df
 
 
+def cached_parquet_path(filename: str):
+    """Parquet cache path get_dataframe reads for this file, created on first use.
+
+    Returns None when the cache could not be written (other processes then have no
+    shared copy to read and must not be handed the file).
+    """
+    get_dataframe(filename)
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    file_hash = _resolve_file_hash(filename, os.path.join(base_dir, "uploads", filename))
+    parquet_name = f"{file_hash}.parquet" if file_hash else f"{filename}.parquet"
+    parquet_path = os.path.join(base_dir, "uploads", "cache", parquet_name)
+    return parquet_path if os.path.exists(parquet_path) else None
+
+
 def normalize_parquet_object_columns(df):
     """Normalize mixed object columns so pyarrow can persist them as parquet."""
     converted = []
@@ -148,9 +177,16 @@ def clear_df_cache(filename: str = None):
         # Legacy: earlier versions keyed df_cache by filename directly
         if filename in df_cache:
             del df_cache[filename]
+        for key in (old_hash, filename):
+            with _detail_cache_lock:
+                _detail_cache.pop(key, None)
+            _search_index_cache.pop(key, None)
     else:
         df_cache = {}
         _filename_hash_cache = {}
+        with _detail_cache_lock:
+            _detail_cache.clear()
+        _search_index_cache.clear()
         logging.info("Cleared entire DataFrame cache")
         
 def generate_yyyymm_range(start, end):
@@ -308,6 +344,26 @@ def get_days_in_month(year, month):
     """해당 연/월의 총 일수 반환"""
     return calendar.monthrange(year, month)[1]
 
+def _parse_date_series(dates):
+    """일별 컬럼 → datetime Series (파싱 실패는 NaT). 입력 Series는 건드리지 않는다.
+
+    YYYY-MM-DD를 먼저 고정 포맷으로 파싱하고, 나머지 행만 Excel serial → 추론 파싱.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    date_series = pd.to_datetime(dates, format='%Y-%m-%d', errors='coerce')
+    rest = date_series.isna() & dates.notna()
+    if rest.any():
+        numeric_dates = pd.to_numeric(dates[rest], errors='coerce')
+        date_series.loc[rest] = pd.to_datetime(numeric_dates, unit='D', origin='1899-12-30')
+        mask = date_series.isna() & dates.notna()
+        if mask.any():
+            try:
+                date_series.loc[mask] = pd.to_datetime(dates[mask], errors='coerce')
+            except Exception:
+                pass
+    return date_series
+
 def calculate_days_list(df, months):
     """
     각 월별 나눌 일수 리스트 반환 (with debug logs)
@@ -411,13 +467,9 @@ def get_monthly_sales_by_product_group(filename: str):
     """
     월별 품목그룹별 매출 데이터 반환
     """
-    # Use get_dataframe which handles encoding properly
+    # Use get_dataframe which handles encoding properly. It already renames the typo column
+    # and cleans 판매액/이익 at load; the cached frame is shared, so nothing here writes to it.
     df = get_dataframe(filename)
-    
-    if '거래쳐명' in df.columns:
-        df.rename(columns={'거래쳐명': '거래처명'}, inplace=True)
-        
-    df = clean_numeric_columns(df)
         
     # 필요한 컬럼 확인
     required_cols = ['월구분', '품목그룹1', '판매액', '이익']
@@ -702,8 +754,9 @@ def get_daily_hierarchical_sales(
     """
     df = get_dataframe(filename)
     
-    # 0. Date Processing (Global)
+    # 0. Date Processing (Global) — on our own copy; the cached frame is shared across threads
     date_col = '일별'
+    df_filtered = df.copy()
     
     # Check if date parsing is needed
     if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
@@ -715,10 +768,9 @@ def get_daily_hierarchical_sales(
                 date_series.loc[mask] = pd.to_datetime(df.loc[mask, date_col], errors='coerce')
             except Exception as e:
                 print(f"Date conversion error: {e}")
-        df[date_col] = date_series
+        df_filtered[date_col] = date_series
 
     # 1. Filtering Logic
-    df_filtered = df.copy()
     if group and group != 'all':
         df_filtered = df_filtered[df_filtered['품목그룹1'] == group]
     if category and category != 'all':
@@ -781,33 +833,57 @@ def get_monthly_summary(filename):
         
     date_col = '일별'
     
-    # 이미 datetime 형식이면 변환 불필요
-    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        numeric_dates = pd.to_numeric(df[date_col], errors='coerce')
-        date_series = pd.to_datetime(numeric_dates, unit='D', origin='1899-12-30')
-        mask = date_series.isna() & df[date_col].notna()
-        if mask.any():
-            try:
-                date_series.loc[mask] = pd.to_datetime(df.loc[mask, date_col], errors='coerce')
-            except Exception as e:
-                pass
-        df[date_col] = date_series
+    # 캐시된 공유 프레임에는 쓰지 않고 로컬 Series로만 변환한다.
+    dates = _parse_date_series(df[date_col])
+    valid = dates.notna().to_numpy()
+    if not valid.any():
+        return {}
 
-    df = df.dropna(subset=[date_col])
-    
-    # 월 컬럼 생성 (YYYY-MM)
-    df['Month'] = df[date_col].dt.strftime('%Y-%m')
+    # (카테고리 조합 × 일) 매출/행 수를 한 번에 집계하고, 월은 정수 키 (year*12 + month-1)
+    days = dates.to_numpy(dtype='datetime64[ns]')[valid].astype('datetime64[D]')
+    first_day, last_day = days.min(), days.max()
+    day_idx = (days - first_day).astype(np.int64)
+    n_days = int(day_idx.max()) + 1
+    calendar_dates = pd.date_range(first_day, last_day, freq='D')
+    day_month = (calendar_dates.year * 12 + calendar_dates.month - 1).to_numpy()
+    month_keys, month_start = np.unique(day_month, return_index=True)
+
+    combo_id, n_combos, dimensions = _factorize_combos(df, ['파트구분', '품목그룹1'], valid)
+    flat = combo_id * n_days + day_idx
+    day_sales = np.bincount(flat, weights=df['판매액'].to_numpy()[valid].astype(float), minlength=n_combos * n_days).reshape(n_combos, n_days)
+    day_rows = np.bincount(flat, minlength=n_combos * n_days).reshape(n_combos, n_days)
+
+    categories = {
+        "전체": {},
+        "이커머스": {'파트구분': '이커머스'},
+        "오프라인": {'파트구분': '오프라인'},
+        "마이비": {'품목그룹1': '마이비'},
+        "누비": {'품목그룹1': '누비'},
+        "쏭레브": {'품목그룹1': '쏭레브'}
+    }
+    memo = {}
+    cube = {"dimensions": dimensions, "n_combos": n_combos}
+    membership = np.vstack([_segment_mask(cube, filters, memo) for filters in categories.values()]).astype(float)
+    cat_day_sales = membership @ day_sales
+    cat_day_rows = membership @ day_rows
+
+    # (카테고리 × 월): 매출 합, 행 수, 실제 데이터 일수
+    cat_sales = np.add.reduceat(cat_day_sales, month_start, axis=1)
+    cat_rows = np.add.reduceat(cat_day_rows, month_start, axis=1)
+    cat_days = np.add.reduceat((cat_day_rows > 0).astype(np.int64), month_start, axis=1)
+
+    # 데이터가 있는 월 (정수 키, 오름차순)
+    present = np.flatnonzero(cat_rows[0] > 0)
+    month_str = lambda key: f"{key // 12:04d}-{key % 12 + 1:02d}"
     
     # 최근 2개 월 확인
-    unique_months = sorted(df['Month'].unique())
-    if not unique_months:
-        return {}
-        
-    current_month = unique_months[-1]
-    prev_month = unique_months[-2] if len(unique_months) >= 2 else None
+    current = present[-1]
+    prev = present[-2] if len(present) >= 2 else None
+    current_month = month_str(month_keys[current])
+    prev_month = month_str(month_keys[prev]) if prev is not None else None
     
     # 데이터 전체에서의 마지막 날짜 (기준일)
-    max_date = df[date_col].max()
+    max_date = dates[valid].max()
     max_date_str = max_date.strftime('%Y-%m-%d')
     
     results = {
@@ -819,35 +895,26 @@ def get_monthly_summary(filename):
         "data": {}
     }
     
-    # 월별 달력 일수 계산 함수
-    import calendar
-    def get_calendar_days(month_str):
-        """YYYY-MM 형식의 월에서 해당 월의 달력 일수 반환"""
-        try:
-            year, month = map(int, month_str.split('-'))
-            return calendar.monthrange(year, month)[1]
-        except:
-            return 30  # 기본값
+    def get_calendar_days(idx):
+        """월 인덱스의 달력 일수"""
+        key = month_keys[idx]
+        return calendar.monthrange(key // 12, key % 12 + 1)[1]
     
-    def calculate_stats(sub_df, month, use_calendar_days=False):
+    def calculate_stats(c, idx, use_calendar_days=False):
         """
         월별 통계 계산
         use_calendar_days=True: 달력 일수로 일평균 계산 (과거 달)
         use_calendar_days=False: 실제 데이터 일수로 계산 (당월)
         """
-        if sub_df.empty:
-            return {"total": 0, "daily_avg": 0, "days_count": 0}
-        
-        monthly_data = sub_df[sub_df['Month'] == month]
-        if monthly_data.empty:
+        if idx is None or cat_rows[c, idx] == 0:
              return {"total": 0, "daily_avg": 0, "days_count": 0}
              
-        total_sales = monthly_data['판매액'].sum()
-        actual_days = monthly_data[date_col].nunique()
+        total_sales = cat_sales[c, idx]
+        actual_days = int(cat_days[c, idx])
         
         if use_calendar_days:
             # 과거 달: 달력 일수 사용
-            days_for_avg = get_calendar_days(month)
+            days_for_avg = get_calendar_days(idx)
         else:
             # 당월: 실제 데이터 일수 사용
             days_for_avg = actual_days
@@ -855,58 +922,21 @@ def get_monthly_summary(filename):
         daily_avg = total_sales / days_for_avg if days_for_avg > 0 else 0
         
         return {"total": total_sales, "daily_avg": daily_avg, "days_count": actual_days}
-
-    def calculate_latest_day_sales(sub_df):
-        """
-        최근 날짜(max_date)의 매출 계산
-        해당 날짜에 데이터가 없으면 0 반환
-        """
-        if sub_df.empty:
-            return 0
-        
-        # 날짜를 date로 변환하여 비교 (시간 부분 제거)
-        latest_data = sub_df[sub_df[date_col].dt.date == max_date.date()]
-        
-        if latest_data.empty:
-            return 0
-        
-        total = latest_data['판매액'].sum()
-        # NaN 체크
-        if pd.isna(total):
-            return 0
-        
-        return int(total)
-    
-    categories = {
-        "전체": lambda d: d,
-        "이커머스": lambda d: d[d['파트구분'] == '이커머스'],
-        "오프라인": lambda d: d[d['파트구분'] == '오프라인'],
-        "마이비": lambda d: d[d['품목그룹1'] == '마이비'],
-        "누비": lambda d: d[d['품목그룹1'] == '누비'],
-        "쏭레브": lambda d: d[d['품목그룹1'] == '쏭레브']
-    }
     
     # 최근 3개월 목록 결정 (당월 제외, 이전 3개월)
-    last_3_months = unique_months[-4:-1] if len(unique_months) >= 4 else unique_months[:-1] if len(unique_months) > 1 else []
-    
-    # 전년 동월 계산 (예: 2026-02 -> 2025-02)
-    def get_prev_year_month(month_str):
-        year, month = month_str.split('-')
-        prev_year = int(year) - 1
-        return f"{prev_year}-{month}"
+    last_3_months = present[-4:-1] if len(present) >= 4 else present[:-1]
     
-    prev_year_month = get_prev_year_month(current_month)
+    # 전년 동월 (예: 2026-02 -> 2025-02). 데이터 범위 밖이면 None
+    prev_year_key = month_keys[current] - 12
+    prev_year = np.searchsorted(month_keys, prev_year_key)
+    prev_year = prev_year if prev_year < len(month_keys) and month_keys[prev_year] == prev_year_key else None
     
-    def calculate_multi_month_stats(sub_df, months_list):
+    def calculate_multi_month_stats(c, months_list):
         """여러 개월의 합산 통계 계산 (모두 과거 달이므로 달력 일수 사용)"""
-        if sub_df.empty or not months_list:
+        if len(months_list) == 0 or cat_rows[c, months_list].sum() == 0:
             return {"total": 0, "daily_avg": 0, "days_count": 0}
         
-        multi_month_data = sub_df[sub_df['Month'].isin(months_list)]
-        if multi_month_data.empty:
-            return {"total": 0, "daily_avg": 0, "days_count": 0}
-        
-        total_sales = multi_month_data['판매액'].sum()
+        total_sales = cat_sales[c, months_list].sum()
         
         # 달력 일수 합산
         calendar_days_total = sum(get_calendar_days(m) for m in months_list)
@@ -914,26 +944,21 @@ def get_monthly_summary(filename):
         
         return {"total": total_sales, "daily_avg": daily_avg, "days_count": calendar_days_total}
     
-    for key, filter_func in categories.items():
-        subset = filter_func(df)
-        
+    for c, key in enumerate(categories):
         # 당월: 실제 데이터 일수 사용
-        curr_stats = calculate_stats(subset, current_month, use_calendar_days=False)
+        curr_stats = calculate_stats(c, current, use_calendar_days=False)
         
         # 전월: 달력 일수 사용
-        if prev_month:
-            prev_stats = calculate_stats(subset, prev_month, use_calendar_days=True)
-        else:
-            prev_stats = {"total": 0, "daily_avg": 0, "days_count": 0}
+        prev_stats = calculate_stats(c, prev, use_calendar_days=True)
         
-        # 당일매출 계산
-        latest_day_sales = calculate_latest_day_sales(subset)
+        # 당일매출: 기준일(max_date)의 매출, 데이터가 없으면 0
+        latest_day_sales = int(cat_day_sales[c, -1]) if cat_day_rows[c, -1] > 0 else 0
         
         # 최근 3개월 통계 (모두 과거 달 - 달력 일수 사용)
-        last_3_stats = calculate_multi_month_stats(subset, last_3_months)
+        last_3_stats = calculate_multi_month_stats(c, last_3_months)
         
         # 전년 동월 통계 (과거 달 - 달력 일수 사용)
-        prev_year_stats = calculate_stats(subset, prev_year_month, use_calendar_days=True)
+        prev_year_stats = calculate_stats(c, prev_year, use_calendar_days=True)
         
         # Growth Rate (Current Daily Avg vs Prev Daily Avg)
         if prev_stats['daily_avg'] > 0:
@@ -965,8 +990,8 @@ def analyze_sales_performance(filename):
     if df.empty:
         return []
 
-    # Column Cleaning: Remove trailing tabs and spaces
-    df.columns = [str(c).strip() for c in df.columns]
+    # Column Cleaning: Remove trailing tabs and spaces (on a view — the cached frame is shared across threads)
+    df = df.set_axis([str(c).strip() for c in df.columns], axis=1, copy=False)
     
     # Required columns mapping
     # Note: '거래쳐명' might be '거래처명' or have other chars. Using filtering.
@@ -985,108 +1010,111 @@ def analyze_sales_performance(filename):
         'product_cat2': '품목 구분_2'
     }
 
-    # Date Parsing (Robust)
-    if not pd.api.types.is_datetime64_any_dtype(df[cols['date']]):
-        numeric_dates = pd.to_numeric(df[cols['date']], errors='coerce')
-        date_series = pd.to_datetime(numeric_dates, unit='D', origin='1899-12-30')
-        mask = date_series.isna() & df[cols['date']].notna()
-        if mask.any():
-            try:
-                date_series.loc[mask] = pd.to_datetime(df.loc[mask, cols['date']], errors='coerce')
-            except: pass
-        df[cols['date']] = date_series
-    
-    df = df.dropna(subset=[cols['date']])
-    df['Month'] = df[cols['date']].dt.to_period('M')
-
-    # Latest Month (Target)
-    unique_months = sorted(df['Month'].unique())
-    if not unique_months: return []
-    
-    curr_month = unique_months[-1]
-    prev_month = unique_months[-2] if len(unique_months) >= 2 else None
-    
-    # 3-Month Average (Excluding current)
-    last_3_months = unique_months[-4:-1] if len(unique_months) >= 4 else []
-    
-    # Same Month Last Year
-    yoy_month = curr_month - 12 if len(unique_months) >= 13 else None 
-
-    alerts = []
-
-    def get_period_stats(sub_df, period_months):
-        if not period_months: return None
-        if isinstance(period_months, pd.Period): period_months = [period_months]
-        
-        target_data = sub_df[sub_df['Month'].isin(period_months)]
-        if target_data.empty: return None
-        
-        sales = target_data[cols['sales']].sum()
-        profit = target_data[cols['profit']].sum()
-        
+    # Date Parsing (Robust) - 캐시된 공유 프레임에는 쓰지 않고 로컬 Series로만 변환한다.
+    dates = _parse_date_series(df[cols['date']])
+
+    valid = dates.notna().to_numpy()
+    if not valid.any(): return []
+    dates = dates[valid]
+
+    # Month index relative to the first month. 비교 기간(최대 12개월 전)이 음수 인덱스가
+    # 되지 않도록 앞에 12개월을 0으로 패딩한다.
+    pad = 12
+    min_date, max_date = dates.min(), dates.max()
+    first_month = pd.Period(min_date, freq='M') - pad
+    curr_month = pd.Period(max_date, freq='M')
+    n_months = (curr_month - first_month).n + 1
+    month_idx = (dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy()
+                 - (first_month.year * 12 + first_month.month)).astype(np.int64)
+    curr_idx = n_months - 1
+    calendar_days = np.array([
+        calendar.monthrange(p.year, p.month)[1]
+        for p in pd.period_range(start=first_month, end=curr_month, freq='M')
+    ])
+
+    # (combo × month) 매출/이익/행 수, 당월은 (combo × 일) 데이터 유무
+    segment_dims = [cols['channel'], cols['sub_channel'], cols['customer'], cols['main_channel']]
+    combo_id, n_combos, dimensions = _factorize_combos(df, segment_dims, valid)
+    cube = {"dimensions": dimensions, "n_combos": n_combos}
+    flat = combo_id * n_months + month_idx
+    size = n_combos * n_months
+    month_rows = np.bincount(flat, minlength=size).reshape(n_combos, n_months)
+    month_sales = np.bincount(flat, weights=df[cols['sales']].to_numpy()[valid].astype(float), minlength=size).reshape(n_combos, n_months)
+    month_profit = np.bincount(flat, weights=df[cols['profit']].to_numpy()[valid].astype(float), minlength=size).reshape(n_combos, n_months)
+    in_curr = month_idx == curr_idx
+    day_flat = combo_id[in_curr] * 31 + (dates.dt.day.to_numpy()[in_curr] - 1)
+    curr_day_rows = np.bincount(day_flat, minlength=n_combos * 31).reshape(n_combos, 31)
+
+    # 세그먼트 (표시 이름, 필터) - 순서 = 리포트 순서
+    target_accounts = [
+        '쿠팡(로켓)', 
+        '스팜(제제지크)', 
+        '스팜(쏭레브)', 
+        '11st', 
+        '이베이', 
+        '카카오', 
+        'CJ', 
+        '베이비빌리(주식회사 빌리지베이비)'
+    ]
+    ecommerce = {cols['channel']: '이커머스'}
+    segments = [
+        ("이커머스 - 전체", ecommerce),
+        # Main Channels (주력) - Excluding Coupang
+        ("이커머스 - 주력 채널 (쿠팡 제외)", {**ecommerce, cols['main_channel']: '주력'}),
+    ]
+    segments += [(f"이커머스 - {account}", {**ecommerce, cols['customer']: account}) for account in target_accounts]
+    segments += [
+        ("해외", {cols['sub_channel']: '해외'}),  # Overseas (Before Offline)
+        ("오프라인", {cols['channel']: '오프라인'}),
+        # Offline Key Accounts (After Offline)
+        ("이마트", {cols['customer']: '이마트'}),
+        ("롯데마트", {cols['customer']: '롯데마트'}),
+        ("다이소", {cols['customer']: '다이소'}),
+        ("오프라인 대리점", {cols['sub_channel']: '오프라인 대리점'}),
+    ]
+
+    memo = {}
+    membership = np.vstack([_segment_mask(cube, filters, memo) for _, filters in segments]).astype(float)
+    seg_rows = membership @ month_rows
+    seg_sales = membership @ month_sales
+    seg_profit = membership @ month_profit
+    seg_curr_days = ((membership @ curr_day_rows) > 0).sum(axis=1)
+
+    # Target month per segment: 전역 당월에 데이터가 있으면 당월, 없으면 자기 최신 월
+    has_rows = seg_rows > 0
+    target = n_months - 1 - np.argmax(has_rows[:, ::-1], axis=1)
+
+    def period_stats(i, start, end):
+        """[start, end) 월 구간의 일평균 매출/이익률. 데이터가 없으면 None."""
+        if seg_rows[i, start:end].sum() == 0: return None
+        sales = seg_sales[i, start:end].sum()
+        profit = seg_profit[i, start:end].sum()
         # 일평균 계산: 당월은 실제 데이터 일수, 과거 달은 달력 일수
-        total_days = 0
-        for pm in period_months:
-            if pm == curr_month:
-                # 당월: 실제 데이터 일수
-                month_data = target_data[target_data['Month'] == pm]
-                total_days += month_data[cols['date']].nunique()
-            else:
-                # 과거 달: 달력 일수
-                total_days += calendar.monthrange(pm.year, pm.month)[1]
-        
+        total_days = calendar_days[start:end].sum()
+        if start <= curr_idx < end:
+            total_days += seg_curr_days[i] - calendar_days[curr_idx]
         daily_sales = sales / total_days if total_days > 0 else 0
         profit_margin = (profit / sales * 100) if sales != 0 else 0
-        
         return {'daily_sales': daily_sales, 'profit_margin': profit_margin}
 
-    def generate_report(context, sub_df, display_name=None):
-        if sub_df.empty: return
-        
-        # Determine display name
-        name = display_name if display_name else context
-
-        # Determine 'Current' Month for this specific subset
-        # If it has data for the global curr_month, use it.
-        # Otherwise, use its own latest month.
-        sub_months = sorted(sub_df['Month'].unique())
-        if not sub_months: return
-        
-        local_curr_month = sub_months[-1]
-        
-        # If global curr_month is available and this subset has it, great.
-        # If not, we fallback to local_curr_month.
-        target_month = curr_month # Default to global
-        
-        # Check if sub_df has data for global curr_month
-        if curr_month not in sub_months:
-            target_month = local_curr_month
-            # Append month to name to indicate stale data
-            # Format: '25.12'
-            formatted_month = target_month.strftime('%y.%m')
-            name = f"{name} ({formatted_month})"
-        
-        # Recalculate comparison periods based on target_month
-        l_prev = target_month - 1
-        l_3m = [target_month - i for i in range(3, 0, -1)]
-        l_yoy = target_month - 12
+    alerts = []
+    for i, (name, _) in enumerate(segments):
+        if not has_rows[i].any(): continue
 
-        curr = get_period_stats(sub_df, target_month)
-        if not curr: return
+        t = target[i]
+        if t != curr_idx:
+            # Append month to name to indicate stale data. Format: '25.12'
+            name = f"{name} ({(first_month + int(t)).strftime('%y.%m')})"
 
+        curr = period_stats(i, t, t + 1)
         comparisons = [
-            ('전월', l_prev),
-            ('3개월 평균', l_3m),
-            ('전년 동월', l_yoy)
+            ('전월', (t - 1, t)),
+            ('3개월 평균', (t - 3, t)),
+            ('전년 동월', (t - 12, t - 11))
         ]
 
-        for label, period in comparisons:
-            base = get_period_stats(sub_df, period)
-            
-            # If base data is missing, we still might want to show it with 0 or skip? 
-            # User said "fixed", so let's try to show it even if 0, but if period is None (e.g. no YoY data), skip.
-            if not period and label == '전년 동월': continue 
-            
+        for label, (start, end) in comparisons:
+            base = period_stats(i, start, end)
             base_sales = base['daily_sales'] if base else 0
             base_margin = base['profit_margin'] if base else 0
             
@@ -1127,67 +1155,6 @@ def analyze_sales_performance(filename):
                 }
             })
 
-    # --- E-commerce Section Analysis ---
-    ecommerce_df = df[df[cols['channel']] == '이커머스']
-    if not ecommerce_df.empty:
-        # 1. Overall E-commerce
-        generate_report("이커머스 - 전체", ecommerce_df)
-
-        # 2. Main Channels (주력) - Excluding Coupang
-        main_mask = ecommerce_df[cols['main_channel']] == '주력'
-        main_df = ecommerce_df[main_mask]
-        generate_report("이커머스 - 주력 채널 (쿠팡 제외)", main_df)
-
-        # 3. Specific Accounts
-        target_accounts = [
-            '쿠팡(로켓)', 
-            '스팜(제제지크)', 
-            '스팜(쏭레브)', 
-            '11st', 
-            '이베이', 
-            '카카오', 
-            'CJ', 
-            '베이비빌리(주식회사 빌리지베이비)'
-        ]
-        
-        for account in target_accounts:
-            # Flexible matching for accounts might be needed, but user said exact match.
-            # Let's try exact first.
-            acc_df = ecommerce_df[ecommerce_df[cols['customer']] == account]
-            if not acc_df.empty:
-                generate_report(f"이커머스 - {account}", acc_df)
-
-    # 4. Overseas (Before Offline)
-    overseas_df = df[df[cols['sub_channel']] == '해외']
-    if not overseas_df.empty:
-        generate_report("해외", overseas_df)
-
-    # --- Offline Section Analysis ---
-    offline_df = df[df[cols['channel']] == '오프라인']
-    if not offline_df.empty:
-        generate_report("오프라인", offline_df)
-
-    # 5. Offline Key Accounts (After Offline)
-    # E-Mart
-    emart_df = df[df[cols['customer']] == '이마트']
-    if not emart_df.empty:
-        generate_report("이마트", emart_df)
-    
-    # Lotte Mart
-    lotte_df = df[df[cols['customer']] == '롯데마트']
-    if not lotte_df.empty:
-        generate_report("롯데마트", lotte_df)
-
-    # Daiso
-    daiso_df = df[df[cols['customer']] == '다이소']
-    if not daiso_df.empty:
-        generate_report("다이소", daiso_df)
-
-    # Offline Agency
-    agency_df = df[df[cols['sub_channel']] == '오프라인 대리점']
-    if not agency_df.empty:
-        generate_report("오프라인 대리점", agency_df)
-
     return alerts
 
 def debug_analyze_sales(filename):
@@ -1265,324 +1232,463 @@ def debug_analyze_sales(filename):
     return logs
 
 
-def get_ecommerce_details(filename):
-    df = get_dataframe(filename)
-    if df.empty: return {}
+# ----------------------------------------------------------------
+# E-commerce details: declarative segment list
+# 세그먼트 = 응답 키 → {컬럼: 값 | (값, ...)} AND 조건. dict 순서 = 응답 키 순서.
+# 새 세그먼트는 여기에 한 줄 추가하면 된다 (get_stats 호출을 늘리지 않는다).
+# ----------------------------------------------------------------
+DETAIL_DIMENSIONS = ['파트구분', '품목그룹1', '품목 구분', '주력 채널', '거래처명']
+
+DETAIL_BRANDS = {
+    'myb': '마이비',
+    'nubi': '누비',
+    'sonreve': '쏭레브'
+}
+
+DETAIL_CATEGORIES = {
+    'stain': '얼룩제거제',
+    "mild": "순한라인",
+    "boil": "삶기세제",
+    "dryer": "건조기시트",
+    "capsule": "캡슐세제",
+    "fluoride": "비건 고불소 치약",
+    "oral": "구강티슈",
+    "pad": "수유패드",
+    "bath": "욕조클리너",
+    # Nubi Categories
+    'nubi_longhandle': '롱핸들',
+    'nubi_stainless': '스텐 물병',
+    'nubi_jungle': '정글 물병',
+    'nubi_spoon': '3스텝 스푼',
+    'nubi_2in1': '2in1 컵',
+    'nubi_ladybug': '무당벌레 빨대컵',
+    'nubi_pacifier': '실리콘노리개',
+    # Sonreve Categories
+    'sonreve_toneup': '톤업 크림',
+    'sonreve_shampoo': '키즈 샴푸',
+    'sonreve_cleanser': '키즈 페이셜클렌저',
+    'sonreve_lotion': '키즈 페이셜로션'
+}
+
+# 이커머스 파트 안의 거래처
+DETAIL_ACCOUNTS = {
+    'coupang': '쿠팡(로켓)',
+    'naver_zeze': '스팜(제제지크)',
+    'naver_sonreve': '스팜(쏭레브)',
+    '11st': '11st',
+    'ebay': '이베이',
+    'kakao': '카카오',
+    'cj': 'CJ',
+    'babybilly': '베이비빌리(주식회사 빌리지베이비)'
+}
+
+# 파트구분 기준 세그먼트 (Overseas, Agency)
+DETAIL_CHANNEL_SEGMENTS = {
+    'overseas': '해외',
+    'agency': '오프라인 대리점'
+}
+
+# 거래처명 기준 세그먼트, 파트 무관 (E-Mart, Lotte, Daiso)
+DETAIL_CUSTOMER_SEGMENTS = {
+    'emart': '이마트',
+    'lotte': '롯데마트',
+    'daiso': '다이소'
+}
+
+
+def _build_detail_segments():
+    """Ordered {response_key: filters} reproducing the historical response layout."""
+    ecommerce = {'파트구분': '이커머스'}
+    offline = {'파트구분': '오프라인'}
+    total = {'파트구분': ('이커머스', '오프라인')}
+    main = {'파트구분': '이커머스', '주력 채널': '주력'}  # Main Channels (Excluding Coupang)
+
+    segments = {'ecommerce': ecommerce, 'offline': offline}
+    for key, brand in DETAIL_BRANDS.items():
+        segments[key] = {'품목그룹1': brand}
+    for prefix, base in (('ecommerce', ecommerce), ('offline', offline)):
+        for key, brand in DETAIL_BRANDS.items():
+            segments[f"{prefix}_{key}"] = {**base, '품목그룹1': brand}
+    segments['total'] = total
+    for key, brand in DETAIL_BRANDS.items():
+        segments[f"total_{key}"] = {**total, '품목그룹1': brand}
+    segments['main_overall'] = main
+    for key, brand in DETAIL_BRANDS.items():
+        segments[f"main_{key}"] = {**main, '품목그룹1': brand}
+
+    # Category × (ecommerce / offline / main / total). 'stain'이 맨 앞이라 stain_total만 새로 붙는다.
+    for cat_key, cat_name in DETAIL_CATEGORIES.items():
+        for suffix, base in (('ecommerce', ecommerce), ('offline', offline), ('main', main), ('total', total)):
+            segments[f"{cat_key}_{suffix}"] = {**base, '품목 구분': cat_name}
+
+    def add_scope(key, base):
+        segments[key] = base
+        for brand_key, brand in DETAIL_BRANDS.items():
+            segments[f"{key}_{brand_key}"] = {**base, '품목그룹1': brand}
+        for cat_key, cat_name in DETAIL_CATEGORIES.items():
+            segments[f"{cat_key}_{key}"] = {**base, '품목 구분': cat_name}
+
+    for key, account_name in DETAIL_ACCOUNTS.items():
+        add_scope(key, {**ecommerce, '거래처명': account_name})
+    for key, channel_name in DETAIL_CHANNEL_SEGMENTS.items():
+        add_scope(key, {'파트구분': channel_name})
+    for key, customer_name in DETAIL_CUSTOMER_SEGMENTS.items():
+        add_scope(key, {'거래처명': customer_name})
+    return segments
+
+
+ECOMMERCE_DETAIL_SEGMENTS = _build_detail_segments()
+
+# Segments per matrix product in get_ecommerce_details (cancellation granularity)
+DETAIL_SEGMENT_CHUNK = 32
+
+
+def _factorize_combos(df, columns, valid):
+    """Rows (where `valid`) → dense id of their value combination over `columns`.
+
+    Returns (combo_id per row, n_combos, {col: (code per combo, {value: code})}),
+    the "dimensions" layout _segment_mask expects. NaN gets code -1, which never
+    matches a filter value.
+    """
+    codes, uniques = [], []
+    combo_key = np.zeros(int(valid.sum()), dtype=np.int64)
+    for col in columns:
+        c, u = pd.factorize(df[col].to_numpy()[valid])
+        codes.append(c)
+        uniques.append(u)
+        combo_key = combo_key * (len(u) + 1) + (c + 1)
+    combo_keys, first_row, combo_id = np.unique(combo_key, return_index=True, return_inverse=True)
+    dimensions = {
+        col: (c[first_row], {value: code for code, value in enumerate(u)})
+        for col, c, u in zip(columns, codes, uniques)
+    }
+    return combo_id, len(combo_keys), dimensions
+
+
+def _build_detail_cube(df):
+    """One pass over the rows → (dimension combo × month) and (combo × day) sums.
 
-    # Column Mapping (Local)
-    df.columns = [str(c).strip() for c in df.columns]
+    Every segment in ECOMMERCE_DETAIL_SEGMENTS is an AND of equality filters on
+    DETAIL_DIMENSIONS, so it is exactly a union of combos. Returns None when no
+    row has a parseable date.
+    """
     date_col = '일별'
-    sales_col = '판매액'
-    channel_col = '파트구분'
-    
-    # Fix for missing 'cols' definition
-    cols = {'customer': '거래처명'}
-    
+
     # Date Parsing - Expect YYYY-MM-DD format (e.g., "2025-01-01")
-    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        # Try parsing as YYYY-MM-DD string format first
-        date_series = pd.to_datetime(df[date_col], format='%Y-%m-%d', errors='coerce')
-        
+    # 캐시된 공유 프레임에는 쓰지 않고 로컬 Series로만 변환한다.
+    dates = df[date_col]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        date_series = pd.to_datetime(dates, format='%Y-%m-%d', errors='coerce')
         # If that fails, try Excel serial number as fallback
         if date_series.isna().all():
-            numeric_dates = pd.to_numeric(df[date_col], errors='coerce')
+            numeric_dates = pd.to_numeric(dates, errors='coerce')
             date_series = pd.to_datetime(numeric_dates, unit='D', origin='1899-12-30', errors='coerce')
-        
-        df[date_col] = date_series
-    
-    df = df.dropna(subset=[date_col])
-    
-    # Calculate Global Date Range from the FULL dataframe
-    global_min_date = df[date_col].min()
-    global_max_date = df[date_col].max()
-    
-    # Pre-calculate full month range
-    if pd.notna(global_min_date) and pd.notna(global_max_date):
-        full_period_range = pd.period_range(start=global_min_date, end=global_max_date, freq='M')
-    else:
-        full_period_range = []
-    # ----------------------------------------------------------------
-    # PRE-CALCULATE GLOBAL DIVISOR MAP
-    # 일평균 계산 시 모든 채널이 동일한 divisor를 사용해야 함
-    # 규칙: 과거 월 = 달력 일수, 최근 월 = 데이터의 최대 일자
-    # ----------------------------------------------------------------
-    global_divisor_map = {}
-    
-    if len(full_period_range) > 0:
-        # Total data for calculating divisor
-        total_df_for_divisor = df[df[channel_col].isin(['이커머스', '오프라인'])].copy()
-        
-        if not total_df_for_divisor.empty:
-            total_df_for_divisor['MonthPeriod'] = total_df_for_divisor[date_col].dt.to_period('M')
-            global_grouped_days = total_df_for_divisor.groupby('MonthPeriod')[date_col].nunique()
-            global_grouped_days = global_grouped_days.reindex(full_period_range, fill_value=0)
-        else:
-            global_grouped_days = pd.Series(0, index=full_period_range)
-        
-        last_period = full_period_range[-1] if len(full_period_range) > 0 else None
-        
-        for p in full_period_range:
-            calendar_days = calendar.monthrange(p.year, p.month)[1]
-            is_last_month = (p == last_period)
-            
-            if not is_last_month:
-                # 과거 월: 달력 일수 사용
-                global_divisor_map[p] = calendar_days
-            else:
-                # 최근 월: 데이터의 실제 일수 사용
-                actual_days = int(global_grouped_days.loc[p]) if p in global_grouped_days.index else 0
-                # 데이터가 없거나 1일만 있는 경우 달력 일수 사용
-                global_divisor_map[p] = actual_days if actual_days > 1 else calendar_days
-
-    # Function to get monthly and daily stats for a specific filter
-    def get_stats(filtered_df):
-        if filtered_df.empty and len(full_period_range) == 0: return {"monthly": [], "daily": []}
-        
-        # 1. Monthly (Gap Filling Rule: Use Global Range)
-        f_df = filtered_df.copy()
-        
-        if not f_df.empty:
-            f_df['MonthPeriod'] = f_df[date_col].dt.to_period('M')
-            grouped = f_df.groupby('MonthPeriod')[['판매액', '이익']].sum()
-        else:
-            grouped = pd.DataFrame(columns=['판매액', '이익'])
+        dates = date_series
+
+    valid = dates.notna().to_numpy()
+    if not valid.any():
+        return None
+    dates = dates[valid]
+    ts = dates.to_numpy(dtype='datetime64[ns]')
+    min_date, max_date = dates.min(), dates.max()
+
+    # Month index relative to the first month of the global range
+    month_key = dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy() - 1
+    first_key = min_date.year * 12 + min_date.month - 1
+    n_months = (max_date.year * 12 + max_date.month - 1) - first_key + 1
+    month_idx = (month_key - first_key).astype(np.int64)
+    periods = pd.period_range(start=min_date, end=max_date, freq='M')
+
+    # 규칙: 과거 월 = 달력 일수, 최근 월 = 이커머스+오프라인 데이터의 실제 일수 (1일 이하면 달력 일수)
+    divisors = np.array([calendar.monthrange(p.year, p.month)[1] for p in periods], dtype=float)
+    parts = df['파트구분'].to_numpy()[valid]
+    last_rows = (month_idx == n_months - 1) & pd.Series(parts).isin(['이커머스', '오프라인']).to_numpy()
+    actual_days = len(np.unique(ts[last_rows]))
+    if actual_days > 1:
+        divisors[-1] = actual_days
+
+    combo_id, n_combos, dimensions = _factorize_combos(df, DETAIL_DIMENSIONS, valid)
+
+    sales = df['판매액'].to_numpy()[valid].astype(float)
+    profit = df['이익'].to_numpy()[valid].astype(float)
+
+    flat = combo_id * n_months + month_idx
+    size = n_combos * n_months
+    month_sales = np.bincount(flat, weights=sales, minlength=size).reshape(n_combos, n_months)
+    month_profit = np.bincount(flat, weights=profit, minlength=size).reshape(n_combos, n_months)
+
+    # Daily (Last 6 Months from Global Max)
+    six_m_ago = max_date - pd.DateOffset(months=6)
+    full_date_range = pd.date_range(start=six_m_ago, end=max_date, freq='D')
+    n_days = len(full_date_range)
+    recent = ts >= np.datetime64(six_m_ago)
+    day_idx = (ts[recent].astype('datetime64[D]') - np.datetime64(full_date_range[0].date(), 'D')).astype(np.int64)
+    flat = combo_id[recent] * n_days + day_idx
+    size = n_combos * n_days
+    day_sales = np.bincount(flat, weights=sales[recent], minlength=size).reshape(n_combos, n_days)
+    day_profit = np.bincount(flat, weights=profit[recent], minlength=size).reshape(n_combos, n_days)
 
-        # Reindex to full range
-        grouped = grouped.reindex(full_period_range, fill_value=0)
+    return {
+        "dimensions": dimensions,
+        "n_combos": n_combos,
+        "combo_rows": np.bincount(combo_id, minlength=n_combos).astype(float),
+        "months": [str(p) for p in periods],
+        "divisors": divisors,
+        "month_sales": month_sales,
+        "month_profit": month_profit,
+        "dates": full_date_range.strftime('%Y-%m-%d').tolist(),
+        "day_sales": day_sales,
+        "day_profit": day_profit,
+        # 정수 컬럼이면 일별 레코드도 정수로 내보낸다 (groupby.sum이 dtype을 유지하던 동작)
+        "sales_int": pd.api.types.is_integer_dtype(df['판매액'].dtype),
+        "profit_int": pd.api.types.is_integer_dtype(df['이익'].dtype),
+    }
 
-        monthly_stats = []
-        for p in full_period_range:
-            sales = grouped.loc[p, '판매액']
-            profit = grouped.loc[p, '이익']
-            
-            # 전역 divisor 사용 (모든 채널 동일)
-            divisor = global_divisor_map.get(p, calendar.monthrange(p.year, p.month)[1])
-            daily_avg = int(sales / divisor) if divisor > 0 else 0
-            margin = round(profit / sales * 100, 1) if sales != 0 else 0
-            
-            monthly_stats.append({
-                "Month": str(p), 
-                "판매액": int(sales), 
-                "이익률": margin, 
-                "일평균매출": daily_avg
-            })
-        
-        # 2. Daily (Last 6 Months from Global Max)
-        if pd.notna(global_max_date):
-            six_m_ago = global_max_date - pd.DateOffset(months=6)
-            
-            # Create full date range for last 6 months
-            full_date_range = pd.date_range(start=six_m_ago, end=global_max_date, freq='D')
-            
-            # Filter data
-            if not f_df.empty:
-                d_df = f_df[f_df[date_col] >= six_m_ago].copy()
-                d_df['Date'] = d_df[date_col].dt.strftime('%Y-%m-%d')
-                daily_grouped = d_df.groupby('Date').agg({sales_col: 'sum', '이익': 'sum'})
-                
-                # Reindex
-                str_date_range = full_date_range.strftime('%Y-%m-%d')
-                daily_grouped = daily_grouped.reindex(str_date_range, fill_value=0)
-                daily_grouped.index.name = 'Date'
-                daily_g = daily_grouped.reset_index()
-            else:
-                 daily_g = pd.DataFrame({'Date': full_date_range.strftime('%Y-%m-%d'), sales_col: 0, '이익': 0})
 
-            # Calculate metrics
-            # Robust Margin calculation for Daily data
-            with np.errstate(divide='ignore', invalid='ignore'):
-                 daily_g['이익률'] = (daily_g['이익'] / daily_g[sales_col] * 100)
-                 daily_g['이익률'] = daily_g['이익률'].replace([np.inf, -np.inf], np.nan).fillna(0).round(1)
-            
-            daily_list = daily_g.to_dict('records')
+def _segment_mask(cube, filters, memo):
+    """Boolean mask over the cube's combos for one segment's filters."""
+    mask = np.ones(cube["n_combos"], dtype=bool)
+    for col, value in filters.items():
+        key = (col, value)
+        if key not in memo:
+            combo_codes, lookup = cube["dimensions"][col]
+            wanted = value if isinstance(value, tuple) else (value,)
+            hit = [lookup[v] for v in wanted if v in lookup]
+            memo[key] = np.isin(combo_codes, hit)
+        mask &= memo[key]
+    return mask
+
+
+def _trunc_int(values):
+    """int() 절사 — 행렬곱 합산 순서 오차(4161618.9999…)로 정수가 1 작아지지 않게 6자리에서 먼저 반올림."""
+    return np.trunc(np.round(values, 6)).astype(np.int64)
+
+
+def _evaluate_detail_segments(cube, segments):
+    """{key: filters} → {key: {"monthly": [...], "daily": [...]}} via one matrix product."""
+    keys = list(segments)
+    if cube is None:
+        return {key: {"monthly": [], "daily": []} for key in keys}
+    if not keys:
+        return {}
+
+    memo = {}
+    membership = np.vstack([_segment_mask(cube, segments[key], memo) for key in keys]).astype(float)
+    seg_rows = membership @ cube["combo_rows"]
+    m_sales = membership @ cube["month_sales"]
+    m_profit = membership @ cube["month_profit"]
+    d_sales = membership @ cube["day_sales"]
+    d_profit = membership @ cube["day_profit"]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m_avg = _trunc_int(m_sales / cube["divisors"])
+        m_margin = np.round(m_profit / m_sales * 100, 1)
+        d_margin = np.round(np.nan_to_num(d_profit / d_sales * 100, nan=0.0, posinf=0.0, neginf=0.0), 1)
+    m_sales_int = _trunc_int(m_sales)
+
+    months = cube["months"]
+    dates = cube["dates"]
+    result = {}
+    for i, key in enumerate(keys):
+        nonzero = (m_sales[i] != 0).tolist()
+        margins = [m if nz else 0 for m, nz in zip(m_margin[i].tolist(), nonzero)]
+        monthly_stats = [
+            {"Month": p, "판매액": s, "이익률": r, "일평균매출": a}
+            for p, s, r, a in zip(months, m_sales_int[i].tolist(), margins, m_avg[i].tolist())
+        ]
+
+        if seg_rows[i] == 0:
+            # 행이 하나도 없는 세그먼트는 0 (정수) 채움
+            sales_vals = [0] * len(dates)
+            profit_vals = sales_vals
         else:
-            daily_list = []
-        
-        return {"monthly": monthly_stats, "daily": daily_list}
-
-    # E-commerce (Existing)
-    ecommerce_df = df[df[channel_col] == '이커머스']
-    ecommerce_data = get_stats(ecommerce_df)
-
-    # Offline
-    offline_df = df[df[channel_col] == '오프라인']
-    offline_data = get_stats(offline_df)
-
-    # Total (Ecommerce + Offline)
-    total_df = df[df[channel_col].isin(['이커머스', '오프라인'])]
-    total_data = get_stats(total_df)
-
-    # Brands
-    brand_col = '품목그룹1' # Brand column
-    myb_data = get_stats(df[df[brand_col] == '마이비'])
-    nubi_data = get_stats(df[df[brand_col] == '누비'])
-    sonreve_data = get_stats(df[df[brand_col] == '쏭레브'])
-    
-    # Specific Intersection: Ecommerce + MyB
-    ecommerce_myb_df = df[(df[channel_col] == '이커머스') & (df[brand_col] == '마이비')]
-    ecommerce_myb_data = get_stats(ecommerce_myb_df)
-
-    # Specific Intersection: Ecommerce + Nubi
-    ecommerce_nubi_df = df[(df[channel_col] == '이커머스') & (df[brand_col] == '누비')]
-    ecommerce_nubi_data = get_stats(ecommerce_nubi_df)
-
-    # Specific Intersection: Ecommerce + Sonreve
-    ecommerce_sonreve_df = df[(df[channel_col] == '이커머스') & (df[brand_col] == '쏭레브')]
-    ecommerce_sonreve_data = get_stats(ecommerce_sonreve_df)
-
-    # Specific Intersection: Offline + MyB
-    offline_myb_df = df[(df[channel_col] == '오프라인') & (df[brand_col] == '마이비')]
-    offline_myb_data = get_stats(offline_myb_df)
-
-    # Specific Intersection: Offline + Nubi
-    offline_nubi_df = df[(df[channel_col] == '오프라인') & (df[brand_col] == '누비')]
-    offline_nubi_data = get_stats(offline_nubi_df)
-
-    # Specific Intersection: Offline + Sonreve
-    offline_sonreve_df = df[(df[channel_col] == '오프라인') & (df[brand_col] == '쏭레브')]
-    offline_sonreve_data = get_stats(offline_sonreve_df)
-
-    # Specific Intersection: Total + Brands
-    total_myb_data = get_stats(total_df[total_df[brand_col] == '마이비'])
-    total_nubi_data = get_stats(total_df[total_df[brand_col] == '누비'])
-    total_sonreve_data = get_stats(total_df[total_df[brand_col] == '쏭레브'])
-
-    # Specific Intersection: Main Channels (Excluding Coupang)
-    main_ex_coupang_df = df[(df[channel_col] == '이커머스') & (df['주력 채널'] == '주력')]
-    main_overall_data = get_stats(main_ex_coupang_df)
-    main_myb_data = get_stats(main_ex_coupang_df[main_ex_coupang_df[brand_col] == '마이비'])
-    main_nubi_data = get_stats(main_ex_coupang_df[main_ex_coupang_df[brand_col] == '누비'])
-    main_sonreve_data = get_stats(main_ex_coupang_df[main_ex_coupang_df[brand_col] == '쏭레브'])
-
-    # Specific Category: Stain Remover (얼룩제거제)
-    product_type_col = '품목 구분'
-    stain_remover_ecommerce_df = ecommerce_df[ecommerce_df[product_type_col] == '얼룩제거제']
-    stain_remover_offline_df = offline_df[offline_df[product_type_col] == '얼룩제거제']
-    stain_remover_main_df = main_ex_coupang_df[main_ex_coupang_df[product_type_col] == '얼룩제거제']
-
-    stain_ecommerce_data = get_stats(stain_remover_ecommerce_df)
-    stain_offline_data = get_stats(stain_remover_offline_df)
-    stain_main_data = get_stats(stain_remover_main_df)
-
-    # Bulk extraction for categories
-    categories_to_extract = {
-        'stain': '얼룩제거제',
-        "mild": "순한라인",
-        "boil": "삶기세제",
-        "dryer": "건조기시트",
-        "capsule": "캡슐세제",
-        "fluoride": "비건 고불소 치약",
-        "oral": "구강티슈",
-        "pad": "수유패드",
-        "bath": "욕조클리너",
-        # Nubi Categories
-        'nubi_longhandle': '롱핸들',
-        'nubi_stainless': '스텐 물병',
-        'nubi_jungle': '정글 물병',
-        'nubi_spoon': '3스텝 스푼',
-        'nubi_2in1': '2in1 컵',
-        'nubi_ladybug': '무당벌레 빨대컵',
-        'nubi_pacifier': '실리콘노리개',
-        # Sonreve Categories
-        'sonreve_toneup': '톤업 크림',
-        'sonreve_shampoo': '키즈 샴푸',
-        'sonreve_cleanser': '키즈 페이셜클렌저',
-        'sonreve_lotion': '키즈 페이셜로션'
-    }
-    
-    cat_results = {}
-    for key, cat_name in categories_to_extract.items():
-        cat_results[f"{key}_ecommerce"] = get_stats(ecommerce_df[ecommerce_df[product_type_col] == cat_name])
-        cat_results[f"{key}_offline"] = get_stats(offline_df[offline_df[product_type_col] == cat_name])
-        cat_results[f"{key}_main"] = get_stats(main_ex_coupang_df[main_ex_coupang_df[product_type_col] == cat_name])
-        cat_results[f"{key}_total"] = get_stats(total_df[total_df[product_type_col] == cat_name])
-    
-    # Account-Specific Analysis
-    target_accounts = {
-        'coupang': '쿠팡(로켓)',
-        'naver_zeze': '스팜(제제지크)',
-        'naver_sonreve': '스팜(쏭레브)',
-        '11st': '11st',
-        'ebay': '이베이',
-        'kakao': '카카오',
-        'cj': 'CJ',
-        'babybilly': '베이비빌리(주식회사 빌리지베이비)'
-    }
+            sales_vals = (_trunc_int(d_sales[i]) if cube["sales_int"] else d_sales[i]).tolist()
+            profit_vals = (_trunc_int(d_profit[i]) if cube["profit_int"] else d_profit[i]).tolist()
+        daily_list = [
+            {"Date": d, "판매액": s, "이익": p, "이익률": r}
+            for d, s, p, r in zip(dates, sales_vals, profit_vals, d_margin[i].tolist())
+        ]
+        result[key] = {"monthly": monthly_stats, "daily": daily_list}
+    return result
+
+
+def resolve_detail_segments(selector=None):
+    """segments= 셀렉터 → ECOMMERCE_DETAIL_SEGMENTS 순서의 키 목록.
+
+    쉼표 구분 토큰. 정확한 키 또는 와일드카드 그룹('coupang_*', '*_main', '*').
+    None/빈 값은 전체. 와일드카드가 아닌 토큰이 없는 키면 ValueError.
+    """
+    if selector is None:
+        return list(ECOMMERCE_DETAIL_SEGMENTS)
+    tokens = [t.strip() for t in str(selector).split(',') if t.strip()]
+    if not tokens:
+        return list(ECOMMERCE_DETAIL_SEGMENTS)
+
+    unknown = [t for t in tokens if not any(ch in t for ch in '*?[') and t not in ECOMMERCE_DETAIL_SEGMENTS]
+    if unknown:
+        raise ValueError(f"알 수 없는 세그먼트: {', '.join(unknown)}")
+    return [key for key in ECOMMERCE_DETAIL_SEGMENTS if any(fnmatch.fnmatchcase(key, t) for t in tokens)]
+
+
+def _detail_cache_key(filename):
+    # df_cache와 같은 키 (SHA256, 없으면 filename)
+    return _filename_hash_cache.get(filename) or filename
+
+
+def _detail_entry(cache_key, df):
+    """(cube, results) for cache_key, building the cube on a miss.
+
+    The cube is built outside the lock; if another thread stored an entry meanwhile,
+    theirs wins so every caller fills the same results dict.
+    """
+    with _detail_cache_lock:
+        entry = _detail_cache.get(cache_key)
+        if entry is not None:
+            _detail_cache.move_to_end(cache_key)
+            return entry
+    built = (_build_detail_cube(df), {})
+    with _detail_cache_lock:
+        entry = _detail_cache.setdefault(cache_key, built)
+        _detail_cache.move_to_end(cache_key)
+        while len(_detail_cache) > DETAIL_CACHE_SIZE:
+            _detail_cache.popitem(last=False)
+    return entry
+
+
+def get_ecommerce_details(filename, segments=None):
+    """세그먼트별 monthly/daily 통계. segments는 resolve_detail_segments 셀렉터.
+
+    큐브와 세그먼트 결과를 파일 해시별로 캐시해서, 후속 선택은 아직 계산하지
+    않은 세그먼트만 평가한다.
+    """
+    keys = resolve_detail_segments(segments)
+    df = get_dataframe(filename)
+    if df.empty: return {}
+
+    cube, cached = _detail_entry(_detail_cache_key(filename), df)
+
+    # Evaluated in chunks with a cancellation checkpoint between them; finished chunks stay
+    # cached, so a request cancelled mid-way leaves less work for the retry.
+    missing = [key for key in keys if key not in cached]
+    for start in range(0, len(missing), DETAIL_SEGMENT_CHUNK):
+        checkpoint()
+        chunk = missing[start:start + DETAIL_SEGMENT_CHUNK]
+        cached.update(_evaluate_detail_segments(cube, {key: ECOMMERCE_DETAIL_SEGMENTS[key] for key in chunk}))
+    return {key: cached[key] for key in keys}
 
-    account_results = {}
-    for key, account_name in target_accounts.items():
-        # Filter for specific account
-        acc_df = ecommerce_df[ecommerce_df[cols['customer']] == account_name]
-        
-        # Overall Account Data
-        account_results[key] = get_stats(acc_df)
-        
-        # Account + Brand Data
-        account_results[f"{key}_myb"] = get_stats(acc_df[acc_df[brand_col] == '마이비'])
-        account_results[f"{key}_nubi"] = get_stats(acc_df[acc_df[brand_col] == '누비'])
-        account_results[f"{key}_sonreve"] = get_stats(acc_df[acc_df[brand_col] == '쏭레브'])
-        
-        # Account + Category Data (Reuse defined categories)
-        for cat_key, cat_name in categories_to_extract.items():
-            account_results[f"{cat_key}_{key}"] = get_stats(acc_df[acc_df[product_type_col] == cat_name])
-
-    # New Segments: Channel-Based (Overseas, Agency)
-    new_channel_segments = {
-        'overseas': '해외',
-        'agency': '오프라인 대리점'
-    }
-    for key, channel_name in new_channel_segments.items():
-        c_df = df[df[channel_col] == channel_name]
-        account_results[key] = get_stats(c_df)
-        account_results[f"{key}_myb"] = get_stats(c_df[c_df[brand_col] == '마이비'])
-        account_results[f"{key}_nubi"] = get_stats(c_df[c_df[brand_col] == '누비'])
-        account_results[f"{key}_sonreve"] = get_stats(c_df[c_df[brand_col] == '쏭레브'])
-        for cat_key, cat_name in categories_to_extract.items():
-            account_results[f"{cat_key}_{key}"] = get_stats(c_df[c_df[product_type_col] == cat_name])
-
-    # New Segments: Customer-Based (E-Mart, Lotte, Daiso)
-    new_customer_segments = {
-        'emart': '이마트',
-        'lotte': '롯데마트',
-        'daiso': '다이소'
-    }
-    for key, customer_name in new_customer_segments.items():
-        c_df = df[df[cols['customer']] == customer_name]
-        account_results[key] = get_stats(c_df)
-        account_results[f"{key}_myb"] = get_stats(c_df[c_df[brand_col] == '마이비'])
-        account_results[f"{key}_nubi"] = get_stats(c_df[c_df[brand_col] == '누비'])
-        account_results[f"{key}_sonreve"] = get_stats(c_df[c_df[brand_col] == '쏭레브'])
-        for cat_key, cat_name in categories_to_extract.items():
-            account_results[f"{cat_key}_{key}"] = get_stats(c_df[c_df[product_type_col] == cat_name])
 
+# Keywords are matched literally (str.contains, regex=False, case-insensitive): search boxes
+# send every keystroke, and a partial '[' or '(' must not turn into a regex error. Literal
+# matching also makes n-gram pruning valid for every keyword.
+
+
+def _search_norm(text):
+    """Case-folded, whitespace-free form used for n-gram keys."""
+    return "".join(str(text).lower().split())
+
+
+def _search_grams(norm):
+    """Bigrams (unigram for 1-char text). Bigrams are selective enough for Hangul syllables."""
+    return {norm[i:i + 2] for i in range(len(norm) - 1)} or {norm}
+
+
+def _build_search_index(df):
+    """Distinct 품목명[규격] -> n-gram postings and row positions.
+
+    Unigrams are indexed too so one-character keywords still prune.
+    """
+    name_ids, names = pd.factorize(df['품목명[규격]'].astype(str))
+    order = np.argsort(name_ids, kind='stable')
+    bounds = np.searchsorted(name_ids[order], np.arange(len(names) + 1))
+    postings = {}
+    for i, name in enumerate(names):
+        norm = _search_norm(name)
+        for gram in _search_grams(norm) | set(norm):
+            postings.setdefault(gram, []).append(i)
     return {
-        "ecommerce": ecommerce_data,
-        "offline": offline_data,
-        "myb": myb_data,
-        "nubi": nubi_data,
-        "sonreve": sonreve_data,
-        "ecommerce_myb": ecommerce_myb_data,
-        "ecommerce_nubi": ecommerce_nubi_data,
-        "ecommerce_sonreve": ecommerce_sonreve_data,
-        "offline_myb": offline_myb_data,
-        "offline_nubi": offline_nubi_data,
-        "offline_sonreve": offline_sonreve_data,
-        "total": total_data,
-        "total_myb": total_myb_data,
-        "total_nubi": total_nubi_data,
-        "total_sonreve": total_sonreve_data,
-        "main_overall": main_overall_data,
-        "main_myb": main_myb_data,
-        "main_nubi": main_nubi_data,
-        "main_sonreve": main_sonreve_data,
-        "stain_ecommerce": stain_ecommerce_data,
-        "stain_offline": stain_offline_data,
-        "stain_main": stain_main_data,
-        **cat_results,
-        **account_results
+        "n_rows": len(df),
+        "names": np.asarray(names, dtype=object),
+        "postings": {g: np.array(ids) for g, ids in postings.items()},
+        "order": order,
+        "bounds": bounds,
     }
 
 
+def _product_search_rows(filename, df, keyword):
+    """Row positions whose 품목명[규격] contains keyword — same rule as
+    str.contains(keyword, case=False, regex=False), but evaluated on candidate distinct names only.
+    """
+    cache_key = _detail_cache_key(filename)
+    index = _search_index_cache.get(cache_key)
+    if index is None or index["n_rows"] != len(df):
+        index = _search_index_cache[cache_key] = _build_search_index(df)
+
+    names = index["names"]
+    candidates = np.arange(len(names))
+    # keyword ⊂ name ⇒ every keyword n-gram (whitespace-free, lower-cased) is a name n-gram
+    for gram in sorted(_search_grams(_search_norm(keyword)), key=lambda g: len(index["postings"].get(g, ()))):
+        hits = index["postings"].get(gram)
+        if hits is None:
+            return np.array([], dtype=np.intp)
+        candidates = np.intersect1d(candidates, hits, assume_unique=True)
+        if not len(candidates):
+            return np.array([], dtype=np.intp)
+
+    matched = candidates[pd.Series(names[candidates], dtype=object)
+                         .str.contains(keyword, case=False, regex=False, na=False).to_numpy()]
+    order, bounds = index["order"], index["bounds"]
+    if not len(matched):
+        return np.array([], dtype=np.intp)
+    return np.sort(np.concatenate([order[bounds[i]:bounds[i + 1]] for i in matched]))
+
+
+def _product_search_filter(filename, df, keyword, part=None, channel=None, account=None):
+    """키워드 + 채널 필터. (필터된 프레임, 라벨 목록)"""
+    df_filtered = df      # 아래 필터는 모두 새 프레임을 만든다 — 원본 복사 불필요
+    labels = []
+
+    if keyword and keyword.strip():
+        keyword = keyword.strip()
+        # 대소문자 무시 검색 — 상품명 n-gram 색인으로 후보 상품명만 확인
+        df_filtered = df_filtered.iloc[_product_search_rows(filename, df, keyword)]
+        labels.append(f"검색: {keyword}")
+
+    if part and part != 'all':
+        df_filtered = df_filtered[df_filtered['파트구분'] == part]
+        labels.append(part)
+
+    if channel and channel != 'all':
+        df_filtered = df_filtered[df_filtered['채널구분'] == channel]
+        labels.append(channel)
+
+    if account and account != 'all':
+        df_filtered = df_filtered[df_filtered['거래처명'] == account]
+        labels.append(account)
+
+    return df_filtered, labels
+
+
+def _product_search_label(labels, product_count):
+    if labels:
+        return " > ".join(labels) + f" ({product_count}건)"
+    return f"전체 ({product_count}건)"
+
+
+def _excel_dates(series):
+    """일별 컬럼 → datetime. 엑셀 일련번호와 날짜 문자열이 섞여 있어도 처리."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    numeric_dates = pd.to_numeric(series, errors='coerce')
+    date_series = pd.to_datetime(numeric_dates, unit='D', origin='1899-12-30')
+    mask = date_series.isna() & series.notna()
+    if mask.any():
+        try:
+            date_series.loc[mask] = pd.to_datetime(series.loc[mask], errors='coerce')
+        except Exception:
+            pass
+    return date_series
+
+
 def get_product_search_sales(
     filename: str,
     keyword: str,
@@ -1604,10 +1710,6 @@ def get_product_search_sales(
     all_months = generate_yyyymm_range(min_m, max_m)
     days_list, debug_logs = calculate_days_list(df, all_months)
     
-    # 필터링 시작
-    df_filtered = df.copy()
-    labels = []
-    
     # 키워드 필터링 (품목명[규격])
     product_name_col = '품목명[규격]'
     product_code_col = '품목코드'
@@ -1622,25 +1724,8 @@ def get_product_search_sales(
             "label": "Error"
         }
     
-    if keyword and keyword.strip():
-        keyword = keyword.strip()
-        # 대소문자 무시 검색
-        mask = df_filtered[product_name_col].astype(str).str.contains(keyword, case=False, na=False)
-        df_filtered = df_filtered[mask]
-        labels.append(f"검색: {keyword}")
-    
-    # 채널 필터링
-    if part and part != 'all':
-        df_filtered = df_filtered[df_filtered['파트구분'] == part]
-        labels.append(part)
-    
-    if channel and channel != 'all':
-        df_filtered = df_filtered[df_filtered['채널구분'] == channel]
-        labels.append(channel)
-    
-    if account and account != 'all':
-        df_filtered = df_filtered[df_filtered['거래처명'] == account]
-        labels.append(account)
+    # 키워드 + 채널 필터링
+    df_filtered, labels = _product_search_filter(filename, df, keyword, part, channel, account)
     
     # 매칭된 상품 목록 (품목코드 + 품목명[규격])
     matched_products = []
@@ -1664,11 +1749,7 @@ def get_product_search_sales(
     monthly_profit = df_filtered.groupby('월구분')['이익'].sum().reindex(all_months, fill_value=0)
     
     # 라벨 생성
-    product_count = len(matched_products)
-    if labels:
-        current_label = " > ".join(labels) + f" ({product_count}건)"
-    else:
-        current_label = f"전체 ({product_count}건)"
+    current_label = _product_search_label(labels, len(matched_products))
     
     result = {
         "months": [str(int(month)) for month in all_months],
@@ -1695,45 +1776,15 @@ def get_daily_product_search_sales(
     """
     df = get_dataframe(filename)
     
-    # Date Processing
-    date_col = '일별'
-    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        numeric_dates = pd.to_numeric(df[date_col], errors='coerce')
-        date_series = pd.to_datetime(numeric_dates, unit='D', origin='1899-12-30')
-        mask = date_series.isna() & df[date_col].notna()
-        if mask.any():
-            try:
-                date_series.loc[mask] = pd.to_datetime(df.loc[mask, date_col], errors='coerce')
-            except Exception:
-                pass
-        df[date_col] = date_series
-    
-    # 필터링 시작
-    df_filtered = df.copy()
-    labels = []
-    
-    # 키워드 필터링
+    # 키워드 + 채널 필터링
     product_name_col = '품목명[규격]'
     product_code_col = '품목코드'
+    df_filtered, labels = _product_search_filter(filename, df, keyword, part, channel, account)
     
-    if keyword and keyword.strip():
-        keyword = keyword.strip()
-        mask = df_filtered[product_name_col].astype(str).str.contains(keyword, case=False, na=False)
-        df_filtered = df_filtered[mask]
-        labels.append(f"검색: {keyword}")
-    
-    # 채널 필터링
-    if part and part != 'all':
-        df_filtered = df_filtered[df_filtered['파트구분'] == part]
-        labels.append(part)
-    
-    if channel and channel != 'all':
-        df_filtered = df_filtered[df_filtered['채널구분'] == channel]
-        labels.append(channel)
-    
-    if account and account != 'all':
-        df_filtered = df_filtered[df_filtered['거래처명'] == account]
-        labels.append(account)
+    # Date Processing (after filtering, on a new frame — never on the shared cached one)
+    date_col = '일별'
+    if not pd.api.types.is_datetime64_any_dtype(df_filtered[date_col]):
+        df_filtered = df_filtered.assign(**{date_col: _excel_dates(df_filtered[date_col])})
     
     # 매칭된 상품 목록
     matched_products = []
@@ -1765,11 +1816,7 @@ def get_daily_product_search_sales(
         profit = []
     
     # 라벨 생성
-    product_count = len(matched_products)
-    if labels:
-        current_label = " > ".join(labels) + f" ({product_count}건)"
-    else:
-        current_label = f"전체 ({product_count}건)"
+    current_label = _product_search_label(labels, len(matched_products))
     
     return {
         "dates": dates,
@@ -1778,3 +1825,83 @@ def get_daily_product_search_sales(
         "matched_products": matched_products,
         "label": current_label
     }
+
+
+def get_product_search(
+    filename: str,
+    keyword: str,
+    part: str = None,
+    channel: str = None,
+    account: str = None,
+    product_codes: str = None,
+    offset: int = 0,
+    limit: int = 100,
+):
+    """
+    상품 검색 통합 응답 — 월별 · 일별 시리즈와 매출순 상품 목록(페이지)을 필터 한 번으로.
+    - 상품 목록은 키워드/채널 필터 결과 전체 기준(체크박스 후보), 매출 내림차순
+    - product_codes는 월별 · 일별 시리즈 양쪽에 적용
+    """
+    df = get_dataframe(filename)
+
+    product_name_col = '품목명[규격]'
+    product_code_col = '품목코드'
+    if product_name_col not in df.columns:
+        return {"error": f"Column '{product_name_col}' not found", "label": "Error"}
+
+    min_m = df['월구분'].min()
+    max_m = df['월구분'].max()
+    all_months = generate_yyyymm_range(min_m, max_m)
+    days_list, debug_logs = calculate_days_list(df, all_months)
+
+    df_filtered, labels = _product_search_filter(filename, df, keyword, part, channel, account)
+
+    # 매칭 상품 (품목코드, 품목명) 쌍별 매출·이익 — 동률은 첫 등장 순
+    ranked = (df_filtered.groupby([product_code_col, product_name_col], sort=False, dropna=False)[['판매액', '이익']]
+              .sum()
+              .reset_index()
+              .sort_values('판매액', ascending=False, kind='stable'))
+    page = ranked.iloc[offset:offset + limit]
+    items = [
+        {"code": str(code), "name": str(name), "sales": float(sales), "profit": float(profit)}
+        for code, name, sales, profit in zip(page[product_code_col], page[product_name_col], page['판매액'], page['이익'])
+    ]
+
+    if product_codes and product_codes.strip():
+        code_list = [c.strip() for c in product_codes.split(',') if c.strip()]
+        if code_list:
+            df_filtered = df_filtered[df_filtered[product_code_col].astype(str).isin(code_list)]
+            labels.append(f"선택 {len(code_list)}개")
+
+    monthly = df_filtered.groupby('월구분')[['판매액', '이익']].sum().reindex(all_months, fill_value=0)
+
+    dates = _excel_dates(df_filtered['일별'])
+    daily_rows = df_filtered[['판매액', '이익']][dates.notna()]
+    dates = dates[dates.notna()]
+    if len(dates):
+        full_range = pd.date_range(start=dates.min(), end=dates.max(), freq='D')
+        daily = daily_rows.groupby(dates.values)[['판매액', '이익']].sum().reindex(full_range, fill_value=0)
+    else:
+        daily = pd.DataFrame({'판매액': [], '이익': []}, index=pd.DatetimeIndex([]))
+
+    return {
+        "monthly": {
+            "months": [str(int(month)) for month in all_months],
+            "sales": monthly['판매액'].tolist(),
+            "profit": monthly['이익'].tolist(),
+            "days_list": days_list,
+        },
+        "daily": {
+            "dates": daily.index.strftime('%Y-%m-%d').tolist(),
+            "sales": daily['판매액'].tolist(),
+            "profit": daily['이익'].tolist(),
+        },
+        "matched_products": {
+            "items": items,
+            "total": len(ranked),
+            "offset": offset,
+            "limit": limit,
+        },
+        "label": _product_search_label(labels, len(ranked)),
+        "debug_logs": debug_logs,
+    }
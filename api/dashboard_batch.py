@@ -0,0 +1,132 @@
+"""대시보드 위젯 일괄 조회 — POST /api/dashboard/batch.
+
+대시보드 첫 화면은 같은 filename으로 GET을 8개 안팎 보낸다. 배치는 파일 동기화·해시·DataFrame 로드를
+한 번만 하고, 위젯은 워커 풀에서 같은 캐시 프레임을 공유하며 병렬로 계산한다.
+각 위젯은 개별 GET과 같은 결과 캐시 키(dashboard/<위젯>)를 쓰므로 배치로 채운 결과를 GET이 재사용하고 그 반대도 같다.
+"""
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, Optional
+
+from fastapi import HTTPException
+
+from heavy_pool import run_heavy
+from result_cache import cached_result
+
+BATCH_MAX_WIDGETS = 32
+BATCH_WORKERS = int(os.environ.get("DASHBOARD_BATCH_WORKERS", min(8, (os.cpu_count() or 1) + 1)))
+
+# 위젯 이름 → (dashboard 함수명, 허용 파라미터, 실패 메시지). 파라미터 이름·순서는 개별 GET과 같다.
+_HIERARCHY = ("group", "category", "sub_category", "part", "channel", "account")
+WIDGETS = {
+    "monthly-sales": ("get_monthly_sales_by_channel", (), "데이터 처리 실패"),
+    "product-group-sales": ("get_monthly_sales_by_product_group", (), "데이터 처리 실패"),
+    "options": ("get_hierarchical_options", (), "옵션 데이터 처리 실패"),
+    "channel-options": ("get_channel_layer_options", (), "옵션 데이터 처리 실패"),
+    "summary": ("get_monthly_summary", (), "요약 데이터 처리 실패"),
+    "alerts": ("analyze_sales_performance", (), "알림 분석 실패"),
+    "ecommerce-details": ("get_ecommerce_details", ("segments",), "상세 데이터 처리 실패"),
+    "hierarchical-sales": ("get_filtered_monthly_sales", _HIERARCHY, "데이터 처리 실패"),
+    "channel-sales": ("get_channel_layer_sales",
+                      ("part", "channel", "account", "group", "category", "sub_category"), "데이터 처리 실패"),
+    "daily-hierarchical-sales": ("get_daily_hierarchical_sales", _HIERARCHY, "데이터 처리 실패"),
+}
+
+# 개별 GET과 마찬가지로 heavy_pool 실행 모드를 따르는 위젯
+HEAVY_WIDGETS = {"ecommerce-details", "alerts"}
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="dashboard-batch")
+        return _pool
+
+
+def validate_specs(specs: list) -> list:
+    """[(id, widget, params)] 정규화. 잘못된 요청은 ValueError(메시지는 그대로 400 detail)."""
+    if not specs:
+        raise ValueError("위젯이 비어 있습니다.")
+    if len(specs) > BATCH_MAX_WIDGETS:
+        raise ValueError(f"최대 {BATCH_MAX_WIDGETS}개 위젯까지 요청할 수 있습니다.")
+    out, seen = [], set()
+    for widget, widget_id, params in specs:
+        if widget not in WIDGETS:
+            raise ValueError(f"알 수 없는 위젯: {widget}")
+        widget_id = widget_id or widget
+        if widget_id in seen:
+            raise ValueError(f"중복된 위젯 id: {widget_id}")
+        seen.add(widget_id)
+        allowed = WIDGETS[widget][1]
+        unknown = sorted(set(params) - set(allowed))
+        if unknown:
+            raise ValueError(f"{widget}: 지원하지 않는 파라미터 {', '.join(unknown)}")
+        if widget == "ecommerce-details":
+            from dashboard import resolve_detail_segments
+            resolve_detail_segments(params.get("segments"))
+        out.append((widget_id, widget, {k: params.get(k) for k in allowed}))
+    return out
+
+
+def run_widget(filename: str, widget: str, params: dict):
+    """위젯 하나 — 개별 GET과 같은 키로 결과 캐시를 거친다."""
+    func_name, allowed, _ = WIDGETS[widget]
+    args = tuple(params[k] for k in allowed)
+    if widget in HEAVY_WIDGETS:
+        compute = lambda: run_heavy("dashboard", func_name, filename, *args)
+    else:
+        import dashboard
+        compute = lambda: getattr(dashboard, func_name)(filename, *args)
+    return cached_result(f"dashboard/{widget}", filename, params, compute)
+
+
+def _error(widget: str, e: Exception) -> dict:
+    if isinstance(e, HTTPException):
+        return {"status": e.status_code, "detail": e.detail}
+    if isinstance(e, FileNotFoundError):
+        return {"status": 404, "detail": "파일을 찾을 수 없습니다"}
+    return {"status": 500, "detail": f"{WIDGETS[widget][2]}: {str(e)}"}
+
+
+def iter_batch(filename: str, specs: list) -> Iterator[tuple]:
+    """(id, widget, result, error) 를 완료 순서대로. 한 위젯 실패는 그 항목의 error로만 남는다.
+
+    프레임 로드는 호출 전에 한 번 끝내 둔다(prepare) — 워커들은 캐시 히트만 한다.
+    """
+    # 요청의 취소 토큰(contextvar)이 워커 스레드에서도 보이도록 위젯마다 컨텍스트를 복사해 넘긴다
+    futures = {
+        _executor().submit(contextvars.copy_context().run, run_widget, filename, widget, params): (widget_id, widget)
+        for widget_id, widget, params in specs
+    }
+    for future in as_completed(futures):
+        widget_id, widget = futures[future]
+        try:
+            yield widget_id, widget, future.result(), None
+        except Exception as e:
+            yield widget_id, widget, None, _error(widget, e)
+
+
+def prepare(filename: str) -> None:
+    """파일 해시와 DataFrame을 한 번 해석해 캐시에 올린다(위젯들이 공유)."""
+    from dashboard import get_dataframe
+    get_dataframe(filename)
+
+
+def run_batch(filename: str, specs: list) -> dict:
+    results, errors = {}, {}
+    for widget_id, _, result, error in iter_batch(filename, specs):
+        if error is None:
+            results[widget_id] = result
+        else:
+            errors[widget_id] = error
+    order = [widget_id for widget_id, _, _ in specs]
+    return {
+        "results": {k: results[k] for k in order if k in results},
+        "errors": {k: errors[k] for k in order if k in errors},
+    }
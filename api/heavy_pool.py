@@ -0,0 +1,208 @@
+"""무거운 집계 실행기 — HEAVY_EXECUTION=process 이면 상주 프로세스 풀에서 계산한다.
+
+엔드포인트는 모두 동기 def라 FastAPI 스레드풀에서 돈다. pandas groupby와 Python 루프
+(get_ecommerce_details, analyze_sales_performance, 일 리뷰 A/B 판정)는 GIL을 잡고 있어
+무거운 요청 하나가 같은 프로세스의 다른 요청·이벤트 루프를 함께 멈춘다. 프로세스 모드에서는 요청 스레드가
+결과를 기다리는 동안 GIL을 놓으므로 가벼운 엔드포인트가 계속 응답한다.
+
+- 프레임은 피클로 넘기지 않는다. 부모가 parquet 캐시(uploads/cache/<해시>.parquet)를 보장하고
+  워커에는 (파일명, 해시)만 보낸다. 워커는 get_dataframe으로 같은 parquet를 읽어 자기 메모리에 둔다.
+- 기본값은 thread(요청 스레드에서 바로 계산). Vercel은 상주 프로세스가 없어 항상 thread.
+- 요청의 마감 시각(cancellation)과 작업별 취소 플래그(Manager Event)를 워커에 넘긴다. 예산을 넘기거나
+  클라이언트가 떠나면 그 작업만 다음 단계 경계에서 멈춘다 — 같은 풀의 다른 요청은 계속 돈다.
+  유예(KILL_GRACE_SECONDS) 안에 멈추지 않는 워커는 그 작업이 풀에서 유일하게 실행 중일 때만 종료한다.
+- 워커가 죽으면(BrokenProcessPool) 새 풀에 한 번 더 보내고, 그래도 실패하면 요청 스레드에서 계산한다.
+"""
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from fastapi import HTTPException
+
+from cancellation import CancelToken, RequestCancelled, bind, checkpoint, current_token
+
+HEAVY_EXECUTION = "thread" if os.environ.get("VERCEL") else os.environ.get("HEAVY_EXECUTION", "thread")
+HEAVY_WORKERS = int(os.environ.get("HEAVY_WORKERS", 2))
+HEAVY_WORKER_FRAMES = 2        # 워커별로 메모리에 둘 파일(해시) 수. 업로드 파일은 최신 1~2개가 대부분
+CANCEL_POLL_SECONDS = 0.2      # 워커 결과를 기다리며 연결 종료를 확인하는 주기
+KILL_GRACE_SECONDS = 5.0       # 취소 후 워커가 다음 단계 경계에서 스스로 멈추길 기다리는 시간
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_inflight: dict = {}           # 풀 → 제출했지만 끝나지 않은 future 집합 (_pool_lock 안에서만)
+_manager = None                # 작업별 취소 플래그를 워커와 공유하는 Manager (첫 요청 때 띄운다)
+
+
+class _WorkerHTTPError(Exception):
+    """워커에서 난 HTTPException. HTTPException은 피클로 되살릴 수 없어 (status, detail)로 옮긴다."""
+
+    def __init__(self, status_code: int, detail):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: 요청 스레드·DB 연결을 가진 프로세스를 fork하지 않는다
+            _pool = ProcessPoolExecutor(max_workers=HEAVY_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _cancel_flag():
+    """작업 하나의 취소 플래그. 부모가 set()하면 그 작업의 워커 checkpoint()가 499로 멈춘다."""
+    global _manager
+    with _pool_lock:
+        if _manager is None:
+            _manager = multiprocessing.get_context("spawn").Manager()
+        manager = _manager
+    return manager.Event()
+
+
+def _submit(pool: ProcessPoolExecutor, *args):
+    future = pool.submit(_worker_call, *args)
+    with _pool_lock:
+        _inflight.setdefault(pool, set()).add(future)
+    future.add_done_callback(lambda f: _forget(pool, f))
+    return future
+
+
+def _forget(pool: ProcessPoolExecutor, future) -> None:
+    with _pool_lock:
+        _inflight.get(pool, set()).discard(future)
+
+
+def _runs_alone(pool: ProcessPoolExecutor, future) -> bool:
+    """future 말고 이 풀에서 실행 중인 작업이 없는가. 대기 중인 작업은 새 풀에서 처음부터 돌아 잃을 것이 없다."""
+    with _pool_lock:
+        return not any(f.running() for f in _inflight.get(pool, ()) if f is not future)
+
+
+def _reset_pool(broken: ProcessPoolExecutor, terminate: bool = False) -> None:
+    """풀 교체. terminate=True면 실행 중인 워커를 바로 죽인다 — 같은 풀의 다른 요청은 BrokenProcessPool로 재시도."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+        _inflight.pop(broken, None)
+    if terminate:
+        for process in list((broken._processes or {}).values()):
+            process.terminate()
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    global _pool, _manager
+    with _pool_lock:
+        pool, _pool = _pool, None
+        manager, _manager = _manager, None
+        _inflight.clear()
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    if manager is not None:
+        manager.shutdown()
+
+
+def _trim_worker_frames() -> None:
+    """워커 메모리의 프레임·파생 캐시(일 리뷰 상태 포함)를 최근 HEAVY_WORKER_FRAMES개 파일로 제한한다."""
+    import dashboard
+    for key in list(dashboard.df_cache)[:-HEAVY_WORKER_FRAMES]:
+        for cache in (dashboard.df_cache, dashboard._search_index_cache):
+            cache.pop(key, None)
+        with dashboard._detail_cache_lock:
+            dashboard._detail_cache.pop(key, None)
+    daily_review = sys.modules.get("daily_review")     # 일 리뷰를 계산한 워커에만 있다
+    if daily_review is not None:
+        with daily_review._cache_lock:
+            while len(daily_review._state_cache) > HEAVY_WORKER_FRAMES:
+                daily_review._state_cache.popitem(last=False)
+
+
+def _worker_call(module_name: str, func_name: str, filename: str, file_hash: str, args: tuple,
+                 deadline: Optional[float] = None, cancel_flag=None):
+    """워커 프로세스 진입점. 부모와 같은 해시로 같은 parquet를 읽도록 파일명→해시를 먼저 심는다."""
+    import dashboard
+    dashboard._filename_hash_cache[filename] = file_hash
+    func = getattr(importlib.import_module(module_name), func_name)
+    try:
+        with bind(CancelToken(deadline, cancel_flag)):
+            return func(filename, *args)
+    except RequestCancelled:
+        raise
+    except HTTPException as e:
+        raise _WorkerHTTPError(e.status_code, e.detail) from None
+    finally:
+        _trim_worker_frames()
+
+
+def _await_worker(pool: ProcessPoolExecutor, future, cancel_flag=None):
+    """결과를 기다리되, 요청이 취소되면 대기 중인 작업은 취소하고 실행 중인 작업에는 취소 플래그를 세운다.
+
+    워커는 다음 단계 경계에서 RequestCancelled로 멈춘다. 유예 안에 멈추지 않으면 요청은 먼저 끝내고,
+    워커는 이 작업이 풀에서 유일하게 실행 중일 때만 종료한다 — 다른 요청의 작업을 함께 죽이지 않는다.
+    """
+    token = current_token()
+    cancelled_at = None
+    while True:
+        try:
+            return future.result(timeout=CANCEL_POLL_SECONDS if token is not None else None)
+        except FutureTimeout:
+            if not token.cancelled:
+                continue
+            if future.cancel():
+                checkpoint()
+            if cancelled_at is None:
+                cancelled_at = time.time()
+                if cancel_flag is not None:
+                    cancel_flag.set()
+            if time.time() > cancelled_at + KILL_GRACE_SECONDS:
+                if _runs_alone(pool, future):
+                    logging.info(f"Terminating heavy worker pool for cancelled request ({token.reason})")
+                    _reset_pool(pool, terminate=True)
+                else:
+                    logging.warning(f"Cancelled heavy job still running after {KILL_GRACE_SECONDS}s; "
+                                    f"leaving it to stop at its next checkpoint ({token.reason})")
+                checkpoint()
+
+
+def run_heavy(module_name: str, func_name: str, filename: str, *args):
+    """module.func(filename, *args)를 실행 모드에 따라 요청 스레드 또는 프로세스 풀에서 계산한다.
+
+    func는 모듈 최상위 함수, 인자·반환값은 피클 가능해야 한다. 파일 해시나 parquet 캐시가 없으면
+    (원본 없음·저장 실패) 넘길 공유 사본이 없으므로 요청 스레드에서 계산한다 — 오류도 그대로 전파된다.
+    """
+    func = getattr(importlib.import_module(module_name), func_name)
+    if HEAVY_EXECUTION != "process":
+        return func(filename, *args)
+
+    from dashboard import cached_parquet_path
+    from result_cache import file_hash_of
+    file_hash = file_hash_of(filename)
+    if not file_hash or cached_parquet_path(filename) is None:
+        return func(filename, *args)
+
+    token = current_token()
+    deadline = token.deadline if token is not None else None
+    cancel_flag = _cancel_flag() if token is not None else None     # 토큰이 없으면 취소할 일도 없다
+    for _ in range(2):
+        checkpoint()
+        pool = _executor()
+        try:
+            future = _submit(pool, module_name, func_name, filename, file_hash, args, deadline, cancel_flag)
+            return _await_worker(pool, future, cancel_flag)
+        except _WorkerHTTPError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        except BrokenProcessPool:
+            _reset_pool(pool)
+    logging.warning(f"Heavy worker pool broken during {module_name}.{func_name}; recomputing in-thread")
+    return func(filename, *args)
@@ -0,0 +1,158 @@
+"""조건부 GET — 강한 ETag + If-None-Match → 304 Not Modified.
+
+대시보드·리뷰 응답은 (파일 내용 SHA256, 경로, 쿼리)로 정해진다. 그런 경로는 응답을 만들기 전에
+ETag를 계산해 일치하면 집계·직렬화 없이 304를 돌려준다. 나머지 JSON GET(파일 목록·설정 등)은
+본문 해시로 ETag를 붙인다 — 계산은 하지만 전송은 아낀다.
+
+Cache-Control은 'private, no-cache'. 같은 파일명으로 재업로드하면 같은 URL의 내용이 바뀌므로
+max-age로 캐시를 믿게 하지 않고, 매번 재검증하되 바뀌지 않았으면 304로 본문 전송을 생략한다.
+"""
+import hashlib
+import os
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from result_cache import BASE_DIR, _CODE_VERSION, file_hash_of
+
+TARGETS_DIR = os.path.join(BASE_DIR, "uploads", "targets")
+CACHE_CONTROL = "private, no-cache"
+
+# 응답이 (파일 내용, 경로, 쿼리)만으로 정해지는 GET 경로(/api 접두 제거 후). filename 쿼리가 있을 때만 적용.
+HASH_ADDRESSED = (
+    "/api/dashboard/",
+    "/monthly-review/months/",
+    "/monthly-review/summary/",
+    "/daily-review/summary/",
+    "/daily-review/backtest/",
+    "/daily-review/pace/",
+    "/daily-review/watch/",
+)
+
+
+def _route_path(path: str) -> str:
+    """라우터가 루트와 /api 두 곳에 마운트돼 있다. 같은 자원이 같은 ETag를 갖도록 /api 접두를 한 겹 벗긴다."""
+    if path.startswith("/api/") and not path.startswith("/api/dashboard/"):
+        return path[len("/api"):]
+    return path
+
+
+def _targets_version() -> tuple:
+    """목표 파일(이름, 수정 시각) 목록 — 월·일 리뷰 응답의 파일 밖 입력."""
+    if not os.path.isdir(TARGETS_DIR):
+        return ()
+    return tuple(sorted((f, os.path.getmtime(os.path.join(TARGETS_DIR, f))) for f in os.listdir(TARGETS_DIR)))
+
+
+def _implicit_filename(route: str) -> Optional[str]:
+    """filename 없이 부르는 경로의 대상 파일. 일 리뷰는 엔드포인트와 같이 최신 YYMMDD 파일을 쓴다."""
+    if not route.startswith("/daily-review/"):
+        return None
+    from daily_review import _latest_filename
+    try:
+        return _latest_filename()
+    except Exception:
+        return None
+
+
+def content_etag(path: str, query_string: bytes) -> Optional[str]:
+    """응답 전에 알 수 있는 ETag. 해시 주소 경로가 아니거나 파일 해시를 모르면 None."""
+    route = _route_path(path)
+    if not route.startswith(HASH_ADDRESSED):
+        return None
+    params = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+    filename = dict(params).get("filename") or _implicit_filename(route)
+    if not filename:
+        return None
+    file_hash = file_hash_of(filename)
+    if not file_hash:
+        return None
+    key = repr((_CODE_VERSION, file_hash, filename, route, params, _targets_version()))
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def body_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+async def _send_not_modified(send, etag: str) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": 304,
+        "headers": [(b"etag", etag.encode()), (b"cache-control", CACHE_CONTROL.encode())],
+    })
+    await send({"type": "http.response.body", "body": b""})
+
+
+class ConditionalGetMiddleware:
+    """GET 응답에 ETag/Cache-Control을 붙이고 If-None-Match가 맞으면 304로 답한다.
+
+    200 이외 응답, Cache-Control: no-store를 직접 단 응답(월 리뷰 섹션 스트리밍 등), JSON이 아닌 본문
+    (ndjson 스트리밍 등, 미리 계산한 ETag가 없을 때)은 건드리지 않는다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        etag = await run_in_threadpool(content_etag, scope["path"], scope.get("query_string", b""))
+        if etag and etag_matches(if_none_match, etag):
+            await _send_not_modified(send, etag)
+            return
+
+        start = None
+        chunks: list = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if message["status"] != 200 or "no-store" in headers.get("cache-control", ""):
+                    passthrough = True
+                    await send(message)
+                    return
+                if etag:
+                    headers["ETag"] = etag
+                    headers["Cache-Control"] = CACHE_CONTROL
+                    passthrough = True
+                    await send(message)
+                    return
+                if not headers.get("content-type", "").startswith("application/json"):
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message                      # 본문을 다 받아 해시한 뒤 보낸다
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            tag = body_etag(body)
+            if etag_matches(if_none_match, tag):
+                await _send_not_modified(send, tag)
+                return
+            headers = MutableHeaders(scope=start)
+            headers["ETag"] = tag
+            headers["Cache-Control"] = CACHE_CONTROL
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
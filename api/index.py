@@ -9,7 +9,7 @@ from dotenv import load_dotenv
 logging.basicConfig(level=logging.INFO)
 load_dotenv()
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, APIRouter, Header
+from fastapi import FastAPI, UploadFile, File, HTTPException, APIRouter, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from database import (
@@ -18,14 +18,44 @@ from database import (
     cleanup_old_files_in_db, get_file_count,
     get_hash_by_filename,
 )
+from result_cache import cached_result, clear_result_cache, file_hash_of
+from heavy_pool import run_heavy, shutdown_pool
+from columnar import FORMATS, shaped
+from materialize import schedule_materialize, shutdown_materializer
 
-app = FastAPI(title="Sales Analysis API")
+from responses import CompressionMiddleware, FastJSONResponse, FastJSONRoute
+
+app = FastAPI(title="Sales Analysis API", default_response_class=FastJSONResponse)
 
 @app.get("/api/health")
 def health_check():
     return {"status": "ok", "message": "API is running"}
 
-router = APIRouter()
+@app.get("/api/admission/metrics")
+def admission_metrics():
+    """풀별 동시 실행 · 대기열 깊이 · 거절 수 (admission.py)"""
+    from admission import snapshot
+    return snapshot()
+
+@app.get("/api/materialize/status")
+def materialize_status():
+    """업로드 후 기본 화면 미리 계산 — 대기·실행 중 파일, 최근 실행 결과 (materialize.py)"""
+    from materialize import status
+    return status()
+
+router = APIRouter(route_class=FastJSONRoute)
+
+# Time budget → admission → conditional GET (ETag / 304) → compression → CORS, innermost first. CORS stays
+# outermost so 304s and 503s carry CORS headers; compression sits outside ETag so tags are computed on the
+# identity body (weakened when compressed); admission sits inside ETag so 304 revalidations never queue;
+# the budget clock starts once a request is admitted.
+from admission import AdmissionMiddleware
+from cancellation import BudgetMiddleware
+from http_cache import ConditionalGetMiddleware
+app.add_middleware(BudgetMiddleware)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(ConditionalGetMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 # Configure CORS
 app.add_middleware(
@@ -39,6 +69,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 # Use absolute path for Railway Volume or Vercel /tmp
@@ -58,6 +89,11 @@ async def startup_event():
     init_db()
     logging.info("Application started, database initialized")
 
+@app.on_event("shutdown")
+def shutdown_event():
+    shutdown_pool()
+    shutdown_materializer()
+
 def ensure_file_on_disk(filename: str):
     """Ensure that the file exists on the local disk (fetching from DB if needed)"""
     if not filename:
@@ -412,6 +448,9 @@ def upload_file(file: UploadFile = File(...)):
         
         # Clean up temp file
         os.remove(temp_path)
+
+        # Precompute the default views for the new content in the background
+        schedule_materialize(file.filename)
         
         # Return simple success response
         return {
@@ -526,7 +565,7 @@ def get_dashboard_monthly_sales(filename: str):
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_monthly_sales_by_channel
-        result = get_monthly_sales_by_channel(filename)
+        result = cached_result("dashboard/monthly-sales", filename, {}, lambda: get_monthly_sales_by_channel(filename))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
@@ -538,7 +577,7 @@ def get_dashboard_product_group_sales(filename: str):
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_monthly_sales_by_product_group
-        result = get_monthly_sales_by_product_group(filename)
+        result = cached_result("dashboard/product-group-sales", filename, {}, lambda: get_monthly_sales_by_product_group(filename))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
@@ -550,7 +589,7 @@ def get_dashboard_options(filename: str):
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_hierarchical_options
-        result = get_hierarchical_options(filename)
+        result = cached_result("dashboard/options", filename, {}, lambda: get_hierarchical_options(filename))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
@@ -570,7 +609,9 @@ def get_dashboard_hierarchical_sales(
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_filtered_monthly_sales
-        result = get_filtered_monthly_sales(filename, group, category, sub_category, part, channel, account)
+        params = dict(group=group, category=category, sub_category=sub_category, part=part, channel=channel, account=account)
+        result = cached_result("dashboard/hierarchical-sales", filename, params,
+                               lambda: get_filtered_monthly_sales(filename, group, category, sub_category, part, channel, account))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
@@ -582,7 +623,7 @@ def get_dashboard_channel_options(filename: str):
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_channel_layer_options
-        result = get_channel_layer_options(filename)
+        result = cached_result("dashboard/channel-options", filename, {}, lambda: get_channel_layer_options(filename))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
@@ -602,7 +643,9 @@ def get_dashboard_channel_sales(
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_channel_layer_sales
-        result = get_channel_layer_sales(filename, part, channel, account, group, category, sub_category)
+        params = dict(part=part, channel=channel, account=account, group=group, category=category, sub_category=sub_category)
+        result = cached_result("dashboard/channel-sales", filename, params,
+                               lambda: get_channel_layer_sales(filename, part, channel, account, group, category, sub_category))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
@@ -755,15 +798,9 @@ def get_dashboard_daily_hierarchical_sales(
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_daily_hierarchical_sales
-        result = get_daily_hierarchical_sales(
-            filename, 
-            group=group, 
-            category=category, 
-            sub_category=sub_category,
-            part=part,
-            channel=channel,
-            account=account
-        )
+        params = dict(group=group, category=category, sub_category=sub_category, part=part, channel=channel, account=account)
+        result = cached_result("dashboard/daily-hierarchical-sales", filename, params,
+                               lambda: get_daily_hierarchical_sales(filename, **params))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
@@ -775,7 +812,7 @@ def get_dashboard_summary(filename: str):
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_monthly_summary
-        result = get_monthly_summary(filename)
+        result = cached_result("dashboard/summary", filename, {}, lambda: get_monthly_summary(filename))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
@@ -786,21 +823,36 @@ def get_dashboard_summary(filename: str):
 def get_dashboard_alerts(filename: str):
     try:
         ensure_file_on_disk(filename)
-        from dashboard import analyze_sales_performance
-        result = analyze_sales_performance(filename)
+        result = cached_result("dashboard/alerts", filename, {},
+                               lambda: run_heavy("dashboard", "analyze_sales_performance", filename))
         return result
+    except HTTPException:
+        raise
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"알림 분석 실패: {str(e)}")
 
 @router.get("/api/dashboard/ecommerce-details")
-def get_dashboard_ecommerce_details(filename: str):
+def get_dashboard_ecommerce_details(filename: str, segments: str = None, format: str = "json"):
+    """segments: 쉼표 구분 세그먼트 키/와일드카드 (예: 'coupang,coupang_*,*_coupang'). 생략 시 전체.
+
+    format: json | columnar | arrow — daily/monthly 레코드 배열을 열 배열(columnar) 또는 Arrow IPC 스트림으로.
+    """
     try:
+        from dashboard import resolve_detail_segments
+        try:
+            resolve_detail_segments(segments)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if format not in FORMATS:
+            raise HTTPException(status_code=400, detail=f"잘못된 format: {format} ({' | '.join(FORMATS)})")
         ensure_file_on_disk(filename)
-        from dashboard import get_ecommerce_details
-        result = get_ecommerce_details(filename)
-        return result
+        result = cached_result("dashboard/ecommerce-details", filename, {"segments": segments},
+                               lambda: run_heavy("dashboard", "get_ecommerce_details", filename, segments))
+        return shaped("dashboard/ecommerce-details", filename, {"segments": segments}, result, format)
+    except HTTPException:
+        raise
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
     except Exception as e:
@@ -818,13 +870,39 @@ def get_dashboard_product_search_sales(
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_product_search_sales
-        result = get_product_search_sales(filename, keyword, part, channel, account, product_codes)
+        params = dict(keyword=keyword, part=part, channel=channel, account=account, product_codes=product_codes)
+        result = cached_result("dashboard/product-search-sales", filename, params,
+                               lambda: get_product_search_sales(filename, keyword, part, channel, account, product_codes))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"상품 검색 실패: {str(e)}")
 
+@router.get("/api/dashboard/product-search")
+def get_dashboard_product_search(
+    filename: str,
+    keyword: str = "",
+    part: str = None,
+    channel: str = None,
+    account: str = None,
+    product_codes: str = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """월별 · 일별 시리즈 + 매출순 상품 목록(offset/limit). product_codes는 두 시리즈 모두에 적용."""
+    try:
+        ensure_file_on_disk(filename)
+        from dashboard import get_product_search
+        params = dict(keyword=keyword, part=part, channel=channel, account=account, product_codes=product_codes,
+                      offset=offset, limit=limit)
+        return cached_result("dashboard/product-search", filename, params,
+                             lambda: get_product_search(filename, keyword, part, channel, account, product_codes, offset, limit))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"상품 검색 실패: {str(e)}")
+
 @router.get("/api/dashboard/daily-product-search-sales")
 def get_dashboard_daily_product_search_sales(
     filename: str,
@@ -836,13 +914,64 @@ def get_dashboard_daily_product_search_sales(
     try:
         ensure_file_on_disk(filename)
         from dashboard import get_daily_product_search_sales
-        result = get_daily_product_search_sales(filename, keyword, part, channel, account)
+        params = dict(keyword=keyword, part=part, channel=channel, account=account)
+        result = cached_result("dashboard/daily-product-search-sales", filename, params,
+                               lambda: get_daily_product_search_sales(filename, keyword, part, channel, account))
         return result
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"일별 상품 검색 실패: {str(e)}")
 
+class DashboardWidgetSpec(BaseModel):
+    widget: str
+    id: str = None  # 생략 시 위젯 이름
+    params: dict = {}
+
+class DashboardBatchRequest(BaseModel):
+    filename: str
+    widgets: list[DashboardWidgetSpec]
+    format: str = "json"  # json | ndjson
+
+@router.post("/api/dashboard/batch")
+def post_dashboard_batch(request: DashboardBatchRequest):
+    """여러 대시보드 위젯을 한 번에. 각 결과는 GET /api/dashboard/<widget>과 동일.
+
+    - format=json: {"results": {id: 결과}, "errors": {id: {"status", "detail"}}}
+    - format=ndjson: {"id", "widget", "result"} 또는 {"id", "widget", "error"} 한 줄씩 (완료되는 대로)
+    """
+    from dashboard_batch import validate_specs, prepare, run_batch, iter_batch
+    from responses import dumps
+    from fastapi.responses import StreamingResponse
+
+    if request.format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail=f"잘못된 format: {request.format} (json | ndjson)")
+    try:
+        specs = validate_specs([(w.widget, w.id, w.params) for w in request.widgets])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = request.filename
+    try:
+        if not ensure_file_on_disk(filename):
+            raise FileNotFoundError(filename)
+        prepare(filename)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"데이터 로드 실패: {str(e)}")
+
+    if request.format == "ndjson":
+        def _lines():
+            for widget_id, widget, result, error in iter_batch(filename, specs):
+                line = {"id": widget_id, "widget": widget}
+                line.update({"result": result} if error is None else {"error": error})
+                yield dumps(line) + b"\n"
+
+        return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+    return run_batch(filename, specs)
+
 @router.get("/api/debug/check-data")
 def debug_check_data(filename: str):
     """Debug endpoint to check data columns"""
@@ -905,6 +1034,8 @@ def clear_cache_endpoint(filename: str = None):
     """Clear cache for a specific file or all files"""
     try:
         from dashboard import clear_df_cache
+        from monthly_review import clear_summary_cache
+        from daily_review import clear_review_cache
         import os
         
         cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads", "cache")
@@ -916,9 +1047,15 @@ def clear_cache_endpoint(filename: str = None):
                 file_hash = get_hash_by_filename(filename)
             except Exception:
                 file_hash = None
+            # 결과 캐시는 DB가 없어도 디스크 해시로 키가 잡혀 있다
+            result_hash = file_hash or file_hash_of(filename)
 
             # Clear specific file cache (memory + filename->hash mapping)
             clear_df_cache(filename)
+            if result_hash:
+                clear_summary_cache(result_hash)
+                clear_review_cache(result_hash)
+                clear_result_cache(result_hash)
 
             # Delete parquet cache files (hash-based, plus legacy filename-based)
             candidates = []
@@ -934,6 +1071,9 @@ def clear_cache_endpoint(filename: str = None):
         else:
             # Clear all cache
             clear_df_cache()
+            clear_summary_cache()
+            clear_review_cache()
+            clear_result_cache()
             
             # Delete all parquet files
             if os.path.exists(cache_dir):
@@ -0,0 +1,164 @@
+"""업로드 직후 기본 화면 미리 계산 — 결과 캐시(메모리 + 디스크 스필)를 첫 방문 전에 채운다.
+
+아침 업로드 뒤 첫 방문자는 프레임 로드·집계를 모두 기다리고, 그다음 방문자부터는 결과 캐시 히트다.
+방문 대부분은 같은 파라미터라 업로드가 끝나면 백그라운드 워커가 그 응답들을 계산해 둔다.
+
+- 대상(DEFAULT_VIEWS 순서): 대시보드 첫 화면 위젯(계층 필터는 모두 'all'), 최신 월의 월 리뷰
+  (화면이 부르는 part="*"와 파트별, 목표 파일 미지정), 일 리뷰 기본 화면(target_date 미지정 — 업로드 파일이
+  최신 파일일 때만).
+- 개별 GET과 같은 함수·같은 결과 캐시 키를 거친다(dashboard_batch.run_widget, 각 리뷰 엔드포인트 함수).
+  이미 캐시에 있으면 조회만 하고 넘어간다.
+- 워커는 한 개, 파일 단위로 순서대로. 같은 파일이 대기 중이면 다시 넣지 않는다 — 실행 시점의 파일 해시로 계산한다.
+- 요청 경로가 아니라 입장 제어·시간 예산을 받지 않는다. 무거운 위젯은 heavy_pool 실행 모드를 그대로 따른다.
+- Vercel은 응답 뒤 백그라운드 실행이 보장되지 않고 디스크 스필도 꺼져 있어 하지 않는다.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+MATERIALIZE_ON_UPLOAD = os.environ.get("MATERIALIZE_ON_UPLOAD", "1") != "0" and not os.environ.get("VERCEL")
+MATERIALIZE_RECENT = 10        # status()에 남길 최근 실행 수
+
+_HIERARCHY_ALL = {k: "all" for k in ("group", "category", "sub_category", "part", "channel", "account")}
+
+# (뷰 이름, 대시보드 위젯, 파라미터) — 대시보드 첫 화면이 보내는 GET과 같은 조합
+DASHBOARD_VIEWS = (
+    ("dashboard/summary", "summary", {}),
+    ("dashboard/monthly-sales", "monthly-sales", {}),
+    ("dashboard/product-group-sales", "product-group-sales", {}),
+    ("dashboard/options", "options", {}),
+    ("dashboard/channel-options", "channel-options", {}),
+    ("dashboard/hierarchical-sales", "hierarchical-sales", _HIERARCHY_ALL),
+    ("dashboard/channel-sales", "channel-sales", _HIERARCHY_ALL),
+    ("dashboard/alerts", "alerts", {}),
+    ("dashboard/ecommerce-details", "ecommerce-details", {"segments": None}),
+)
+MONTHLY_PARTS = ("*", "all", "ecommerce", "offline")
+
+_pool: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_pending: set = set()
+_running: Optional[str] = None
+_recent: deque = deque(maxlen=MATERIALIZE_RECENT)
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="materialize")
+        return _pool
+
+
+def shutdown_materializer() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _default_views(filename: str):
+    """(뷰 이름, compute) 순서열. 월 리뷰 최신 월·일 리뷰 최신 파일 여부는 실행 시점에 정한다.
+
+    첫 뷰 전에 DB → 디스크 동기화와 프레임 로드를 끝낸다(POST /api/dashboard/batch와 같은 순서) —
+    업로드는 DB에만 저장될 수 있다. 여기서 난 실패는 materialize가 "*" 하나로 기록한다.
+    """
+    from dashboard_batch import prepare, run_widget
+    from monthly_review import _ensure_file_on_disk
+    if not _ensure_file_on_disk(filename):
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {filename}")
+    prepare(filename)
+
+    for name, widget, params in DASHBOARD_VIEWS:
+        yield name, lambda widget=widget, params=params: run_widget(filename, widget, dict(params))
+
+    import monthly_review
+    months = monthly_review.list_months(filename=filename)["months"]
+    if months:
+        for part in MONTHLY_PARTS:
+            yield (f"monthly-review/summary({months[0]}, {part})",
+                   lambda part=part: monthly_review.get_summary(filename=filename, month=months[0], part=part,
+                                                                target_file=None, format="json"))
+
+    import daily_review
+    try:
+        latest = daily_review._latest_filename()
+    except Exception:
+        latest = None
+    if latest == filename:
+        yield "daily-review/summary", lambda: daily_review.get_daily_review_summary(filename=filename,
+                                                                                   target_date=None)
+
+
+def materialize(filename: str) -> dict:
+    """filename의 기본 뷰를 모두 계산해 결과 캐시에 넣는다. 한 뷰의 실패는 기록만 하고 다음 뷰로 넘어간다."""
+    from result_cache import file_hash_of
+    started = time.monotonic()
+    done, failed = [], {}
+    try:
+        views = _default_views(filename)
+        for name, compute in views:
+            try:
+                compute()
+                done.append(name)
+            except Exception as e:
+                detail = getattr(e, "detail", None) or str(e)
+                failed[name] = detail
+                logging.warning(f"Materialize {name} failed for {filename}: {detail}")
+    except Exception as e:
+        # 파일 동기화·프레임 로드, 월 목록·최신 파일 판정처럼 뷰 목록 자체를 만들다 난 실패
+        failed["*"] = getattr(e, "detail", None) or str(e)
+        logging.warning(f"Materialize aborted for {filename}: {failed['*']}")
+    file_hash = file_hash_of(filename)
+    record = {
+        "filename": filename,
+        "file_hash": file_hash[:12] if file_hash else None,
+        "views": done,
+        "failed": failed,
+        "seconds": round(time.monotonic() - started, 2),
+        "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    logging.info(f"Materialized {len(done)} default views for {filename} in {record['seconds']}s"
+                 + (f" ({len(failed)} failed)" if failed else ""))
+    return record
+
+
+def _run(filename: str) -> None:
+    global _running
+    with _lock:
+        _pending.discard(filename)
+        _running = filename
+    try:
+        _recent.append(materialize(filename))
+    except Exception:
+        logging.exception(f"Materialize failed for {filename}")
+    finally:
+        with _lock:
+            _running = None
+
+
+def schedule_materialize(filename: str) -> bool:
+    """업로드 후 호출. 백그라운드 워커에 넣었으면 True(꺼져 있거나 이미 대기 중이면 False)."""
+    if not MATERIALIZE_ON_UPLOAD:
+        return False
+    with _lock:
+        if filename in _pending:
+            return False
+        _pending.add(filename)
+    _executor().submit(_run, filename)
+    return True
+
+
+def status() -> dict:
+    with _lock:
+        return {
+            "enabled": MATERIALIZE_ON_UPLOAD,
+            "pending": sorted(_pending),
+            "running": _running,
+            "recent": list(_recent),
+        }
@@ -5,19 +5,27 @@ PPT 월간 리뷰 보고서를 화면에서 재현하기 위한 집계 엔드포
 Phase 1: 종합 슬라이드 차트 3개 (목표비 실적 / 전년비 트렌드 / 주력 vs 쿠팡사입).
 """
 import os
+import itertools
 import json
 import logging
 import re
+import threading
+from collections import OrderedDict
 from typing import Optional
 
 import pandas as pd
 from fastapi import APIRouter, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from dashboard import get_dataframe
+from cancellation import checkpoint
+from dashboard import get_dataframe, _resolve_file_hash
 from database import get_file_from_db
+from responses import FastJSONRoute, dumps
+from columnar import FORMATS, shaped
+from result_cache import cached_result, peek_result
 
-router = APIRouter(prefix="/monthly-review", tags=["monthly-review"])
+router = APIRouter(prefix="/monthly-review", tags=["monthly-review"], route_class=FastJSONRoute)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
@@ -107,6 +115,91 @@ def _normalize_month_column(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# 월 리뷰 집계 차원 — 모든 차트·옵션은 (월구분 × 차원) 집계 한 장의 슬라이스.
+SUMMARY_DIMENSIONS = ["파트구분", "채널구분", "거래처명", "주력 채널", "품목그룹1", "품목 구분"]
+
+
+def _aggregate_sales(df: pd.DataFrame) -> pd.DataFrame:
+    """원본 행 → (월구분 × SUMMARY_DIMENSIONS) 판매액 합계(판매액)·행 수(rows).
+
+    월구분은 _normalize_month_column과 같은 4자리 YYMM. 결측 차원 값도 그룹으로 남기고
+    (dropna=False), 그룹 순서는 원본 행의 첫 등장 순서(sort=False)라 집계 위의
+    value_counts 동순위 순서가 원본 행 기준과 같다.
+    """
+    if "월구분" not in df.columns:
+        raise HTTPException(status_code=400, detail="CSV에 '월구분' 컬럼이 없습니다.")
+    if "판매액" not in df.columns:
+        raise HTTPException(status_code=400, detail="CSV에 '판매액' 컬럼이 없습니다.")
+    dims = ["월구분"] + [c for c in SUMMARY_DIMENSIONS if c in df.columns]
+    agg = (
+        df.groupby(dims, dropna=False, sort=False)["판매액"]
+        .agg(["sum", "size"])
+        .reset_index()
+        .rename(columns={"sum": "판매액", "size": "rows"})
+    )
+    agg["월구분"] = agg["월구분"].astype(str).str.replace(".0", "", regex=False).str.zfill(4)
+    return agg
+
+
+# ----- 서버 캐시 -----
+# 파일 내용 해시 기준이라 재업로드 시 자동으로 새 키 → 무효화 불필요. 메모리만 최근 N개로 제한.
+# 요청 스레드·배치 풀·업로드 후 미리 계산 워커가 함께 쓰므로 조회·삽입·비우기는 _cache_lock 안에서만 한다.
+_SUMMARY_CACHE_SIZE = 32
+_cache_lock = threading.Lock()
+_agg_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+
+def _cache_get(cache: OrderedDict, key):
+    """캐시 값(없으면 None). 히트면 최근 사용으로 옮긴다."""
+    with _cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: OrderedDict, key, value, size: int = _SUMMARY_CACHE_SIZE) -> None:
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+
+def clear_summary_cache(file_hash: Optional[str] = None) -> None:
+    """월 리뷰 집계 캐시 비우기 (캐시 클리어 엔드포인트용). file_hash를 주면 그 파일 항목만.
+    summary 자체는 결과 캐시(result_cache)에만 있다 — clear_result_cache로 함께 비운다."""
+    with _cache_lock:
+        if file_hash:
+            _agg_cache.pop(file_hash, None)
+        else:
+            _agg_cache.clear()
+
+
+def _summary_aggregate(filename: str):
+    """(파일 해시, 집계) 반환. 같은 내용이면 원본 로드·정규화·집계를 건너뛴다."""
+    if not _ensure_file_on_disk(filename):
+        raise HTTPException(status_code=404, detail=f"파일 없음: {filename}")
+    file_hash = _resolve_file_hash(filename, os.path.join(UPLOAD_DIR, filename))
+    agg = _cache_get(_agg_cache, file_hash) if file_hash else None
+    if agg is not None:
+        return file_hash, agg
+    df = _load_dataframe(filename)
+    checkpoint()
+    agg = _aggregate_sales(df)
+    if file_hash:
+        _cache_put(_agg_cache, file_hash, agg)
+    return file_hash, agg
+
+
+def _target_mtime(target_filename: Optional[str]) -> Optional[float]:
+    """목표 파일 수정 시각 — 같은 이름으로 재업로드하면 summary 캐시 키가 바뀐다."""
+    if not target_filename:
+        return None
+    path = os.path.join(TARGETS_DIR, target_filename)
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
 def _load_targets(target_filename: Optional[str]) -> Optional[pd.DataFrame]:
     """목표 파일 로드. None이면 None 반환."""
     if not target_filename:
@@ -236,28 +329,284 @@ async def upload_target_file(file: UploadFile = File(...)):
 def get_summary(
     filename: str = Query(..., description="매출 파일명"),
     month: str = Query(..., description="대상 월 (YYYY-MM)"),
-    part: str = Query("all", description="all | ecommerce | offline"),
+    part: str = Query("all", description="all | ecommerce | offline | * (전 파트 한 번에)"),
     target_file: Optional[str] = Query(None, description="목표 파일명 (선택)"),
+    format: str = Query("json", description="json | columnar | arrow | ndjson | sse (섹션별 스트리밍)"),
 ):
     """월 리뷰 종합 데이터 (chart 1, 2, 3).
 
     - chart1: 목표비 실적 — 목표 vs 실적 + 달성률
     - chart2: 전년비 트렌드 — 대상월 기준 직전 12개월 vs 같은 기간 1년 전
     - chart3: 주력 vs 쿠팡사입 — 최근 12개월
+    - part="*": 전체/이커머스/오프라인을 공유 집계 한 번으로 계산해 {"parts": {파트: summary}} 반환.
+      이 모드에서는 channel_issue가 모든 파트에 채워진다 (파트 탭 전환 시 재요청 불필요).
+
+    - format=columnar | arrow: 같은 내용을 열 방향으로 (columnar 모듈 참고).
+    - format=ndjson | sse: 섹션(SUMMARY_SECTIONS)이 계산되는 대로 {"part", "section", "data"}를 한 건씩.
+      data를 순서대로 합치면 json 응답(part="*"는 parts[part])과 같다. 끝은 {"section": "end"},
+      도중 실패(시간 예산 초과 등)는 {"section": "error", "status", "detail"}로 끝난다.
+
+    결과는 (파일 해시, 월, 파트, 목표 파일) 단위로 결과 캐시(메모리 + 디스크 스필).
     """
-    df = _load_dataframe(filename)
+    if format not in FORMATS + STREAM_FORMATS:
+        raise HTTPException(status_code=400,
+                            detail=f"잘못된 format: {format} ({' | '.join(FORMATS + STREAM_FORMATS)})")
 
-    df = _normalize_month_column(df)
-    if "판매액" not in df.columns:
-        raise HTTPException(status_code=400, detail="CSV에 '판매액' 컬럼이 없습니다.")
+    params = {"month": month, "part": part, "target_file": target_file}
+    version = _target_mtime(target_file)
+    if format in STREAM_FORMATS:
+        events = _summary_events(filename, month, part, target_file, params, version)
+        return _stream_summary(events, format, prime=len(PART_LABELS) if part == "*" else 1)
+    result = _summary_for(filename, month, part, target_file, {})
+    return shaped("monthly-review/summary", filename, params, result, format, version=version)
+
+
+STREAM_FORMATS = ("ndjson", "sse")
+_STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+_STREAM_HEADERS = {"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+
+
+def _summary_events(filename: str, month: str, part: str, target_file: Optional[str], params: dict, version):
+    """(파트, 섹션, data) 순서열. 캐시에 있으면 그 summary를 섹션으로 나누고, 없으면 계산되는 대로 낸다.
+
+    part="*"는 파트별 제너레이터를 섹션 단위로 번갈아 돌린다 — 세 파트의 chart1이 먼저 나간다.
+    끝까지 계산하면 /summary/ 결과 캐시에 넣는다.
+    """
+    cached = peek_result("monthly-review/summary", filename, params, version=version)
+    if cached is not None:
+        by_part = cached["parts"] if part == "*" else {part: cached}
+        for name, keys in SUMMARY_SECTIONS:
+            for p, summary in by_part.items():
+                yield p, name, {k: summary[k] for k in keys}
+        return
+
+    _, agg = _summary_aggregate(filename)
+    memo: dict = {}
+    parts = list(PART_LABELS) if part == "*" else [part]
+    streams = {p: _iter_summary(agg, month, p, target_file, memo, all_parts_issue=part == "*") for p in parts}
+    built: dict = {p: {} for p in parts}
+    for _ in SUMMARY_SECTIONS:
+        for p, stream in streams.items():
+            name, data = next(stream)
+            built[p].update(data)
+            yield p, name, data
+
+    result = {"month": month, "part": part, "parts": built} if part == "*" else built[part]
+    cached_result("monthly-review/summary", filename, params, lambda: result, version=version)
+
+
+def _stream_event(fmt: str, event: dict) -> bytes:
+    if fmt == "sse":
+        return b"event: " + event["section"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+    return dumps(event) + b"\n"
+
+
+def _stream_summary(events, fmt: str, prime: int = 1) -> StreamingResponse:
+    # 첫 섹션(part="*"는 파트마다 chart1 — prime개)은 미리 계산 → 파일·목표 파일·컬럼 오류는
+    # 스트리밍 시작 전에 HTTP 오류로 반환. 파트별 컬럼 검증은 그 파트의 chart1 전에 끝난다(_iter_summary).
+    first = list(itertools.islice(events, prime))
+
+    def _chunks():
+        try:
+            for p, name, data in itertools.chain(first, events):
+                yield _stream_event(fmt, {"part": p, "section": name, "data": data})
+        except HTTPException as e:
+            yield _stream_event(fmt, {"section": "error", "status": e.status_code, "detail": e.detail})
+            return
+        except Exception as e:
+            logging.exception("월 리뷰 스트리밍 실패")
+            yield _stream_event(fmt, {"section": "error", "status": 500, "detail": f"summary 생성 실패: {e}"})
+            return
+        yield _stream_event(fmt, {"section": "end"})
+
+    # 도중 오류로 끝난 스트림이 ETag로 재검증돼 재사용되지 않도록 no-store (http_cache가 그대로 둔다)
+    return StreamingResponse(_chunks(), media_type=_STREAM_MEDIA_TYPES[fmt], headers=_STREAM_HEADERS)
+
+
+_BATCH_MAX_MONTHS = 36
+
+
+def _month_range(start_month: str, end_month: str) -> list:
+    """'2025-10' ~ '2026-03' → ['2025-10', ..., '2026-03'] (양끝 포함)."""
+    _month_to_yymm(start_month), _month_to_yymm(end_month)  # 포맷 검증
+    y, m = int(start_month[:4]), int(start_month[5:7])
+    ey, em = int(end_month[:4]), int(end_month[5:7])
+    if (y, m) > (ey, em):
+        raise HTTPException(status_code=400, detail=f"시작 월이 끝 월보다 늦습니다: {start_month} > {end_month}")
+    out = []
+    while (y, m) <= (ey, em):
+        out.append(f"{y}-{str(m).zfill(2)}")
+        m += 1
+        if m == 13:
+            m, y = 1, y + 1
+    return out
+
+
+@router.get("/summary/batch/")
+def get_summary_batch(
+    filename: str = Query(..., description="매출 파일명"),
+    start_month: str = Query(..., description="시작 월 (YYYY-MM)"),
+    end_month: str = Query(..., description="끝 월 (YYYY-MM, 포함)"),
+    parts: str = Query("all,ecommerce,offline", description="쉼표 구분: all | ecommerce | offline | *"),
+    target_file: Optional[str] = Query(None, description="목표 파일명 (선택)"),
+    format: str = Query("json", description="json | ndjson (월·파트별 한 줄씩 스트리밍)"),
+):
+    """여러 월 × 파트 summary 일괄 생성 (분기·연간 PPT 리뷰 준비용).
+
+    각 항목은 /summary/(month, part) 응답과 동일. 집계·파트 필터·전 기간 pivot·row 수 순위를
+    한 번만 만들고 월별로는 12/13개월 창만 슬라이스 → 월×파트 개별 호출 대비 한 번의 패스.
+    결과는 /summary/와 같은 키로 결과 캐시에 채워진다(이미 있는 월·파트는 계산하지 않는다).
+    - format=json: {"months", "parts", "summaries": {월: {파트: summary}}}
+    - format=ndjson: {"month", "part", "summary"} 한 줄씩 (계산되는 대로 스트리밍).
+      도중 실패(컬럼 오류·시간 예산 초과 등)는 {"section": "error", "status", "detail"} 한 줄로 끝난다.
+    """
+    part_list = [p.strip() for p in parts.split(",") if p.strip()]
+    invalid = [p for p in part_list if p != "*" and p not in PART_LABELS]
+    if not part_list or invalid:
+        raise HTTPException(status_code=400, detail=f"잘못된 파트: {', '.join(invalid) or parts}")
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail=f"잘못된 format: {format} (json | ndjson)")
+    months = _month_range(start_month, end_month)
+    if len(months) > _BATCH_MAX_MONTHS:
+        raise HTTPException(status_code=400, detail=f"최대 {_BATCH_MAX_MONTHS}개월까지 요청할 수 있습니다.")
+
+    memo: dict = {}
+    items = (
+        (month, part, _summary_for(filename, month, part, target_file, memo))
+        for month in months for part in part_list
+    )
+
+    if format == "ndjson":
+        # 첫 항목은 미리 계산 → 목표 파일·컬럼 오류는 스트리밍 시작 전에 HTTP 오류로 반환
+        first = next(items)
+
+        def _lines():
+            try:
+                for month, part, summary in itertools.chain([first], items):
+                    yield dumps({"month": month, "part": part, "summary": summary}) + b"\n"
+            except HTTPException as e:
+                yield dumps({"section": "error", "status": e.status_code, "detail": e.detail}) + b"\n"
+            except Exception as e:
+                logging.exception("월 리뷰 일괄 스트리밍 실패")
+                yield dumps({"section": "error", "status": 500, "detail": f"summary 생성 실패: {e}"}) + b"\n"
+
+        # 도중에 끊긴 스트림이 ETag로 재검증돼 재사용되지 않도록 no-store (_stream_summary와 같은 이유)
+        return StreamingResponse(_lines(), media_type="application/x-ndjson", headers=_STREAM_HEADERS)
+
+    summaries: dict = {}
+    for month, part, summary in items:
+        summaries.setdefault(month, {})[part] = summary
+    return {"months": months, "parts": part_list, "summaries": summaries}
 
-    df_part = _apply_part_filter(df, part)
+
+def _summary_for(filename: str, month: str, part: str, target_file: Optional[str], memo: dict) -> dict:
+    """(월, 파트) summary — /summary/와 같은 키로 결과 캐시를 거친다.
+
+    memo는 월과 무관한 집계 조각(집계, 파트 필터, 전 기간 pivot, row 수)을 월·파트 간 공유한다.
+    집계는 미스가 처음 날 때 읽는다 — 모두 캐시에 있으면 파일을 읽지 않는다.
+    """
+    def _build():
+        if ("agg",) not in memo:
+            memo[("agg",)] = _summary_aggregate(filename)[1]
+        agg = memo[("agg",)]
+        if part == "*":
+            return {
+                "month": month,
+                "part": part,
+                "parts": {p: _build_summary(agg, month, p, target_file, memo, all_parts_issue=True)
+                          for p in PART_LABELS},
+            }
+        return _build_summary(agg, month, part, target_file, memo)
+
+    params = {"month": month, "part": part, "target_file": target_file}
+    return cached_result("monthly-review/summary", filename, params, _build, version=_target_mtime(target_file))
+
+
+def _build_summary(
+    agg: pd.DataFrame,
+    month: str,
+    part: str,
+    target_file: Optional[str],
+    memo: Optional[dict] = None,
+    all_parts_issue: bool = False,
+) -> dict:
+    """집계(agg) → 단일 파트 summary.
+
+    memo: 월과 무관한 조각(파트 필터, 전 기간 pivot, row 수 순위)과 월별 공유 조각
+    (channel_options, 전 파트 channel_issue) 메모. 여러 월·파트를 한 번에 만들 때 공유.
+    all_parts_issue: True면 channel_issue를 전 파트 채움 (part="*"), 아니면 요청 파트만.
+    """
+    summary: dict = {}
+    for _, data in _iter_summary(agg, month, part, target_file, memo, all_parts_issue):
+        summary.update(data)
+    return summary
+
+
+# 스트리밍 섹션 순서 = 화면 위에서부터(종합 → 브랜드 → 채널 옵션 → 채널 이슈). 섹션을 순서대로 합치면
+# /summary/ 응답과 키 순서까지 같다.
+SUMMARY_SECTIONS = (
+    ("chart1", ("month", "part", "chart1")),
+    ("chart2", ("chart2",)),
+    ("chart3", ("chart3",)),
+    ("chart4", ("chart4",)),
+    ("chart5", ("chart5",)),
+    ("chart6", ("chart6",)),
+    ("brand_detail", ("brand_targets", "chart10", "chart12", "chart14", "brand_products", "brand_products_months")),
+    ("channel_options", ("channel_options", "channel_defaults", "channel_months", "channel_months13")),
+    ("channel_issue", ("channel_issue", "channel_issue_months")),
+    ("brand_focus", ("brand_focus",)),
+)
+
+
+def _iter_summary(
+    agg: pd.DataFrame,
+    month: str,
+    part: str,
+    target_file: Optional[str],
+    memo: Optional[dict] = None,
+    all_parts_issue: bool = False,
+):
+    """_build_summary를 섹션 단위로 — (섹션 이름, {summary 키: 값}) 을 SUMMARY_SECTIONS 순서로 계산되는 대로 낸다.
+
+    필수 컬럼 검증은 첫 섹션(chart1)을 내기 전에 끝난다 — 스트리밍 도중 400이 나지 않도록.
+    """
+    memo = {} if memo is None else memo
+    checkpoint()
+
+    def _memo(key, build):
+        if key not in memo:
+            memo[key] = build()
+        return memo[key]
+
+    def _scope(p: str) -> pd.DataFrame:
+        return _memo(("scope", p), lambda: _apply_part_filter(agg, p))
+
+    agg_part = _scope(part)
     target_yymm = _month_to_yymm(month)
 
+    # ----- 공통 헬퍼 -----
+    def _month_sums(frame: pd.DataFrame) -> pd.Series:
+        """집계 frame → 월구분별 판매액 합계 Series"""
+        return frame.groupby("월구분")["판매액"].sum()
+
+    def _rows_by(frame: pd.DataFrame, col: str) -> dict:
+        """col 값별 월구분 판매액 합계 — pivot 1회 후 {값: 월별 Series}"""
+        pivot = frame.groupby([col, "월구분"])["판매액"].sum().unstack("월구분")
+        return {key: row.dropna() for key, row in pivot.iterrows()}
+
+    def _pivot_rows(p: str, col: str) -> dict:
+        """파트 p의 _rows_by (전 기간, 메모)"""
+        return _memo(("rows", p, col), lambda: _rows_by(_scope(p), col))
+
+    def _month_total(year: int, month_num: int, sums: pd.Series) -> float:
+        yymm = f"{str(year)[-2:]}{str(month_num).zfill(2)}"
+        return float(sums.get(yymm, 0.0))
+
     # ----- chart1: 목표비 실적 -----
-    actual = float(df_part[df_part["월구분"] == target_yymm]["판매액"].sum())
+    part_sums = _memo(("sums", part), lambda: _month_sums(agg_part))
+    actual = float(part_sums.get(target_yymm, 0.0))
     target_value = None
-    targets_df = _load_targets(target_file)
+    targets_df = _memo(("targets", target_file), lambda: _load_targets(target_file))
     if targets_df is not None:
         key = PART_TO_TARGET_KEY[part]
         match = targets_df[(targets_df["월"] == month) & (targets_df["파트"] == key)]
@@ -274,10 +623,14 @@ def get_summary(
         "achievement_rate": achievement_rate,
     }
 
-    # ----- 공통 헬퍼 -----
-    def _month_total(year: int, month_num: int, frame: pd.DataFrame) -> float:
-        yymm = f"{str(year)[-2:]}{str(month_num).zfill(2)}"
-        return float(frame[frame["월구분"] == yymm]["판매액"].sum())
+    if part == "offline" and "거래처명" not in agg.columns:
+        raise HTTPException(status_code=400, detail="CSV에 '거래처명' 컬럼(R열)이 없습니다.")
+    if part == "ecommerce" and "주력 채널" not in agg.columns:
+        raise HTTPException(status_code=400, detail="CSV에 '주력 채널' 컬럼이 없습니다.")
+    for col in ("품목그룹1", "채널구분", "품목 구분"):
+        if col not in agg.columns:
+            raise HTTPException(status_code=400, detail=f"CSV에 '{col}' 컬럼이 없습니다.")
+    yield "chart1", {"month": month, "part": part, "chart1": chart1}
 
     # 대상 월부터 역순 n개월 생성 (오래된→최근 순서로 반환)
     def _months_back(yyyymm: str, n: int):
@@ -294,56 +647,51 @@ def get_summary(
     last12 = _months_back(month, 12)
     # 브랜드 트렌드(chart4)는 전년 동월 비교(전년비)를 위해 13개월: 대상월-12 ~ 대상월
     last13 = _months_back(month, 13)
+    last12_yymm = [f"{str(y)[-2:]}{str(m).zfill(2)}" for y, m in last12]
+    last12_labels = [f"{y}-{str(m).zfill(2)}" for y, m in last12]
+    last13_yymm = [f"{str(y)[-2:]}{str(m).zfill(2)}" for y, m in last13]
+    last13_labels = [f"{y}-{str(m).zfill(2)}" for y, m in last13]
+    empty_sums = pd.Series(dtype=float)
 
     # ----- chart2: 전년비 트렌드 — 직전 12개월 vs 같은 기간 1년 전 -----
     chart2 = []
     for y, m in last12:
         chart2.append({
             "month": f"{y}-{str(m).zfill(2)}",
-            "current_year": _month_total(y, m, df_part),
-            "prev_year": _month_total(y - 1, m, df_part),
+            "current_year": _month_total(y, m, part_sums),
+            "prev_year": _month_total(y - 1, m, part_sums),
         })
+    yield "chart2", {"chart2": chart2}
 
     # ----- chart3: 파트별 동적 비교 — 최근 12개월 -----
     # part=all      → 이커머스 vs 오프라인 (파트구분 기반)
     # part=ecommerce → 주력채널 vs 쿠팡(사입) (주력채널 컬럼 기반)
     # part=offline  → 이마트 vs 롯데마트 vs 다이소 (거래처명 R열 기준)
     if part == "all":
-        series_frames = [
-            df[df["파트구분"] == "이커머스"],
-            df[df["파트구분"] == "오프라인"],
-        ]
+        series_rows = _pivot_rows("all", "파트구분")
+        series_keys = ["이커머스", "오프라인"]
         title = "이커머스 vs 오프라인"
         series_names = ["이커머스", "오프라인"]
         colors = ["#000000", "#5d5d5d"]
     elif part == "offline":
-        if "거래처명" not in df.columns:
-            raise HTTPException(status_code=400, detail="CSV에 '거래처명' 컬럼(R열)이 없습니다.")
-        series_frames = [
-            df_part[df_part["거래처명"] == "이마트"],
-            df_part[df_part["거래처명"] == "롯데마트"],
-            df_part[df_part["거래처명"] == "다이소"],
-        ]
+        series_rows = _pivot_rows(part, "거래처명")
+        series_keys = ["이마트", "롯데마트", "다이소"]
         title = "EM vs LM vs 다이소"
         series_names = ["이마트", "롯데마트", "다이소"]
         colors = ["#000000", "#5d5d5d", "#7d7d7d"]
     else:  # ecommerce
-        if "주력 채널" not in df.columns:
-            raise HTTPException(status_code=400, detail="CSV에 '주력 채널' 컬럼이 없습니다.")
-        series_frames = [
-            df_part[df_part["주력 채널"] == "주력"],
-            df_part[df_part["주력 채널"] == "주력(쿠팡)"],
-        ]
+        series_rows = _pivot_rows(part, "주력 채널")
+        series_keys = ["주력", "주력(쿠팡)"]
         title = "주력채널 vs 쿠팡(사입)"
         series_names = ["주력채널", "쿠팡(사입)"]
         colors = ["#000000", "#ff0066"]
+    series_sums = [series_rows.get(k, empty_sums) for k in series_keys]
 
     chart3_data = []
     for y, m in last12:
-        yymm = f"{str(y)[-2:]}{str(m).zfill(2)}"
         chart3_data.append({
             "month": f"{y}-{str(m).zfill(2)}",
-            "values": [float(f[f["월구분"] == yymm]["판매액"].sum()) for f in series_frames],
+            "values": [_month_total(y, m, s) for s in series_sums],
         })
 
     chart3 = {
@@ -352,42 +700,38 @@ def get_summary(
         "colors": colors,
         "data": chart3_data,
     }
+    yield "chart3", {"chart3": chart3}
 
     # ----- 공통 헬퍼: 카테고리별 trailing 12개월 집계 -----
-    def _trailing_series(category_frames: list, name: str, periods: list = None) -> dict:
-        """N개 카테고리 frame 리스트 → trailing line chart 데이터 (기본 12개월, periods로 조정)"""
+    def _trailing_series(category_sums: list, name: str, periods: list = None) -> dict:
+        """N개 카테고리 월별 합계 리스트 → trailing line chart 데이터 (기본 12개월, periods로 조정)"""
         months_iter = periods if periods is not None else last12
         return {
             "title": name,
             "data": [
                 {
                     "month": f"{y}-{str(m).zfill(2)}",
-                    "values": [
-                        float(f[f["월구분"] == f"{str(y)[-2:]}{str(m).zfill(2)}"]["판매액"].sum())
-                        for f in category_frames
-                    ],
+                    "values": [_month_total(y, m, s) for s in category_sums],
                 }
                 for y, m in months_iter
             ],
         }
 
-    def _share_pie(category_frames: list, series_names_local: list) -> list:
-        """N개 카테고리 frame → 최근 12개월 합계로 PieChart 데이터 [{name, value}]"""
-        last12_yymm = {f"{str(y)[-2:]}{str(m).zfill(2)}" for y, m in last12}
+    def _share_pie(category_sums: list, series_names_local: list) -> list:
+        """N개 카테고리 → 최근 12개월 합계로 PieChart 데이터 [{name, value}]"""
         out = []
-        for name, f in zip(series_names_local, category_frames):
-            v = float(f[f["월구분"].isin(last12_yymm)]["판매액"].sum())
+        for name, s in zip(series_names_local, category_sums):
+            v = float(s[s.index.isin(last12_yymm)].sum())
             out.append({"name": name, "value": v})
         return out
 
-    def _grouped_bar(category_frames: list, series_names_local: list, current_yymm: str) -> list:
+    def _grouped_bar(category_sums: list, series_names_local: list, current_yymm: str) -> list:
         """N개 카테고리 × (월평균/당월) BarChart 데이터 [{category, monthly_avg, current_month}]"""
-        last12_yymm_list = [f"{str(y)[-2:]}{str(m).zfill(2)}" for y, m in last12]
         out = []
-        for name, f in zip(series_names_local, category_frames):
-            total_12 = float(f[f["월구분"].isin(last12_yymm_list)]["판매액"].sum())
-            monthly_avg = total_12 / 12 if last12_yymm_list else 0
-            current = float(f[f["월구분"] == current_yymm]["판매액"].sum())
+        for name, s in zip(series_names_local, category_sums):
+            total_12 = float(s[s.index.isin(last12_yymm)].sum())
+            monthly_avg = total_12 / 12 if last12_yymm else 0
+            current = float(s.get(current_yymm, 0.0))
             out.append({
                 "category": name,
                 "monthly_avg": monthly_avg,
@@ -399,20 +743,24 @@ def get_summary(
     # D열(품목그룹1) 실제 고유값을 개별 브랜드로 노출 (판매액 desc 정렬).
     # 단, 비-브랜드 값(BRAND_ETC)과 빈값은 "기타" 한 칸으로 묶음.
     # 프론트 수정 모달에서 전체 브랜드를 선택할 수 있고, 기본은 상위 3개만 표시(프론트 처리).
-    if "품목그룹1" not in df.columns:
-        raise HTTPException(status_code=400, detail="CSV에 '품목그룹1' 컬럼이 없습니다.")
     BRAND_ETC = ["기타(타사)", "부자재(공통)", "구브랜드"]
-    _g1 = df_part["품목그룹1"]
-    _is_etc = _g1.isna() | _g1.isin(BRAND_ETC) | (_g1.astype(str).str.strip() == "")
-    brand_individual = (
-        df_part[~_is_etc]
-        .groupby("품목그룹1")["판매액"]
-        .sum()
-        .sort_values(ascending=False)
-        .index.tolist()
-    )
-    brand_frames = [df_part[df_part["품목그룹1"] == b] for b in brand_individual]
-    brand_frames.append(df_part[_is_etc])  # 기타: BRAND_ETC + 빈값
+
+    def _brand_split():
+        _g1 = agg_part["품목그룹1"]
+        _is_etc = _g1.isna() | _g1.isin(BRAND_ETC) | (_g1.astype(str).str.strip() == "")
+        individual = (
+            agg_part[~_is_etc]
+            .groupby("품목그룹1")["판매액"]
+            .sum()
+            .sort_values(ascending=False)
+            .index.tolist()
+        )
+        return individual, _month_sums(agg_part[_is_etc])
+
+    brand_individual, etc_sums = _memo(("brand_split", part), _brand_split)
+    brand_rows = _pivot_rows(part, "품목그룹1")
+    brand_sums = [brand_rows[b] for b in brand_individual]
+    brand_sums.append(etc_sums)  # 기타: BRAND_ETC + 빈값
     brand_names = brand_individual + ["기타"]
     # colors는 프론트가 getMultiSeriesStyle 팔레트로 대체 → 길이 맞춰 placeholder만 전달
     brand_colors = ["#000000"] * len(brand_names)
@@ -422,97 +770,47 @@ def get_summary(
         "title": "브랜드별 매출 트렌드",
         "series_names": brand_names,
         "colors": brand_colors,
-        "data": _trailing_series(brand_frames, "", periods=last13)["data"],
+        "data": _trailing_series(brand_sums, "", periods=last13)["data"],
     }
+    yield "chart4", {"chart4": chart4}
 
     # chart5: 브랜드별 매출 비중 (파이, 최근 12개월 합계)
     chart5 = {
         "title": "브랜드별 매출 비중",
         "series_names": brand_names,
         "colors": brand_colors,
-        "data": _share_pie(brand_frames, brand_names),
+        "data": _share_pie(brand_sums, brand_names),
     }
+    yield "chart5", {"chart5": chart5}
 
     # chart6: 월 평균 대비 실적 (그룹드 바, 마+누+쏭 추가 카테고리)
     # 카테고리: 마이비/누비/쏭레브/마+누+쏭
-    brand_sum_frame = pd.concat([df_part[df_part["품목그룹1"] == b] for b in ["마이비", "누비", "쏭레브"]])
+    brand_sum_sums = _memo(
+        ("sums", part, "마+누+쏭"),
+        lambda: _month_sums(agg_part[agg_part["품목그룹1"].isin(["마이비", "누비", "쏭레브"])]),
+    )
     bar_cats = ["마이비", "누비", "쏭레브", "마+누+쏭"]
-    bar_frames = [df_part[df_part["품목그룹1"] == b] for b in ["마이비", "누비", "쏭레브"]] + [brand_sum_frame]
+    bar_sums = [brand_rows.get(b, empty_sums) for b in ["마이비", "누비", "쏭레브"]] + [brand_sum_sums]
     chart6 = {
         "title": "월 평균 대비 실적",
         "series_names": ["월평균", "당월"],
         "colors": ["#5d5d5d", "#000000"],
-        "data": _grouped_bar(bar_frames, bar_cats, target_yymm),
+        "data": _grouped_bar(bar_sums, bar_cats, target_yymm),
     }
+    yield "chart6", {"chart6": chart6}
 
-    # ----- 채널 옵션 (part별 동적) -----
-    # all      → P열(채널구분) unique values 직접
-    # ecommerce → 4 그룹 카테고리 (사입/위탁/자사몰/기타) — 기존 유지
-    # offline   → P열(채널구분) unique values 직접 (오프라인 파트 row만)
-    if "채널구분" not in df.columns:
-        raise HTTPException(status_code=400, detail="CSV에 '채널구분' 컬럼이 없습니다.")
-
-    last12_yymm_set = [f"{str(y)[-2:]}{str(m).zfill(2)}" for y, m in last12]
-    last13_yymm_set = [f"{str(y)[-2:]}{str(m).zfill(2)}" for y, m in last13]
-
-    def _option_from_frame(name: str, f: pd.DataFrame) -> dict:
-        """단일 옵션 = name + row_count + 12개월 values(비중·월평균용) + 13개월 values13(트렌드·요약 전년비용) + monthly_avg + current_month"""
-        # 월별 집계 1회 후 12·13개월 슬라이스 (전년 동월 포함 13개월은 트렌드·전년비 전용)
-        month_sum = f.groupby("월구분")["판매액"].sum()
-        values = [float(month_sum.get(yymm, 0.0)) for yymm in last12_yymm_set]
-        values13 = [float(month_sum.get(yymm, 0.0)) for yymm in last13_yymm_set]
-        total_12 = sum(values)
-        return {
-            "name": name,
-            "row_count": int(len(f)),
-            "values": values,
-            "values13": values13,
-            "monthly_avg": total_12 / 12 if values else 0.0,
-            "current_month": float(f[f["월구분"] == target_yymm]["판매액"].sum()),
-        }
-
-    # all: P열 unique values 전부 (전체 df 기준)
-    all_options = []
-    for chan in sorted(df["채널구분"].dropna().unique().tolist()):
-        f = df[df["채널구분"] == chan]
-        all_options.append(_option_from_frame(str(chan), f))
-
-    # ecommerce: P열 unique values (이커머스 파트 row만) — all/offline과 동일 패턴
-    ec_df = df[df["파트구분"] == "이커머스"]
-    ec_options = []
-    for chan in sorted(ec_df["채널구분"].dropna().unique().tolist()):
-        f = ec_df[ec_df["채널구분"] == chan]
-        ec_options.append(_option_from_frame(str(chan), f))
-
-    # offline: P열 unique values (오프라인 파트 row만)
-    off_df = df[df["파트구분"] == "오프라인"]
-    off_options = []
-    for chan in sorted(off_df["채널구분"].dropna().unique().tolist()):
-        f = off_df[off_df["채널구분"] == chan]
-        off_options.append(_option_from_frame(str(chan), f))
-
-    channel_options = {
-        "all": all_options,
-        "ecommerce": ec_options,
-        "offline": off_options,
-    }
-    channel_defaults = {
-        "all": ["오픈마켓(사입)", "오픈마켓(위탁)", "자사몰", "할인점"],
-        "ecommerce": ["오픈마켓(사입)", "오픈마켓(위탁)", "종합몰", "버티컬커머스", "자사몰"],
-        "offline": ["할인점", "다이소", "오프라인 대리점"],
-    }
+    # 브랜드 종합 요약 라인용 — 대상 월의 브랜드별 목표(전사 기준).
+    # 전사(전 파트) 목표라 part=all에서만 의미 → 그 외 파트는 빈 dict(목표비 "-").
+    brand_targets = _memo(("brand_targets",), _load_brand_targets).get(month, {}) if part == "all" else {}
 
     # ----- 브랜드 상세 (chart 10~15) -----
     # 각 브랜드: 종합 트렌드 (단일 라인) + 주요 상품 라인 (다중 라인)
     # 품목 구분 컬럼 기준 (R열 규약은 거래처 식별 전용)
-    if "품목 구분" not in df.columns:
-        raise HTTPException(status_code=400, detail="CSV에 '품목 구분' 컬럼이 없습니다.")
-
-    MONO_PALETTE = ["#000000", "#5d5d5d", "#7d7d7d", "#9d9d9d", "#b8b8b8"]
+    checkpoint()
 
     def _brand_total_chart(brand_name: str) -> dict:
         # 브랜드 상세 섹션은 전년비(전년 동월 대비)를 위해 13개월: 대상월-12 ~ 대상월
-        f = df_part[df_part["품목그룹1"] == brand_name]
+        s = brand_rows.get(brand_name, empty_sums)
         return {
             "title": f"{brand_name} 종합 트렌드",
             "series_names": [brand_name],
@@ -520,31 +818,12 @@ def get_summary(
             "data": [
                 {
                     "month": f"{y}-{str(m).zfill(2)}",
-                    "values": [float(f[f["월구분"] == f"{str(y)[-2:]}{str(m).zfill(2)}"]["판매액"].sum())],
+                    "values": [_month_total(y, m, s)],
                 }
                 for y, m in last13
             ],
         }
 
-    def _brand_products_chart(brand_name: str, product_lines: list) -> dict:
-        b = df_part[df_part["품목그룹1"] == brand_name]
-        frames = [b[b["품목 구분"] == p] for p in product_lines]
-        return {
-            "title": f"{brand_name} 주요 상품 라인",
-            "series_names": product_lines,
-            "colors": MONO_PALETTE[: len(product_lines)],
-            "data": [
-                {
-                    "month": f"{y}-{str(m).zfill(2)}",
-                    "values": [
-                        float(f[f["월구분"] == f"{str(y)[-2:]}{str(m).zfill(2)}"]["판매액"].sum())
-                        for f in frames
-                    ],
-                }
-                for y, m in last12
-            ],
-        }
-
     chart10 = _brand_total_chart("마이비")
     chart12 = _brand_total_chart("누비")
     chart14 = _brand_total_chart("쏭레브")
@@ -552,22 +831,27 @@ def get_summary(
     # ----- brand_products: 각 브랜드별 S열(품목 구분) 모든 옵션 + 13개월 데이터 -----
     # 프론트엔드가 localStorage selection 기반으로 주요 상품 라인·개별 상품 차트 동적 렌더
     # 브랜드 상세 섹션은 전년비를 위해 13개월(대상월-12~대상월)로 통일 → 채널 이슈(12개월)와 별도.
-    last12_yymm = [f"{str(y)[-2:]}{str(m).zfill(2)}" for y, m in last12]
-    last12_labels = [f"{y}-{str(m).zfill(2)}" for y, m in last12]
-    last13_yymm = [f"{str(y)[-2:]}{str(m).zfill(2)}" for y, m in last13]
-    last13_labels = [f"{y}-{str(m).zfill(2)}" for y, m in last13]
+    def _row_counts(frame: pd.DataFrame, col: str) -> pd.Series:
+        """col 값별 원본 row 수, 내림차순 — value_counts와 동일 순서 (agg가 첫 등장 순서라 동순위도 동일)"""
+        return frame.groupby(col, sort=False)["rows"].sum().sort_values(ascending=False)
+
+    def _brand_frame(brand: str) -> pd.DataFrame:
+        return _memo(("brand", part, brand), lambda: agg_part[agg_part["품목그룹1"] == brand])
 
     brand_products = {}
     for brand in ["마이비", "누비", "쏭레브"]:
-        bdf = df_part[df_part["품목그룹1"] == brand]
+        bdf = _brand_frame(brand)
         # 품목 구분 unique values + row count
-        counts = bdf["품목 구분"].value_counts()
+        counts, product_rows = _memo(
+            ("products", part, brand),
+            lambda: (_row_counts(bdf, "품목 구분"), _rows_by(bdf, "품목 구분")),
+        )
         items = []
         for product, count in counts.items():
             if pd.isna(product) or str(product).strip() == "" or str(product) == "대상 X":
                 continue
-            pdf = bdf[bdf["품목 구분"] == product]
-            values = [float(pdf[pdf["월구분"] == yymm]["판매액"].sum()) for yymm in last13_yymm]
+            s = product_rows.get(product, empty_sums)
+            values = [float(s.get(yymm, 0.0)) for yymm in last13_yymm]
             items.append({
                 "name": str(product),
                 "row_count": int(count),
@@ -575,106 +859,167 @@ def get_summary(
             })
         brand_products[brand] = items
 
-    # ----- channel_issue: 주요 채널 이슈 섹션용 (P열 × R열·D열 12개월 pivot) -----
-    # 프론트가 사용자 정의 그룹(P열 매핑)으로 vendor·brand 데이터를 동적 집계
-    def _series_by(cdf: pd.DataFrame, key_col: str) -> list:
-        """key_col unique × 12개월 매출 — groupby 1회로 집계 (per-item 불리언 스캔 회피)."""
-        if key_col not in cdf.columns:
-            return []
-        sub = cdf[[key_col, "월구분", "판매액"]].dropna(subset=[key_col])
-        if sub.empty:
-            return []
-        counts = sub[key_col].value_counts()  # row 수 내림차순 (NaN 제외)
-        pivot = (
-            sub.groupby([key_col, "월구분"])["판매액"].sum()
-            .unstack("월구분")
-            .reindex(columns=last12_yymm)
-            .fillna(0.0)
-        )
+    yield "brand_detail", {
+        "brand_targets": brand_targets,
+        "chart10": chart10,
+        "chart12": chart12,
+        "chart14": chart14,
+        "brand_products": brand_products,
+        "brand_products_months": last13_labels,
+    }
+
+    # ----- 채널 옵션 (part별 동적) -----
+    # all      → P열(채널구분) unique values 직접
+    # ecommerce → 4 그룹 카테고리 (사입/위탁/자사몰/기타) — 기존 유지
+    # offline   → P열(채널구분) unique values 직접 (오프라인 파트 row만)
+    def _channels(p: str) -> list:
+        """파트 p의 P열 unique values (정렬, 메모)"""
+        return _memo(("channels", p), lambda: sorted(_scope(p)["채널구분"].dropna().unique().tolist()))
+
+    def _channel_row_counts(p: str) -> pd.Series:
+        return _memo(("channel_rows", p), lambda: _scope(p).groupby("채널구분")["rows"].sum())
+
+    def _channel_options(p: str) -> list:
+        """파트 p의 P열 unique values 각각 = name + row_count + 12개월 values(비중·월평균용)
+        + 13개월 values13(트렌드·요약 전년비용) + monthly_avg + current_month"""
+        rows = _pivot_rows(p, "채널구분")
+        row_counts = _channel_row_counts(p)
         out = []
-        for name in counts.index:
-            if str(name).strip() == "":  # 빈 이름은 유니크 값 단위로만 필터 (저비용)
-                continue
-            vals = pivot.loc[name]
+        for chan in _channels(p):
+            month_sum = rows.get(chan, empty_sums)
+            values = [float(month_sum.get(yymm, 0.0)) for yymm in last12_yymm]
+            values13 = [float(month_sum.get(yymm, 0.0)) for yymm in last13_yymm]
+            total_12 = sum(values)
             out.append({
-                "name": str(name),
-                "row_count": int(counts[name]),
-                "values": [float(vals[y]) for y in last12_yymm],
+                "name": str(chan),
+                "row_count": int(row_counts[chan]),
+                "values": values,
+                "values13": values13,
+                "monthly_avg": total_12 / 12 if values else 0.0,
+                "current_month": float(month_sum.get(target_yymm, 0.0)),
             })
         return out
 
-    def _series_by_pair(cdf: pd.DataFrame, key_col: str, group_col: str) -> list:
-        """(group_col, key_col) 조합별 12개월 매출 — 같은 key라도 group이 다르면 별도 엔트리.
+    # all: 전체 / ecommerce·offline: 해당 파트 row만 — 동일 패턴. 파트와 무관해 월 단위로 공유.
+    channel_options = _memo(("channel_options", month), lambda: {p: _channel_options(p) for p in PART_LABELS})
+    channel_defaults = {
+        "all": ["오픈마켓(사입)", "오픈마켓(위탁)", "자사몰", "할인점"],
+        "ecommerce": ["오픈마켓(사입)", "오픈마켓(위탁)", "종합몰", "버티컬커머스", "자사몰"],
+        "offline": ["할인점", "다이소", "오프라인 대리점"],
+    }
+    yield "channel_options", {
+        "channel_options": channel_options,
+        "channel_defaults": channel_defaults,
+        "channel_months": last12_labels,
+        "channel_months13": last13_labels,
+    }
+
+    # ----- channel_issue: 주요 채널 이슈 섹션용 (P열 × R열·D열 12개월 pivot) -----
+    # 프론트가 사용자 정의 그룹(P열 매핑)으로 vendor·brand 데이터를 동적 집계
+    checkpoint()
+    def _issue_index(p: str, key_col: str, group_col: Optional[str] = None):
+        """채널(P열)별 엔트리 [(name, brand, row_count, pivot 행 위치)] + 전 기간 월 pivot.
+
+        월과 무관해 메모 → 월별로는 pivot 열만 12개월로 슬라이스. 컬럼이 없거나 비면 None.
+        group_col 없음: key_col 단위, 채널 안에서 row 수 내림차순 (첫 등장 순서 = value_counts 순서).
+        group_col 있음: (group_col, key_col) 조합 단위 — 같은 key라도 group이 다르면 별도 엔트리.
         상품(S열)을 브랜드(D열)별로 분해해 내려보냄: 이름이 같아도 브랜드가 다르면 다른 매출
-        (예: 데일리케어 물티슈 vs 라포레띠 물티슈). 프론트가 선택된 브랜드로 동적 스코프."""
-        if key_col not in cdf.columns or group_col not in cdf.columns:
-            return []
-        sub = cdf[[group_col, key_col, "월구분", "판매액"]].dropna(subset=[key_col]).copy()
+        (예: 데일리케어 물티슈 vs 라포레띠 물티슈). 프론트가 선택된 브랜드로 동적 스코프.
+        """
+        scope = _scope(p)
+        if key_col not in scope.columns or (group_col and group_col not in scope.columns):
+            return None
+        sub = scope.dropna(subset=[key_col])
         if sub.empty:
-            return []
-        sub[group_col] = sub[group_col].fillna("(미분류)")
-        counts = sub.groupby([group_col, key_col]).size()  # (group,key)별 row 수
-        pivot = (
-            sub.groupby([group_col, key_col, "월구분"])["판매액"].sum()
-            .unstack("월구분")
-            .reindex(columns=last12_yymm)
-            .fillna(0.0)
-        )
-        out = []
-        for (grp, name) in counts.index:
-            if str(name).strip() == "":
-                continue
-            vals = pivot.loc[(grp, name)]
-            out.append({
-                "name": str(name),
-                "brand": str(grp),
-                "row_count": int(counts[(grp, name)]),
-                "values": [float(vals[y]) for y in last12_yymm],
-            })
+            return None
+        entries: dict = {}
+        if group_col:
+            sub = sub.copy()
+            sub[group_col] = sub[group_col].fillna("(미분류)")
+            keys = ["채널구분", group_col, key_col]
+            counts = sub.groupby(keys)["rows"].sum()  # (채널,group,key)별 row 수
+            for (chan, grp, name), count in counts.items():
+                if str(name).strip() == "":
+                    continue
+                entries.setdefault(chan, []).append((str(name), str(grp), int(count), (chan, grp, name)))
+        else:
+            keys = ["채널구분", key_col]
+            counts = sub.groupby(keys, sort=False)["rows"].sum()  # (채널, key)별 row 수 (NaN 제외)
+            for chan, chan_counts in counts.groupby(level=0, sort=False):
+                items = entries.setdefault(chan, [])
+                for name, count in chan_counts.droplevel(0).sort_values(ascending=False).items():
+                    if str(name).strip() == "":  # 빈 이름은 유니크 값 단위로만 필터 (저비용)
+                        continue
+                    items.append((str(name), None, int(count), (chan, name)))
+        pivot = sub.groupby(keys + ["월구분"])["판매액"].sum().unstack("월구분")
+        positions = {key: i for i, key in enumerate(pivot.index)}
+        for items in entries.values():
+            items[:] = [(name, grp, count, positions[key]) for name, grp, count, key in items]
+        return entries, pivot
+
+    def _issue_series(index) -> dict:
+        """_issue_index → {채널: [{name, (brand), row_count, values(12개월)}]}"""
+        if index is None:
+            return {}
+        entries, pivot = index
+        values = pivot.reindex(columns=last12_yymm).fillna(0.0).to_numpy()
+        out = {}
+        for chan, items in entries.items():
+            out[chan] = [
+                {"name": name, "row_count": count, "values": values[pos].tolist()} if grp is None
+                else {"name": name, "brand": grp, "row_count": count, "values": values[pos].tolist()}
+                for name, grp, count, pos in items
+            ]
         return out
 
-    def _build_channel_issue(scope_df: pd.DataFrame) -> dict:
+    def _build_channel_issue(p: str) -> dict:
         channels_out = []
-        if "채널구분" not in scope_df.columns:
+        if "채널구분" not in _scope(p).columns:
             return {"channels": channels_out}
-        for chan in sorted(scope_df["채널구분"].dropna().unique().tolist()):
-            cdf = scope_df[scope_df["채널구분"] == chan]
-
-            # 채널(P열) 전체 12개월 합계 — groupby 1회
-            month_sum = cdf.groupby("월구분")["판매액"].sum()
+        chan_rows = _pivot_rows(p, "채널구분")
+        chan_counts = _channel_row_counts(p)
+        vendors = _issue_series(_memo(("issue", p, "거래처명"), lambda: _issue_index(p, "거래처명")))   # R열
+        brands = _issue_series(_memo(("issue", p, "품목그룹1"), lambda: _issue_index(p, "품목그룹1")))    # D열
+        products = _issue_series(_memo(    # S열 × D열(브랜드)
+            ("issue", p, "품목 구분", "품목그룹1"), lambda: _issue_index(p, "품목 구분", "품목그룹1")
+        ))
+        for chan in _channels(p):
+            # 채널(P열) 전체 12개월 합계
+            month_sum = chan_rows.get(chan, empty_sums)
             chan_values = [float(month_sum.get(yymm, 0.0)) for yymm in last12_yymm]
 
             channels_out.append({
                 "name": str(chan),
-                "row_count": int(len(cdf)),
+                "row_count": int(chan_counts[chan]),
                 "values": chan_values,
-                "vendors": _series_by(cdf, "거래처명"),   # R열
-                "brands": _series_by(cdf, "품목그룹1"),    # D열
-                "products": _series_by_pair(cdf, "품목 구분", "품목그룹1"),  # S열 × D열(브랜드)
+                "vendors": vendors.get(chan, []),
+                "brands": brands.get(chan, []),
+                "products": products.get(chan, []),
             })
         return {"channels": channels_out}
 
-    # 프론트는 요청 파트(summary.channel_issue[part])만 사용 → 요청 파트만 빌드 (성능).
-    # part 변경 시 summary를 재페치하므로 나머지 파트는 빈 배열로 충분.
-    channel_issue = {
-        "all": {"channels": []},
-        "ecommerce": {"channels": []},
-        "offline": {"channels": []},
-    }
-    channel_issue[part] = _build_channel_issue(df_part)
-
-    # 브랜드 종합 요약 라인용 — 대상 월의 브랜드별 목표(전사 기준).
-    # 전사(전 파트) 목표라 part=all에서만 의미 → 그 외 파트는 빈 dict(목표비 "-").
-    brand_targets = _load_brand_targets().get(month, {}) if part == "all" else {}
+    # 단일 파트 요청은 요청 파트(summary.channel_issue[part])만 빌드, 나머지는 빈 배열.
+    # part="*"는 공유 집계에서 전 파트를 한 번 빌드해 모든 파트 summary가 같이 쓴다.
+    if all_parts_issue:
+        channel_issue = _memo(("channel_issue", month), lambda: {p: _build_channel_issue(p) for p in PART_LABELS})
+    else:
+        channel_issue = {
+            "all": {"channels": []},
+            "ecommerce": {"channels": []},
+            "offline": {"channels": []},
+        }
+        channel_issue[part] = _build_channel_issue(part)
+    yield "channel_issue", {"channel_issue": channel_issue, "channel_issue_months": last12_labels}
 
     # ----- brand_focus: 마이비/누비/쏭레브 (대상월 실적 + 채널별 대상월 매출) — AI 분석 컨텍스트용 -----
-    # 요청 part 기준(df_part). 채널별 대상월 매출까지 집계해 "브랜드별 주요 채널"을 grounded하게 제공.
+    # 요청 part 기준(agg_part). 채널별 대상월 매출까지 집계해 "브랜드별 주요 채널"을 grounded하게 제공.
     _FOCUS_BRANDS = ["마이비", "누비", "쏭레브"]
     _prev_y, _prev_m = last12[-2]   # 직전월
     _py_y, _py_m = last13[0]        # 전년 동월
     brand_focus = []
     for _b in _FOCUS_BRANDS:
-        _bf = df_part[df_part["품목그룹1"] == _b]
+        _bf = _brand_frame(_b)
+        _bs = brand_rows.get(_b, empty_sums)
         _ch = (
             _bf[_bf["월구분"] == target_yymm]
             .groupby("채널구분")["판매액"].sum()
@@ -682,37 +1027,15 @@ def get_summary(
         )
         brand_focus.append({
             "name": _b,
-            "current_month": float(_bf[_bf["월구분"] == target_yymm]["판매액"].sum()),
-            "prev_month": _month_total(_prev_y, _prev_m, _bf),
-            "prev_year": _month_total(_py_y, _py_m, _bf),
-            "monthly_avg": (sum(_month_total(_y, _m, _bf) for _y, _m in last12) / 12) if last12 else 0.0,
+            "current_month": float(_bs.get(target_yymm, 0.0)),
+            "prev_month": _month_total(_prev_y, _prev_m, _bs),
+            "prev_year": _month_total(_py_y, _py_m, _bs),
+            "monthly_avg": (sum(_month_total(_y, _m, _bs) for _y, _m in last12) / 12) if last12 else 0.0,
             "target": float(brand_targets.get(_b)) if brand_targets.get(_b) else None,
             "channels": [{"name": str(_n), "value": float(_v)} for _n, _v in _ch.items()],
         })
 
-    return {
-        "month": month,
-        "part": part,
-        "chart1": chart1,
-        "chart2": chart2,
-        "chart3": chart3,
-        "chart4": chart4,
-        "chart5": chart5,
-        "chart6": chart6,
-        "brand_targets": brand_targets,
-        "chart10": chart10,
-        "chart12": chart12,
-        "chart14": chart14,
-        "brand_products": brand_products,
-        "brand_products_months": last13_labels,
-        "channel_options": channel_options,
-        "channel_defaults": channel_defaults,
-        "channel_months": last12_labels,
-        "channel_months13": last13_labels,
-        "channel_issue": channel_issue,
-        "channel_issue_months": last12_labels,
-        "brand_focus": brand_focus,
-    }
+    yield "brand_focus", {"brand_focus": brand_focus}
 
 
 # ===================================================================
@@ -0,0 +1,173 @@
+"""응답 직렬화·압축 계층.
+
+- FastJSONResponse: orjson 직렬화. numpy 배열·스칼라를 그대로 쓰고, NaN/Inf는 null로 낸다
+  (표준 JSONResponse는 jsonable_encoder로 트리를 한 번 복사한 뒤 json.dumps — 큰 응답에서 지연의 상당 부분).
+- FastJSONRoute: 엔드포인트가 dict/list를 반환하면 jsonable_encoder를 건너뛰고 바로 FastJSONResponse로 감싼다.
+  Response(StreamingResponse 등)를 반환하면 그대로 둔다.
+- CompressionMiddleware: Accept-Encoding 협상으로 br(brotli 설치 시) 또는 gzip. 크기 임계 미만·스트리밍 본문은 그대로.
+"""
+import asyncio
+import datetime
+import decimal
+import functools
+import gzip
+
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse, Response
+
+try:
+    import brotli
+except ImportError:            # 선택 의존성 — 없으면 gzip만 협상한다
+    brotli = None
+
+COMPRESS_MIN_BYTES = 1024      # 이보다 작은 본문은 압축 이득보다 CPU·헤더 비용이 크다
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5             # 11은 대형 응답에서 수백 ms. 5가 gzip보다 작고 비슷하게 빠르다
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    """orjson이 직접 못 쓰는 타입. jsonable_encoder와 같은 표현을 낸다."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, (pd.Timestamp, datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, (pd.Period, decimal.Decimal)):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def _as_response(result):
+    return result if isinstance(result, Response) else FastJSONResponse(result)
+
+
+class FastJSONRoute(APIRoute):
+    """response_model 없는 라우트의 반환값을 FastJSONResponse로 바로 감싼다(jsonable_encoder 생략)."""
+
+    def __init__(self, path, endpoint, **kwargs):
+        if kwargs.get("response_model") is None and kwargs.get("status_code") is None:
+            endpoint = _wrap_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _wrap_endpoint(endpoint):
+    # 동기 엔드포인트는 동기 래퍼로 — FastAPI가 계속 스레드풀에서 실행한다. 시그니처는 __wrapped__로 보존.
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return _as_response(await endpoint(*args, **kwargs))
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            return _as_response(endpoint(*args, **kwargs))
+    return wrapper
+
+
+def _negotiate(accept_encoding: str):
+    """Accept-Encoding → 'br' | 'gzip' | None. q가 높은 쪽, 같으면 br. q=0은 거부로 본다."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    br = accepted.get("br", 0) if brotli is not None else 0
+    gz = accepted.get("gzip", 0)
+    if br > 0 and br >= gz:
+        return "br"
+    if gz > 0:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def _weaken(headers: MutableHeaders) -> None:
+    """압축 표현은 바이트가 달라지므로 강한 ETag를 약한 ETag로(If-None-Match는 약한 비교라 304는 그대로 동작)."""
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """한 메시지로 오는 본문(JSONResponse 등)만 압축한다. 스트리밍(ndjson 등)은 첫 청크부터 그대로 흘려보낸다."""
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = _negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if message["status"] == 304:
+                    _weaken(headers)
+                if message["status"] != 200 or "content-encoding" in headers:
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            compressed = _compress(body, encoding)
+            headers = MutableHeaders(scope=start)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            _weaken(headers)
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
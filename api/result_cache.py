@@ -0,0 +1,228 @@
+"""엔드포인트 결과 캐시 — (엔드포인트, 파일 내용 SHA256, 정규화 파라미터) → 응답.
+
+/api/dashboard/*, /monthly-review/summary/, /daily-review/summary/ 응답은 파일 내용과 쿼리 파라미터의
+순수 함수다. 같은 화면을 여러 명이 다시 여는 것이 가장 흔한 호출이라, 같은 키면 사전 조회 한 번으로 끝낸다.
+
+- 키에 파일명이 아니라 내용 해시(_resolve_file_hash)를 쓴다. 같은 이름으로 재업로드하면 해시가 바뀌어
+  자동으로 새 키가 되고, 옛 항목은 LRU에서 밀려난다.
+- 메모리 LRU(RESULT_CACHE_SIZE) + 디스크 스필(uploads/cache/results/). 디스크 항목은 재시작 후에도 재사용한다.
+  디렉터리명에 코드 버전(모듈 소스 해시)을 넣어 배포 후 옛 응답을 내주지 않는다.
+- 목표 파일처럼 파일 해시 밖의 입력이 있으면 version 인자로 키에 넣는다(예: 목표 파일 mtime).
+- 디스크 쓰기는 요청 스레드가 아니라 쓰기 전용 스레드 하나가 한다. 디렉터리(파일 해시)마다
+  RESULT_SPILL_PER_DIR개까지, 넘치면 오래 안 쓴(mtime) 항목부터 지운다. 검색어마다 키가 생기는
+  검색 엔드포인트(NO_SPILL)는 디스크에 남기지 않는다.
+- 같은 키의 동시 미스는 계산 하나를 함께 기다린다(in-flight future).
+"""
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BASE_DIR, "uploads", "cache", "results")
+
+RESULT_CACHE_SIZE = 256        # 메모리 항목 수. 대시보드 한 화면 ≈ 8~15개 응답
+RESULT_SPILL_DIRS = 8          # 디스크에 남길 (코드 버전, 파일 해시) 디렉터리 수. 업로드 파일 보존 개수(5)보다 넉넉히
+RESULT_SPILL_PER_DIR = 256     # 디렉터리 하나의 항목 수. 기본 화면(≈ 20) + 자주 쓰는 필터 조합
+NO_SPILL = ("dashboard/product-search", "dashboard/daily-product-search")  # 접두 일치 — 입력 중 검색어마다 키
+INFLIGHT_POLL_SECONDS = 0.2    # 다른 요청의 계산을 기다리며 자기 요청의 취소를 확인하는 주기
+RESULT_CACHE_SPILL = os.environ.get("RESULT_CACHE_SPILL", "1") != "0" and not os.environ.get("VERCEL")
+
+_results: "OrderedDict[tuple, object]" = OrderedDict()
+_lock = threading.Lock()
+_inflight: "dict[tuple, Future]" = {}
+_writer: Optional[ThreadPoolExecutor] = None
+
+
+def _code_version() -> str:
+    """응답을 만드는 모듈 소스(+ 코드와 함께 배포되는 brand_targets.csv)의 해시.
+    집계 모듈과 함께 변환(columnar)·직렬화(responses)도 넣는다 — 변환된 본문도 캐시에 들어가고
+    http_cache의 ETag도 이 값을 쓴다. 배포로 이 중 하나가 바뀌면 디스크 항목과 ETag가 자동으로 무효가 된다."""
+    h = hashlib.sha256()
+    for name in ("dashboard.py", "monthly_review.py", "daily_review.py", "result_cache.py", "columnar.py",
+                 "responses.py", "brand_targets.csv"):
+        path = os.path.join(BASE_DIR, name)
+        if os.path.exists(path):
+            with open(path, "rb") as fh:
+                h.update(fh.read())
+    return h.hexdigest()[:12]
+
+
+_CODE_VERSION = _code_version()
+
+
+def _normalise(params: dict) -> tuple:
+    """키 정렬 + 문자열화. None은 '미지정'이라 빼고, 빈 문자열은 의미가 다를 수 있어 남긴다."""
+    return tuple(sorted((k, str(v)) for k, v in params.items() if v is not None))
+
+
+def _spill_dir(file_hash: str) -> str:
+    return os.path.join(RESULTS_DIR, f"{_CODE_VERSION}-{file_hash}")
+
+
+def _spill_path(key: tuple) -> str:
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+    return os.path.join(_spill_dir(key[1]), f"{digest}.pkl")
+
+
+def _read_spill(key: tuple):
+    path = _spill_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as fh:
+            result = pickle.load(fh)
+        os.utime(path)                 # 디렉터리 안 LRU(mtime) 기준
+        return result
+    except Exception as e:
+        logging.warning(f"Result cache spill unreadable ({os.path.basename(path)}): {e}")
+        return None
+
+
+def _write_spill(key: tuple, result) -> None:
+    path = _spill_path(key)
+    try:
+        new_dir = not os.path.isdir(os.path.dirname(path))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            pickle.dump(result, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        if new_dir:
+            _prune_spill()
+        _prune_spill_dir(os.path.dirname(path))
+    except Exception as e:
+        logging.warning(f"Result cache spill failed: {e}")
+
+
+def _spill_later(key: tuple, result) -> None:
+    """쓰기 스레드에 넘긴다. 결과 캐시 항목은 공유 후 수정하지 않으므로 나중에 피클해도 같다."""
+    global _writer
+    if key[0].startswith(NO_SPILL):
+        return
+    with _lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-spill")
+        writer = _writer
+    writer.submit(_write_spill, key, result)
+
+
+def _prune_spill_dir(path: str) -> None:
+    """디렉터리 하나를 RESULT_SPILL_PER_DIR개로 — 최근에 쓰거나 읽은(mtime) 항목을 남긴다."""
+    entries = [e for e in os.scandir(path) if e.name.endswith(".pkl")]
+    if len(entries) <= RESULT_SPILL_PER_DIR:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for e in entries[RESULT_SPILL_PER_DIR:]:
+        try:
+            os.remove(e.path)
+        except OSError:
+            pass
+
+
+def _prune_spill() -> None:
+    """가장 최근에 만든 RESULT_SPILL_DIRS개 디렉터리만 남긴다(옛 파일 해시 · 옛 코드 버전 정리)."""
+    dirs = [os.path.join(RESULTS_DIR, d) for d in os.listdir(RESULTS_DIR)]
+    dirs = sorted((d for d in dirs if os.path.isdir(d)), key=os.path.getmtime, reverse=True)
+    for d in dirs[RESULT_SPILL_DIRS:]:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def file_hash_of(filename: str) -> Optional[str]:
+    from dashboard import _resolve_file_hash
+    return _resolve_file_hash(filename, os.path.join(BASE_DIR, "uploads", filename))
+
+
+def cached_result(endpoint: str, filename: Optional[str], params: dict, compute: Callable,
+                  version=None):
+    """(endpoint, 파일 해시, params, version) 키로 compute() 결과를 재사용한다.
+
+    해시를 알 수 없으면(파일 없음 등) 캐시하지 않고 compute()를 그대로 호출한다 — 오류 응답도 그대로 전파.
+    예외는 캐시하지 않는다. 같은 키를 계산 중인 요청이 있으면 그 결과를 기다린다 — 그 요청이 실패하면
+    같은 예외를 받고, 그 요청이 취소(연결 종료·예산 초과)됐으면 다시 시도한다.
+    """
+    from cancellation import RequestCancelled, checkpoint
+
+    file_hash = file_hash_of(filename) if filename else None
+    if not file_hash:
+        return compute()
+
+    key = (endpoint, file_hash, _normalise(params), version)
+    while True:
+        with _lock:
+            if key in _results:
+                _results.move_to_end(key)
+                return _results[key]
+            future = _inflight.get(key)
+            if future is None:
+                future = _inflight[key] = Future()
+                break
+        try:
+            while True:
+                try:
+                    return future.result(timeout=INFLIGHT_POLL_SECONDS)
+                except FutureTimeout:
+                    checkpoint()
+        except RequestCancelled:
+            if future.done() and isinstance(future.exception(), RequestCancelled):
+                continue               # 계산하던 요청이 취소됐다 — 이 요청이 다시 계산한다
+            raise
+
+    try:
+        result = _read_spill(key) if RESULT_CACHE_SPILL else None
+        spilled = result is not None
+        if result is None:
+            result = compute()
+    except BaseException as e:
+        with _lock:
+            _inflight.pop(key, None)
+        future.set_exception(e)
+        raise
+
+    with _lock:
+        _results[key] = result
+        _results.move_to_end(key)
+        while len(_results) > RESULT_CACHE_SIZE:
+            _results.popitem(last=False)
+        _inflight.pop(key, None)
+    future.set_result(result)
+    if RESULT_CACHE_SPILL and not spilled:
+        _spill_later(key, result)
+    return result
+
+
+def peek_result(endpoint: str, filename: Optional[str], params: dict, version=None):
+    """cached_result와 같은 키로 조회만 한다(계산하지 않음). 없거나 해시를 모르면 None."""
+    file_hash = file_hash_of(filename) if filename else None
+    if not file_hash:
+        return None
+    key = (endpoint, file_hash, _normalise(params), version)
+    with _lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]
+    return _read_spill(key) if RESULT_CACHE_SPILL else None
+
+
+def clear_result_cache(file_hash: Optional[str] = None) -> None:
+    """결과 캐시 비우기. file_hash를 주면 그 파일 항목만(메모리 + 디스크)."""
+    with _lock:
+        if file_hash:
+            for key in [k for k in _results if k[1] == file_hash]:
+                del _results[key]
+        else:
+            _results.clear()
+    if not os.path.isdir(RESULTS_DIR):
+        return
+    if file_hash:
+        for d in os.listdir(RESULTS_DIR):
+            if d.endswith(f"-{file_hash}"):
+                shutil.rmtree(os.path.join(RESULTS_DIR, d), ignore_errors=True)
+    else:
+        shutil.rmtree(RESULTS_DIR, ignore_errors=True)
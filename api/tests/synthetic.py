@@ -0,0 +1,85 @@
+"""합성 매출 프레임 — 벡터화 집계 회귀 테스트가 같이 쓴다.
+
+난수 없이 산술 패턴으로 만든 2024-03-01 ~ 2025-06-17 행. 파트·거래처·브랜드·품목이 고루 섞인다.
+각 테스트의 DIGESTS는 같은 프레임을 이전 구현(벡터화 전 커밋의 dashboard.py / monthly_review.py)에 넣어 얻은
+응답의 해시다. 소수는 6자리로 반올림해 합산 순서 차이는 무시한다.
+"""
+import hashlib
+import json
+import math
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import dashboard
+import monthly_review
+import result_cache
+
+PARTS = ["이커머스", "이커머스", "오프라인", "이커머스", "오프라인", "해외", "오프라인 대리점"]
+CHANNELS = ["자사몰", "오픈마켓", "할인점", "종합몰"]
+ACCOUNTS = ["쿠팡(로켓)", "스팜(제제지크)", "11st", "이마트", "롯데마트", "다이소", "기타상사"]
+MAIN = ["주력", "쿠팡(사입)", "기타"]
+BRANDS = ["마이비", "누비", "쏭레브", "기타"]
+CATEGORIES = ["얼룩제거제", "순한라인", "롱핸들", "톤업 크림", "기타"]
+PRODUCTS = [("P1", "얼룩제거제 500ml"), ("P2", "순한 세제 1L"), ("P3", "롱핸들 빨대컵"),
+            ("P4", "톤업 크림 50g"), ("P5", "Baby (Wipes) [80매]"), ("P6", "무당벌레 컵")]
+
+def synthetic_sales(n=3000):
+    days = pd.date_range("2024-03-01", "2025-06-17", freq="D")
+    rows = []
+    for i in range(n):
+        code, name = PRODUCTS[(i * 5) % len(PRODUCTS)]
+        rows.append({
+            "일별": days[(i * 37) % len(days)].strftime("%Y-%m-%d"),
+            "판매액": float((i * 7919) % 320000 - 20000),
+            "이익": float((i * 104729) % 85000 - 5000),
+            "파트구분": PARTS[i % len(PARTS)],
+            "채널구분": CHANNELS[(i // 3) % len(CHANNELS)],
+            "거래처명": ACCOUNTS[(i * 3) % len(ACCOUNTS)],
+            "주력 채널": MAIN[(i // 2) % len(MAIN)],
+            "품목그룹1": BRANDS[(i // 5) % len(BRANDS)],
+            "품목 구분": CATEGORIES[(i * 7) % len(CATEGORIES)],
+            "품목 구분_2": "AB"[(i // 11) % 2],
+            "품목코드": code,
+            "품목명[규격]": name,
+        })
+    df = pd.DataFrame(rows).sort_values("일별", kind="stable").reset_index(drop=True)
+    dt = pd.to_datetime(df["일별"])
+    df["월구분"] = (dt.dt.year % 100) * 100 + dt.dt.month
+    return df
+
+
+FRAME = synthetic_sales()
+
+
+def _canon(x):
+    if isinstance(x, dict):
+        return {str(k): _canon(v) for k, v in x.items()}
+    if isinstance(x, (list, tuple)):
+        return [_canon(v) for v in x]
+    if isinstance(x, np.integer):
+        return int(x)
+    if isinstance(x, np.bool_):
+        return bool(x)
+    if isinstance(x, (float, np.floating)):
+        x = float(x)
+        return None if math.isnan(x) else round(x, 6)
+    return x
+
+
+def digest(result) -> str:
+    body = json.dumps(_canon(result), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+
+
+def use_synthetic_file(monkeypatch, frame: pd.DataFrame = FRAME) -> None:
+    """모든 로드가 frame 사본을 받는다. 파일 해시가 없어 결과 캐시는 거치지 않는다."""
+    monkeypatch.setattr(dashboard, "get_dataframe", lambda filename: frame.copy())
+    monkeypatch.setattr(dashboard, "_detail_cache", OrderedDict())
+    monkeypatch.setattr(dashboard, "_search_index_cache", {})
+    monkeypatch.setattr(monthly_review, "_ensure_file_on_disk", lambda filename: True)
+    monkeypatch.setattr(monthly_review, "_resolve_file_hash", lambda *args: None)
+    monkeypatch.setattr(monthly_review, "_load_dataframe", lambda filename: frame.copy())
+    monkeypatch.setattr(monthly_review, "_load_brand_targets", lambda: {})    # 저장소의 brand_targets.csv와 분리
+    monkeypatch.setattr(result_cache, "file_hash_of", lambda filename: None)
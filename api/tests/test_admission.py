@@ -0,0 +1,136 @@
+"""입장 제어 게이트·미들웨어 테스트. 실행: PYTHONPATH=api pytest api/tests/test_admission.py"""
+import asyncio
+
+import admission
+from admission import AdmissionMiddleware, _Gate
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_gate_admits_up_to_limit_then_queues_fifo():
+    async def scenario():
+        gate = _Gate("t", limit=1, queue=2)
+        assert await gate.acquire(1.0) is None
+        order = []
+
+        async def waiter(name):
+            assert await gate.acquire(1.0) is None
+            order.append(name)
+
+        tasks = [asyncio.create_task(waiter("a")), asyncio.create_task(waiter("b"))]
+        await asyncio.sleep(0)
+        assert gate.waiting == 2
+        gate.release(0.01)                 # 자리를 a에게 그대로 넘긴다
+        await asyncio.sleep(0)
+        gate.release(0.01)                 # a 끝 → b
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b"]
+        assert gate.active == 1
+        gate.release(0.01)
+        assert gate.active == 0
+
+    _run(scenario())
+
+
+def test_gate_rejects_when_queue_is_full_or_wait_times_out():
+    async def scenario():
+        gate = _Gate("t", limit=1, queue=1)
+        await gate.acquire(1.0)
+        queued = asyncio.create_task(gate.acquire(0.05))
+        await asyncio.sleep(0)
+        assert await gate.acquire(1.0) == "queue_full"
+        assert await queued == "timeout"
+        assert await gate.acquire(0) == "timeout"
+        assert (gate.rejected, gate.timed_out, gate.waiting, gate.active) == (1, 2, 0, 1)
+
+    _run(scenario())
+
+
+def test_cancelled_waiter_does_not_keep_a_slot():
+    async def scenario():
+        gate = _Gate("t", limit=1, queue=2)
+        await gate.acquire(1.0)
+        task = asyncio.create_task(gate.acquire(1.0))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        gate.release()
+        assert (gate.active, gate.waiting) == (0, 0)
+
+    _run(scenario())
+
+
+def test_cancel_after_handoff_leaves_no_orphan_slot():
+    async def scenario():
+        gate = _Gate("t", limit=1, queue=2)
+        await gate.acquire(1.0)
+        task = asyncio.create_task(gate.acquire(1.0))
+        await asyncio.sleep(0)
+        gate.release()                     # 자리를 넘겨받은 직후(재개 전) 취소
+        task.cancel()
+        result, = await asyncio.gather(task, return_exceptions=True)
+        # 입장으로 끝났으면(wait_for가 완료된 결과를 돌려준 경우) 호출자가 자리를 가진다. 취소로 끝났으면 돌려줬어야 한다
+        if result is None:
+            gate.release()
+        assert gate.active == 0
+
+    _run(scenario())
+
+
+def test_middleware_releases_pool_slot_when_total_wait_is_cancelled(monkeypatch):
+    async def scenario():
+        pool = _Gate("dashboard", limit=1, queue=1)
+        total = _Gate("total", limit=1, queue=1)
+        monkeypatch.setattr(admission, "_gates", {"dashboard": pool})
+        monkeypatch.setattr(admission, "_total", total)
+        await total.acquire(1.0)           # 전체 상한이 차 있어 풀 자리를 잡은 뒤 기다린다
+
+        async def app(scope, receive, send):
+            raise AssertionError("입장하지 않아야 한다")
+
+        scope = {"type": "http", "method": "GET", "path": "/api/dashboard/summary"}
+        task = asyncio.create_task(AdmissionMiddleware(app)(scope, None, None))
+        await asyncio.sleep(0.01)
+        assert (pool.active, total.waiting) == (1, 1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert (pool.active, total.waiting) == (0, 0)
+
+    _run(scenario())
+
+
+def test_light_paths_are_not_pooled():
+    assert admission.pool_of("/api/dashboard/options") is None
+    assert admission.pool_of("/api/files") is None
+    assert admission.pool_of("/api/monthly-review/summary/") == "monthly-review"
+    assert admission.pool_of("/api/dashboard/ecommerce-details") == "ecommerce-details"
+    for path in ("/api/dashboard/product-search", "/api/dashboard/product-search-sales",
+                 "/api/dashboard/daily-product-search-sales"):
+        assert admission.pool_of(path) == "product-search"
+
+
+def test_search_is_not_queued_behind_a_full_dashboard_pool(monkeypatch):
+    async def scenario():
+        widgets = _Gate("dashboard", limit=1, queue=1)
+        search = _Gate("product-search", limit=1, queue=1)
+        monkeypatch.setattr(admission, "_gates", {"dashboard": widgets, "product-search": search})
+        monkeypatch.setattr(admission, "_total", _Gate("total", limit=4, queue=4))
+        await widgets.acquire(1.0)
+        queued = asyncio.create_task(widgets.acquire(5.0))
+        await asyncio.sleep(0)             # 위젯 풀: 실행 1 + 대기 1로 꽉 참
+
+        served = []
+
+        async def app(scope, receive, send):
+            served.append(scope["path"])
+
+        scope = {"type": "http", "method": "GET", "path": "/api/dashboard/product-search-sales"}
+        await asyncio.wait_for(AdmissionMiddleware(app)(scope, None, None), 1.0)
+        assert served == ["/api/dashboard/product-search-sales"]
+        assert (search.admitted, search.active, widgets.waiting) == (1, 0, 1)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+
+    _run(scenario())
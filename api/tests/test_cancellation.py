@@ -0,0 +1,115 @@
+"""협조적 취소 테스트 — 토큰·checkpoint·BudgetMiddleware. 실행: PYTHONPATH=api pytest api/tests/test_cancellation.py"""
+import asyncio
+import pickle
+import threading
+import time
+
+import pytest
+
+import cancellation
+from cancellation import BudgetMiddleware, CancelToken, RequestCancelled, bind, checkpoint, current_token
+
+
+def test_checkpoint_without_token_is_a_no_op():
+    assert current_token() is None
+    checkpoint()
+
+
+def test_checkpoint_raises_504_once_the_budget_is_spent():
+    with bind(CancelToken(time.time() + 60)):
+        checkpoint()
+    with bind(CancelToken(time.time() - 1)):
+        with pytest.raises(RequestCancelled) as e:
+            checkpoint()
+    assert (e.value.status_code, e.value.reason) == (504, "budget")
+    assert current_token() is None
+
+
+def test_checkpoint_raises_499_after_disconnect_and_keeps_the_first_reason():
+    token = CancelToken(time.time() - 1)
+    token.cancel("disconnect")
+    assert token.cancelled and token.reason == "disconnect"
+    with bind(token):
+        with pytest.raises(RequestCancelled) as e:
+            checkpoint()
+    assert e.value.status_code == 499
+
+
+def test_flag_set_by_another_process_reads_as_disconnect():
+    flag = threading.Event()               # 워커에서는 Manager Event 프록시
+    token = CancelToken(time.time() + 60, flag)
+    assert not token.cancelled
+    flag.set()
+    assert token.cancelled and token.reason == "disconnect"
+
+
+def test_request_cancelled_survives_pickling():
+    # 프로세스 풀 워커에서 부모로 넘어온다
+    e = pickle.loads(pickle.dumps(RequestCancelled("budget")))
+    assert isinstance(e, RequestCancelled)
+    assert (e.status_code, e.reason) == (504, "budget")
+
+
+def _receive_from(messages):
+    queue = asyncio.Queue()
+    for m in messages:
+        queue.put_nowait(m)
+
+    async def receive():
+        return await queue.get()
+
+    return queue, receive
+
+
+def test_middleware_cancels_the_token_when_the_client_disconnects():
+    async def scenario():
+        seen = {}
+
+        async def app(scope, receive, send):
+            token = current_token()
+            seen["body"] = await receive()
+            for _ in range(100):
+                if token.cancelled:
+                    break
+                await asyncio.sleep(0.01)
+            seen["reason"] = token.reason
+
+        queue, receive = _receive_from([{"type": "http.request", "body": b"{}", "more_body": False}])
+        scope = {"type": "http", "method": "POST", "path": "/api/dashboard/batch"}
+        task = asyncio.create_task(BudgetMiddleware(app)(scope, receive, None))
+        await asyncio.sleep(0.02)
+        queue.put_nowait({"type": "http.disconnect"})
+        await task
+        assert seen["body"]["body"] == b"{}"       # 미리 받아 둔 본문은 앱에 그대로 넘어간다
+        assert seen["reason"] == "disconnect"
+
+    asyncio.run(scenario())
+
+
+def test_middleware_applies_the_pool_budget(monkeypatch):
+    monkeypatch.setitem(cancellation.BUDGETS, "dashboard", 0)
+
+    async def scenario():
+        async def app(scope, receive, send):
+            checkpoint()
+
+        _, receive = _receive_from([{"type": "http.request", "body": b"", "more_body": False}])
+        scope = {"type": "http", "method": "GET", "path": "/api/dashboard/summary"}
+        with pytest.raises(RequestCancelled) as e:
+            await BudgetMiddleware(app)(scope, receive, None)
+        assert e.value.status_code == 504
+
+    asyncio.run(scenario())
+
+
+def test_light_paths_get_no_token():
+    async def scenario():
+        seen = {}
+
+        async def app(scope, receive, send):
+            seen["token"] = current_token()
+
+        await BudgetMiddleware(app)({"type": "http", "method": "GET", "path": "/api/files"}, None, None)
+        assert seen["token"] is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,48 @@
+"""columnar / arrow 응답 형식 왕복 테스트. 실행: PYTHONPATH=api pytest api/tests/test_columnar.py"""
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from columnar import ARROW_MIN_ROWS, from_arrow, to_arrow, to_columnar
+
+N = ARROW_MIN_ROWS
+
+
+def _payload():
+    return {
+        "meta": {"segments": ["coupang", "self"]},
+        "coupang": {
+            "daily": [{"Date": f"2026-06-{d:02d}", "판매액": 1000.0 * d, "이익률": None if d == 3 else 12.5}
+                      for d in range(1, N + 1)],
+            "monthly": [{"Month": f"2025-{m:02d}", "판매액": 10 * m} for m in range(1, 13)],   # 짧은 시리즈
+        },
+        "self": {
+            "daily": [{"Date": f"2026-06-{d:02d}", "판매액": 7.5 * d, "이익률": 3.0} for d in range(1, N + 1)],
+        },
+        "mixed": [{"name": "a", "value": "x" if i % 2 else i} for i in range(N)],       # 한 필드에 타입이 섞임
+        "nested": [{"name": f"v{i}", "values": [float(i), float(i + 1)]} for i in range(N)],
+    }
+
+
+def test_arrow_round_trip_keeps_every_series():
+    payload = _payload()
+    assert from_arrow(to_arrow(payload)) == payload
+
+
+def test_arrow_groups_series_by_shape_and_inlines_the_rest():
+    body = to_arrow(_payload())
+    source = pa.BufferReader(body)
+    head = pa.ipc.open_stream(source)
+    head.read_all()
+    schemas = []
+    while source.tell() < len(body):
+        schemas.append(pa.ipc.open_stream(source).read_all().schema)
+    # coupang.daily + self.daily 한 스트림, nested 한 스트림. monthly(짧음)·mixed(타입 혼재)는 골격 JSON
+    assert len(schemas) == 2
+    assert pa.types.is_dictionary(schemas[0].field("Date").type)
+
+
+def test_columnar_turns_record_arrays_into_columns():
+    out = to_columnar({"rows": [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}], "other": [{"a": 1}, {"b": 2}]})
+    assert out["rows"] == {"columns": ["a", "b"], "data": [[1, 2], ["x", "y"]], "length": 2}
+    assert out["other"] == [{"a": 1}, {"b": 2}]
@@ -9,9 +9,14 @@ ERP 스냅샷은 과거일을 소급 정정한다(260707 vs 260713에서 2026-06
 """
 import numpy as np
 import pytest
+from fastapi import HTTPException
 
 from daily_review import (
     get_daily_review_summary,
+    get_daily_review_backtest,
+    get_daily_review_pace,
+    get_watch_vendors,
+    get_watch_products,
     _bevent_gap_status,
     _alias,
     _build_daily_context,
@@ -460,3 +465,89 @@ def test_provisional_flag_for_recent_dates(d0612):
     """ERP는 과거 45일을 소급 정정한다. 최근 판정은 잠정이다."""
     assert d0612["data_freshness"]["provisional"] is True
     assert d0612["meta"]["file_hash"]      # 아카이브 시 스냅샷을 핀으로 박을 수 있어야 한다
+
+
+# ---------------------------------------------------------------- 백테스트
+
+@pytest.fixture(scope="module")
+def bt_june():
+    return get_daily_review_backtest(filename=FIXTURE, start_date="2026-06-01", end_date="2026-06-12")
+
+
+def test_backtest_day_matches_summary(d0612, bt_june):
+    """백테스트는 summary와 같은 판정 엔진이다. 같은 날이면 같은 답."""
+    day = next(d for d in bt_june["days"] if d["date"] == "2026-06-12")
+    a = [c["name"] for c in d0612["channel_classification"]["channels"] if c["group"] == "A"]
+    assert sorted(day["a_group"]) == sorted(a)
+    assert day["ref_dates"] == d0612["accrual_snapshot"]["ref_dates"]
+    assert day["anomalies"] == d0612["anomalies"]["flags"]
+    assert day["pace"]["band_position"] == d0612["mtd_pace"]["band_position"]
+
+
+def test_backtest_covers_core_days_only(bt_june):
+    dates = [d["date"] for d in bt_june["days"]]
+    assert "2026-06-06" not in dates                 # 토요일(비코어)
+    assert dates == sorted(dates)
+    assert bt_june["meta"]["n_days"] == len(dates)
+
+
+def test_backtest_rejects_ranges_over_a_year():
+    with pytest.raises(HTTPException) as e:
+        get_daily_review_backtest(filename=FIXTURE, start_date="2025-01-01", end_date="2026-06-12")
+    assert e.value.status_code == 400
+
+
+def test_summary_repeat_is_served_from_result_cache(d0612):
+    """같은 (파일 해시, 대상일) 재조회는 재계산 없이 같은 응답."""
+    assert get_daily_review_summary(filename=FIXTURE, target_date="2026-06-12") is d0612
+
+
+# ---------------------------------------------------------------- 스코프별 페이스
+
+def test_pace_total_matches_summary(d0612):
+    r = get_daily_review_pace(filename=FIXTURE, target_date="2026-06-12", brands=None)
+    assert r["total"] == d0612["mtd_pace"]
+    assert set(r["brands"]) == {"마이비", "누비", "쏭레브"}
+
+
+def test_pace_unknown_brand_is_suppressed_not_an_error():
+    r = get_daily_review_pace(filename=FIXTURE, target_date="2026-06-12", brands="없는브랜드")
+    b = r["brands"]["없는브랜드"]
+    assert b["mtd"]["net"] == 0.0
+    assert b["band_position"] is None
+    assert b["suppressed_reason"] == "학습 가능한 완결월이 부족합니다."
+
+
+# ---------------------------------------------------------------- 전체 감시표
+
+def _watch(fn, **kw):
+    args = dict(filename=FIXTURE, target_date="2026-06-12", sort="net_60d", order="desc",
+                position=None, channel=None, q=None, limit=50, cursor=None)
+    args.update(kw)
+    return fn(**args)
+
+
+def test_watch_vendors_head_is_the_top_vendor_panel(d0612):
+    """전체 감시표 상단 = summary 상위 8 패널. 같은 규약이라 위치 판정이 어긋나지 않는다."""
+    top = d0612["accrual_snapshot"]["top_vendors"]
+    page = _watch(get_watch_vendors, limit=len(top))
+    assert [(r["account"], r["position"]) for r in page["items"]] == [(r["account"], r["position"]) for r in top]
+
+
+def test_watch_products_cursor_pages_cover_catalogue_once():
+    first = _watch(get_watch_products, limit=10)
+    seen, page = [], first
+    while True:
+        seen += [r["code"] for r in page["items"]]
+        if not page["next_cursor"]:
+            break
+        page = _watch(get_watch_products, limit=10, cursor=page["next_cursor"])
+    assert len(seen) == len(set(seen)) == first["meta"]["total"]
+    assert first["meta"]["total"] > 8          # 롱테일까지
+
+
+def test_watch_cursor_is_bound_to_query():
+    page = _watch(get_watch_vendors, limit=2)
+    with pytest.raises(HTTPException) as e:
+        _watch(get_watch_vendors, limit=2, sort="net", cursor=page["next_cursor"])
+    assert e.value.status_code == 400
@@ -0,0 +1,52 @@
+"""대시보드 일괄 조회 테스트 — 요청 검증·위젯별 오류 매핑. 실행: PYTHONPATH=api pytest api/tests/test_dashboard_batch.py"""
+import pytest
+from fastapi import HTTPException
+
+import dashboard_batch
+from dashboard_batch import BATCH_MAX_WIDGETS, run_batch, validate_specs
+
+
+def test_validate_fills_ids_and_allowed_params():
+    specs = validate_specs([("summary", None, {}),
+                            ("channel-sales", "ch", {"part": "이커머스"}),
+                            ("ecommerce-details", None, {"segments": "coupang_*"})])
+    assert specs[0] == ("summary", "summary", {})
+    assert specs[1] == ("ch", "channel-sales", {"part": "이커머스", "channel": None, "account": None,
+                                                "group": None, "category": None, "sub_category": None})
+    assert specs[2] == ("ecommerce-details", "ecommerce-details", {"segments": "coupang_*"})
+
+
+@pytest.mark.parametrize("specs,message", [
+    ([], "비어"),
+    ([("summary", f"s{i}", {}) for i in range(BATCH_MAX_WIDGETS + 1)], "최대"),
+    ([("nope", None, {})], "알 수 없는 위젯"),
+    ([("summary", None, {}), ("summary", None, {})], "중복된 위젯 id"),
+    ([("summary", None, {"part": "x"})], "지원하지 않는 파라미터"),
+    ([("ecommerce-details", None, {"segments": "no_such_segment"})], "알 수 없는 세그먼트"),
+])
+def test_validate_rejects_bad_requests(specs, message):
+    with pytest.raises(ValueError, match=message):
+        validate_specs(specs)
+
+
+def test_run_batch_maps_each_failure_to_its_widget(monkeypatch):
+    def fake_run_widget(filename, widget, params):
+        if widget == "alerts":
+            raise HTTPException(status_code=400, detail="bad")
+        if widget == "options":
+            raise FileNotFoundError(filename)
+        if widget == "monthly-sales":
+            raise RuntimeError("boom")
+        return {"widget": widget, "params": params}
+
+    monkeypatch.setattr(dashboard_batch, "run_widget", fake_run_widget)
+    specs = validate_specs([("summary", "b", {}), ("alerts", None, {}), ("options", None, {}),
+                            ("monthly-sales", None, {}), ("product-group-sales", "a", {})])
+    out = run_batch("f.csv", specs)
+    assert list(out["results"]) == ["b", "a"]                 # 요청 순서 유지
+    assert out["results"]["b"] == {"widget": "summary", "params": {}}
+    assert out["errors"] == {
+        "alerts": {"status": 400, "detail": "bad"},
+        "options": {"status": 404, "detail": "파일을 찾을 수 없습니다"},
+        "monthly-sales": {"status": 500, "detail": "데이터 처리 실패: boom"},
+    }
@@ -0,0 +1,51 @@
+"""이커머스 상세 회귀 테스트 — 세그먼트 큐브가 이전(세그먼트별 행 필터) 구현과 같은 응답을 내는지 고정한다.
+실행: PYTHONPATH=api pytest api/tests/test_ecommerce_details.py"""
+import numpy as np
+import pytest
+
+import dashboard
+from synthetic import FRAME, digest, use_synthetic_file
+
+DIGEST = "8d6b15582f95b126"
+
+
+@pytest.fixture(autouse=True)
+def _synthetic_file(monkeypatch):
+    use_synthetic_file(monkeypatch)
+
+
+def test_ecommerce_details_match_the_previous_implementation():
+    details = dashboard.get_ecommerce_details("synthetic.csv")
+    assert list(details) == list(dashboard.ECOMMERCE_DETAIL_SEGMENTS)
+    assert details["coupang"]["monthly"][-2:] == [
+        {"Month": "2025-05", "판매액": 4161619, "이익률": 23.7, "일평균매출": 134245},
+        {"Month": "2025-06", "판매액": 2516621, "이익률": 25.2, "일평균매출": 148036},
+    ]
+    assert details["coupang"]["daily"][-1] == {"Date": "2025-06-17", "판매액": 78241.0, "이익": 39831.0, "이익률": 50.9}
+    assert details["total_myb"]["monthly"][-1] == {"Month": "2025-06", "판매액": 1777373, "이익률": 29.0,
+                                                   "일평균매출": 104551}
+    assert digest(details) == DIGEST
+
+
+def test_ecommerce_detail_months_are_plain_filtered_sums():
+    details = dashboard.get_ecommerce_details("synthetic.csv")
+    june = FRAME[FRAME["월구분"] == 2506]
+    for key, filters in (("coupang", {"파트구분": "이커머스", "거래처명": "쿠팡(로켓)"}),
+                         ("offline_nubi", {"파트구분": "오프라인", "품목그룹1": "누비"}),
+                         ("emart", {"거래처명": "이마트"})):
+        mask = np.logical_and.reduce([june[col] == value for col, value in filters.items()])
+        assert details[key]["monthly"][-1]["판매액"] == int(june.loc[mask, "판매액"].sum()), key
+
+
+def test_selected_segments_equal_the_full_response():
+    full = dashboard.get_ecommerce_details("synthetic.csv")
+    dashboard._detail_cache.clear()
+    picked = dashboard.get_ecommerce_details("synthetic.csv", segments="coupang_*,emart")
+    assert list(picked) == [k for k in full if k == "emart" or k.startswith("coupang_")]
+    assert picked == {k: full[k] for k in picked}
+
+
+def test_integer_sums_are_not_truncated_below_the_true_value():
+    # 행렬곱은 pandas 합과 더하는 순서가 달라 정수 합이 4161618.9999… 로 나올 수 있다
+    sums = np.array([4161618.9999999995, 134245.7, -2.5, 0.30000000000000004])
+    assert dashboard._trunc_int(sums).tolist() == [4161619, 134245, -2, 0]
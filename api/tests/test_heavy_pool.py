@@ -0,0 +1,146 @@
+"""무거운 집계 실행기 테스트 — 실행 모드별 분기·워커 오류 전달·워커 캐시 정리·작업별 취소. 실행: PYTHONPATH=api pytest api/tests/test_heavy_pool.py"""
+import threading
+import time
+from collections import OrderedDict
+
+import pytest
+from fastapi import HTTPException
+
+import dashboard
+import heavy_pool
+import result_cache
+from cancellation import CancelToken, RequestCancelled, bind, checkpoint
+from heavy_pool import _WorkerHTTPError, _trim_worker_frames, _worker_call, run_heavy
+
+MODULE = __name__
+
+
+def echo(filename, *args):
+    return filename, args
+
+
+def stage(filename):
+    checkpoint()
+    return filename
+
+
+def slow(filename, seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        checkpoint()
+        time.sleep(0.05)
+    return "done"
+
+
+def stuck(filename, seconds):
+    time.sleep(seconds)                # checkpoint 없이 — 취소 플래그를 보지 못한다
+
+
+def not_found(filename):
+    raise HTTPException(status_code=404, detail=f"파일 없음: {filename}")
+
+
+def test_thread_mode_calls_in_the_request_thread(monkeypatch):
+    monkeypatch.setattr(heavy_pool, "HEAVY_EXECUTION", "thread")
+    monkeypatch.setattr(heavy_pool, "_executor", lambda: pytest.fail("풀을 쓰지 않아야 한다"))
+    assert run_heavy(MODULE, "echo", "f.csv", 1, "x") == ("f.csv", (1, "x"))
+
+
+def test_process_mode_without_a_shared_copy_falls_back_to_the_thread(monkeypatch):
+    monkeypatch.setattr(heavy_pool, "HEAVY_EXECUTION", "process")
+    monkeypatch.setattr(heavy_pool, "_executor", lambda: pytest.fail("풀을 쓰지 않아야 한다"))
+    monkeypatch.setattr(result_cache, "file_hash_of", lambda filename: None)
+    assert run_heavy(MODULE, "echo", "f.csv", 2) == ("f.csv", (2,))
+    with pytest.raises(HTTPException) as e:
+        run_heavy(MODULE, "not_found", "f.csv")
+    assert e.value.status_code == 404
+
+
+def test_worker_call_carries_http_errors_and_deadlines(monkeypatch):
+    monkeypatch.setattr(dashboard, "_filename_hash_cache", {})
+    with pytest.raises(_WorkerHTTPError) as e:
+        _worker_call(MODULE, "not_found", "f.csv", "h", ())
+    assert (e.value.status_code, e.value.detail) == (404, "파일 없음: f.csv")
+    with pytest.raises(RequestCancelled):
+        _worker_call(MODULE, "stage", "f.csv", "h", (), deadline=0)       # 이미 지난 마감
+    assert _worker_call(MODULE, "stage", "f.csv", "h", (), deadline=None) == "f.csv"
+    assert dashboard._filename_hash_cache == {"f.csv": "h"}            # 부모와 같은 해시로 parquet를 찾는다
+
+
+def test_trim_keeps_the_most_recent_worker_files(monkeypatch):
+    import daily_review
+    keys = [f"h{i}" for i in range(heavy_pool.HEAVY_WORKER_FRAMES + 2)]
+    monkeypatch.setattr(dashboard, "df_cache", {k: object() for k in keys})
+    monkeypatch.setattr(dashboard, "_detail_cache", OrderedDict((k, object()) for k in keys))
+    monkeypatch.setattr(dashboard, "_search_index_cache", {k: object() for k in keys})
+    monkeypatch.setattr(daily_review, "_state_cache", OrderedDict((k, object()) for k in keys))
+    _trim_worker_frames()
+    kept = keys[-heavy_pool.HEAVY_WORKER_FRAMES:]
+    assert list(dashboard.df_cache) == kept
+    assert list(dashboard._detail_cache) == kept
+    assert list(dashboard._search_index_cache) == kept
+    assert list(daily_review._state_cache) == kept
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    monkeypatch.setattr(heavy_pool, "HEAVY_EXECUTION", "process")
+    monkeypatch.setattr(heavy_pool, "HEAVY_WORKERS", 2)
+    monkeypatch.setattr(result_cache, "file_hash_of", lambda filename: "h")
+    monkeypatch.setattr(dashboard, "cached_parquet_path", lambda filename: "h.parquet")
+    yield
+    pool = heavy_pool._pool
+    if pool is not None:
+        heavy_pool._reset_pool(pool, terminate=True)
+    heavy_pool.shutdown_pool()
+
+
+def _in_request(token, call, out, key):
+    def run():
+        with bind(token):
+            try:
+                out[key] = call()
+            except RequestCancelled as e:
+                out[key] = e.status_code
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _wait_running(n, timeout=60):
+    end = time.time() + timeout
+    while time.time() < end:
+        with heavy_pool._pool_lock:
+            running = [f for futures in heavy_pool._inflight.values() for f in futures if f.running()]
+        if len(running) >= n:
+            return
+        time.sleep(0.05)
+    pytest.fail("워커가 작업을 시작하지 않았다")
+
+
+def test_disconnect_stops_only_its_own_job(process_pool):
+    out = {}
+    leaving, staying = CancelToken(time.time() + 120), CancelToken(time.time() + 120)
+    threads = [_in_request(staying, lambda: run_heavy(MODULE, "slow", "f.csv", 3.0), out, "staying"),
+               _in_request(leaving, lambda: run_heavy(MODULE, "slow", "f.csv", 60.0), out, "leaving")]
+    _wait_running(2)
+    pool = heavy_pool._pool
+    leaving.cancel("disconnect")
+    threads[1].join(10)
+    assert out["leaving"] == 499                       # 워커가 플래그를 보고 다음 checkpoint에서 멈춘다
+    threads[0].join(30)
+    assert out["staying"] == "done"                    # 같은 풀의 다른 요청은 끝까지 계산된다
+    assert heavy_pool._pool is pool                    # 풀을 갈아엎지 않았다
+
+
+def test_stuck_job_is_terminated_only_when_it_runs_alone(process_pool, monkeypatch):
+    monkeypatch.setattr(heavy_pool, "KILL_GRACE_SECONDS", 0.5)
+    out = {}
+    token = CancelToken(time.time() + 120)
+    thread = _in_request(token, lambda: run_heavy(MODULE, "stuck", "f.csv", 60), out, "stuck")
+    _wait_running(1)
+    pool = heavy_pool._pool
+    token.cancel("disconnect")
+    thread.join(10)
+    assert out["stuck"] == 499
+    assert heavy_pool._pool is not pool                # 혼자 돌던 워커는 종료하고 풀을 새로 만든다
@@ -0,0 +1,117 @@
+"""조건부 GET 테스트 — 해시 주소 ETag·본문 ETag·304·스트리밍 통과·압축 후 약한 ETag 비교.
+실행: PYTHONPATH=api pytest api/tests/test_http_cache.py"""
+import json
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+import http_cache
+from http_cache import CACHE_CONTROL, ConditionalGetMiddleware, body_etag, content_etag
+from responses import CompressionMiddleware, FastJSONRoute
+
+ROWS = [{"month": f"2025-{m:02d}", "sales": m * 1000} for m in range(1, 13)] * 10     # 압축 임계를 넘는 본문
+
+
+@pytest.fixture
+def calls(monkeypatch, tmp_path):
+    monkeypatch.setattr(http_cache, "TARGETS_DIR", str(tmp_path))
+    monkeypatch.setattr(http_cache, "file_hash_of", lambda filename: None if filename == "gone.csv" else f"h-{filename}")
+    return []
+
+
+def _app(calls, compress=False):
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/api/dashboard/summary")
+    def summary(filename: str, part: str = "all"):
+        calls.append(("summary", filename, part))
+        return {"filename": filename, "part": part, "rows": ROWS}
+
+    @router.get("/api/files")
+    def files():
+        calls.append(("files",))
+        return {"files": ROWS}
+
+    @router.get("/api/stream")
+    def stream(no_store: bool = False):
+        lines = (json.dumps(row).encode() + b"\n" for row in ROWS)
+        return StreamingResponse(lines, media_type="application/x-ndjson",
+                                 headers={"Cache-Control": "no-store"} if no_store else None)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ConditionalGetMiddleware)
+    if compress:
+        app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+def test_content_etag_is_addressed_by_file_hash_route_and_query(calls):
+    tag = content_etag("/api/dashboard/summary", b"filename=a.csv&part=all")
+    assert tag.startswith('"') and tag.endswith('"')
+    assert content_etag("/api/dashboard/summary", b"part=all&filename=a.csv") == tag        # 쿼리 순서 무관
+    assert content_etag("/api/dashboard/summary", b"filename=a.csv&part=x") != tag
+    assert content_etag("/api/dashboard/summary", b"filename=b.csv&part=all") != tag
+    # 라우터가 / 와 /api 두 곳에 마운트 — 같은 자원은 같은 ETag
+    assert content_etag("/api/monthly-review/months/", b"filename=a.csv") == \
+        content_etag("/monthly-review/months/", b"filename=a.csv")
+    assert content_etag("/api/files", b"filename=a.csv") is None                      # 해시 주소 경로가 아님
+    assert content_etag("/api/dashboard/summary", b"part=all") is None                 # filename 없음
+    assert content_etag("/api/dashboard/summary", b"filename=gone.csv") is None        # 해시 모름
+
+
+def test_content_etag_changes_with_the_target_files(calls, tmp_path):
+    tag = content_etag("/monthly-review/summary/", b"filename=a.csv&month=2025-06")
+    (tmp_path / "targets.csv").write_text("월,파트,목표\n")
+    assert content_etag("/monthly-review/summary/", b"filename=a.csv&month=2025-06") != tag
+
+
+def test_hash_addressed_revalidation_skips_the_endpoint(calls):
+    client = _app(calls)
+    first = client.get("/api/dashboard/summary", params={"filename": "a.csv"})
+    assert first.status_code == 200
+    assert first.headers["etag"] == content_etag("/api/dashboard/summary", b"filename=a.csv")
+    assert first.headers["cache-control"] == CACHE_CONTROL
+
+    again = client.get("/api/dashboard/summary", params={"filename": "a.csv"},
+                       headers={"If-None-Match": first.headers["etag"]})
+    assert (again.status_code, again.content) == (304, b"")
+    assert again.headers["etag"] == first.headers["etag"]
+    assert calls == [("summary", "a.csv", "all")]                      # 304는 집계 없이
+
+    other = client.get("/api/dashboard/summary", params={"filename": "a.csv", "part": "x"},
+                       headers={"If-None-Match": first.headers["etag"]})
+    assert other.status_code == 200
+
+
+def test_other_json_gets_a_body_etag(calls):
+    client = _app(calls)
+    first = client.get("/api/files")
+    assert first.headers["etag"] == body_etag(first.content)
+    again = client.get("/api/files", headers={"If-None-Match": f'"stale", {first.headers["etag"]}'})
+    assert (again.status_code, again.content) == (304, b"")
+    assert len(calls) == 2                                             # 본문 ETag는 계산 뒤 전송만 아낀다
+
+
+@pytest.mark.parametrize("no_store", [True, False])
+def test_streaming_and_no_store_responses_pass_through(calls, no_store):
+    client = _app(calls)
+    response = client.get("/api/stream", params={"no_store": no_store}, headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert [json.loads(line) for line in response.text.splitlines()] == ROWS
+
+
+def test_gzip_weakens_the_etag_and_the_weak_tag_still_revalidates(calls):
+    client = _app(calls, compress=True)
+    for path, params in (("/api/dashboard/summary", {"filename": "a.csv"}), ("/api/files", {})):
+        first = client.get(path, params=params, headers={"Accept-Encoding": "gzip"})
+        assert first.headers["content-encoding"] == "gzip"
+        weak = first.headers["etag"]
+        assert weak.startswith('W/"')
+
+        again = client.get(path, params=params, headers={"Accept-Encoding": "gzip", "If-None-Match": weak})
+        assert again.status_code == 304
+        assert again.headers["etag"] == weak
@@ -0,0 +1,60 @@
+"""업로드 후 기본 화면 미리 계산 테스트 — 뷰 순서·실패 기록. 실행: PYTHONPATH=api pytest api/tests/test_materialize.py"""
+import pytest
+
+import daily_review
+import dashboard_batch
+import monthly_review
+import result_cache
+from materialize import DASHBOARD_VIEWS, MONTHLY_PARTS, materialize
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    log = []
+    monkeypatch.setattr(result_cache, "file_hash_of", lambda filename: "0123456789abcdef")
+    monkeypatch.setattr(monthly_review, "_ensure_file_on_disk", lambda filename: log.append(("sync", filename)) or True)
+    monkeypatch.setattr(dashboard_batch, "prepare", lambda filename: log.append(("prepare", filename)))
+    monkeypatch.setattr(dashboard_batch, "run_widget", lambda filename, widget, params: log.append(("widget", widget)))
+    monkeypatch.setattr(monthly_review, "list_months", lambda filename: {"months": ["2026-06", "2026-05"]})
+    monkeypatch.setattr(monthly_review, "get_summary",
+                        lambda filename, month, part, target_file, format: log.append(("monthly", month, part)))
+    monkeypatch.setattr(daily_review, "_latest_filename", lambda: "260615.csv")
+    monkeypatch.setattr(daily_review, "get_daily_review_summary",
+                        lambda filename, target_date: log.append(("daily", filename)))
+    return log
+
+
+def test_file_is_synced_and_loaded_before_the_first_view(calls):
+    record = materialize("260615.csv")
+    assert calls[:2] == [("sync", "260615.csv"), ("prepare", "260615.csv")]
+    assert calls[2:] == ([("widget", widget) for _, widget, _ in DASHBOARD_VIEWS]
+                         + [("monthly", "2026-06", part) for part in MONTHLY_PARTS]
+                         + [("daily", "260615.csv")])
+    assert record["failed"] == {}
+    assert len(record["views"]) == len(DASHBOARD_VIEWS) + len(MONTHLY_PARTS) + 1
+    assert record["file_hash"] == "0123456789ab"
+
+
+def test_daily_review_is_only_materialised_for_the_latest_file(calls):
+    materialize("260614.csv")
+    assert not [c for c in calls if c[0] == "daily"]
+
+
+def test_unsynced_file_is_recorded_once_not_per_view(calls, monkeypatch):
+    monkeypatch.setattr(monthly_review, "_ensure_file_on_disk", lambda filename: False)
+    record = materialize("gone.csv")
+    assert record["views"] == []
+    assert list(record["failed"]) == ["*"]
+    assert calls == []
+
+
+def test_one_failing_view_does_not_stop_the_rest(calls, monkeypatch):
+    def run_widget(filename, widget, params):
+        if widget == "alerts":
+            raise RuntimeError("boom")
+        calls.append(("widget", widget))
+
+    monkeypatch.setattr(dashboard_batch, "run_widget", run_widget)
+    record = materialize("260615.csv")
+    assert record["failed"] == {"dashboard/alerts": "boom"}
+    assert "daily-review/summary" in record["views"]
@@ -0,0 +1,61 @@
+"""월 리뷰 summary 회귀 테스트 — 월×차원 집계가 이전(월·차원별 필터) 구현과 같은 응답을 내는지 고정한다.
+실행: PYTHONPATH=api pytest api/tests/test_monthly_review.py"""
+import pytest
+from fastapi import HTTPException
+
+import monthly_review
+from synthetic import FRAME, digest, use_synthetic_file
+
+DIGESTS = {
+    "all": "ad43fbc7c07f1558",
+    "ecommerce": "c1c29b189a284367",
+    "offline": "1961740b1a148c54",
+}
+
+
+@pytest.fixture(autouse=True)
+def _synthetic_file(monkeypatch):
+    use_synthetic_file(monkeypatch)
+
+
+def _summary(part, **kwargs):
+    return monthly_review.get_summary(filename="synthetic.csv", month="2025-06", part=part,
+                                      target_file=None, format="json", **kwargs)
+
+
+@pytest.mark.parametrize("part", list(DIGESTS))
+def test_summary_matches_the_previous_implementation(part):
+    assert digest(_summary(part)) == DIGESTS[part]
+
+
+def test_charts_are_plain_month_sums():
+    summary = _summary("all")
+    assert summary["chart1"] == {"target": None, "actual": 14899724.0, "achievement_rate": None}
+    assert summary["chart2"][-2:] == [
+        {"month": "2025-05", "current_year": 27906533.0, "prev_year": 27453601.0},
+        {"month": "2025-06", "current_year": 14899724.0, "prev_year": 26595319.0},
+    ]
+    assert summary["chart2"][-1]["current_year"] == FRAME.loc[FRAME["월구분"] == 2506, "판매액"].sum()
+
+
+def test_all_parts_response_holds_each_part_summary():
+    combined = _summary("*")
+    assert list(combined) == ["month", "part", "parts"]
+    assert (combined["month"], combined["part"]) == ("2025-06", "*")
+    assert list(combined["parts"]) == list(monthly_review.PART_LABELS)
+    for part, summary in combined["parts"].items():
+        single = _summary(part)
+        assert list(summary) == list(single)
+        assert {k: v for k, v in summary.items() if k != "channel_issue"} == \
+               {k: v for k, v in single.items() if k != "channel_issue"}
+        # part="*"는 channel_issue를 전 파트 채운다 — 요청 파트 항목은 단일 파트 응답과 같다
+        assert summary["channel_issue"][part] == single["channel_issue"][part]
+        assert all(issue["channels"] for issue in summary["channel_issue"].values())
+
+
+def test_all_parts_fail_as_a_whole_when_one_part_is_invalid(monkeypatch):
+    use_synthetic_file(monkeypatch, FRAME.drop(columns=["주력 채널"]))
+    assert _summary("all")["chart1"]["actual"] == 14899724.0
+    with pytest.raises(HTTPException) as e:
+        _summary("*")
+    assert (e.value.status_code, e.value.detail) == (400, "CSV에 '주력 채널' 컬럼이 없습니다.")
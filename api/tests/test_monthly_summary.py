@@ -0,0 +1,25 @@
+"""월 요약 회귀 테스트 — 카테고리×일 집계가 이전(카테고리별 필터) 구현과 같은 요약을 내는지 고정한다.
+실행: PYTHONPATH=api pytest api/tests/test_monthly_summary.py"""
+import pytest
+
+import dashboard
+from synthetic import digest, use_synthetic_file
+
+DIGEST = "86be0138a78b976a"
+
+
+@pytest.fixture(autouse=True)
+def _synthetic_file(monkeypatch):
+    use_synthetic_file(monkeypatch)
+
+
+def test_monthly_summary_matches_the_previous_implementation():
+    summary = dashboard.get_monthly_summary("synthetic.csv")
+    assert summary["meta"] == {"current_month": "2025-06", "prev_month": "2025-05", "max_date": "2025-06-17"}
+    assert summary["data"]["전체"] == {
+        "current_total": 14899724, "current_daily_avg": 876454, "current_days": 17, "latest_day_sales": 805356,
+        "growth_rate": -2.6, "prev_total": 27906533, "prev_daily_avg": 900210,
+        "last_3months_total": 27328192, "last_3months_daily_avg": 891136, "last_3months_days": 92,
+        "prev_year_total": 26595319, "prev_year_daily_avg": 886510,
+    }
+    assert digest(summary) == DIGEST
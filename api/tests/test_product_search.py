@@ -0,0 +1,47 @@
+"""상품 검색 회귀 테스트 — n-gram 색인 검색이 이전(전체 행 str.contains) 구현과 같은 응답을 내는지 고정한다.
+실행: PYTHONPATH=api pytest api/tests/test_product_search.py"""
+import numpy as np
+import pytest
+
+import dashboard
+from synthetic import FRAME, digest, use_synthetic_file
+
+DIGESTS = {
+    "얼룩": "eb883e1ab14898d8",
+    "BABY": "d598415e49e825cb",
+    "크림 50": "829db03c3ea1a0c9",
+}
+
+
+@pytest.fixture(autouse=True)
+def _synthetic_file(monkeypatch):
+    use_synthetic_file(monkeypatch)
+
+
+@pytest.mark.parametrize("keyword", list(DIGESTS))
+def test_product_search_matches_the_previous_implementation(keyword):
+    result = dashboard.get_product_search_sales("synthetic.csv", keyword)
+    assert digest(result) == DIGESTS[keyword]
+
+
+def test_product_search_treats_regex_syntax_literally():
+    rows = dashboard._product_search_rows("synthetic.csv", FRAME, "(wipes) [80")
+    expected = np.flatnonzero(FRAME["품목명[규격]"].str.contains("(wipes) [80", case=False, regex=False))
+    assert len(expected) and rows.tolist() == expected.tolist()
+    assert not len(dashboard._product_search_rows("synthetic.csv", FRAME, "[("))
+
+
+@pytest.mark.parametrize("keyword,names", [
+    ("(Wipes)", ["Baby (Wipes) [80매]"]),
+    ("[80", ["Baby (Wipes) [80매]"]),
+    ("세제 1L", ["순한 세제 1L"]),
+    ("+", []),
+    ("(", ["Baby (Wipes) [80매]"]),
+    ("컵 [", []),
+])
+def test_combined_search_matches_regex_metacharacters_literally(keyword, names):
+    result = dashboard.get_product_search("synthetic.csv", keyword)
+    assert [item["name"] for item in result["matched_products"]["items"]] == names
+    rows = FRAME[FRAME["품목명[규격]"].isin(names)]
+    assert sum(result["monthly"]["sales"]) == rows["판매액"].sum()
+    assert result["label"] == f"검색: {keyword} ({len(names)}건)"
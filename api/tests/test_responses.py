@@ -0,0 +1,128 @@
+"""응답 직렬화·압축 테스트 — numpy·NaN 직렬화, Accept-Encoding 협상, 압축 임계·통과 조건.
+실행: PYTHONPATH=api pytest api/tests/test_responses.py"""
+import datetime
+import decimal
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+import responses
+from responses import COMPRESS_MIN_BYTES, CompressionMiddleware, FastJSONRoute, _negotiate, dumps
+
+BIG = {"rows": [{"month": f"2025-{m:02d}", "sales": m * 1000} for m in range(1, 13)] * 20}
+
+
+def test_dumps_writes_numpy_values_natively():
+    out = json.loads(dumps({
+        "int": np.int64(3), "float": np.float32(1.5), "bool": np.bool_(True),
+        "array": np.array([1.0, 2.5]), "matrix": np.array([[1, 2], [3, 4]]),
+        "series": pd.Series([1, 2]), 7: "int key",
+    }))
+    assert out == {"int": 3, "float": 1.5, "bool": True, "array": [1.0, 2.5], "matrix": [[1, 2], [3, 4]],
+                   "series": [1, 2], "7": "int key"}
+
+
+def test_dumps_writes_nan_and_inf_as_null():
+    out = json.loads(dumps({"nan": float("nan"), "inf": float("inf"), "np_nan": np.float64("nan"),
+                            "array": np.array([1.0, np.nan, -np.inf])}))
+    assert out == {"nan": None, "inf": None, "np_nan": None, "array": [1.0, None, None]}
+
+
+def test_dumps_matches_jsonable_encoder_for_other_types():
+    out = json.loads(dumps({"ts": pd.Timestamp("2025-06-01"), "nat": pd.NaT, "period": pd.Period("2025-06", freq="M"),
+                            "date": datetime.date(2025, 6, 1), "decimal": decimal.Decimal("1.50"), "set": {3}}))
+    assert out == {"ts": "2025-06-01T00:00:00", "nat": None, "period": "2025-06", "date": "2025-06-01",
+                   "decimal": "1.50", "set": [3]}
+    with pytest.raises(TypeError):
+        dumps({"x": object()})
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("", None),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0.1, gzip;q=1.0", "gzip"),            # q가 높은 쪽
+    ("br;q=0.5, gzip;q=0.5", "br"),              # 같으면 br
+    ("gzip;q=0", None),
+    ("gzip;q=oops", None),                        # 읽을 수 없는 q는 거부로
+    ("identity;q=0, gzip;q=0.5", "gzip"),
+    ("identity;q=0", None),                       # 지원하는 압축이 없으면 원문 그대로
+    ("deflate", None),
+])
+def test_negotiate(header, expected):
+    assert _negotiate(header) == expected
+
+
+def test_negotiate_without_brotli_falls_back_to_gzip(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+    assert _negotiate("br, gzip") == "gzip"
+    assert _negotiate("br") is None
+
+
+@pytest.fixture
+def client():
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/small")
+    def small():
+        return {"ok": True}
+
+    @router.get("/big")
+    def big():
+        return {**BIG, "total": np.int64(78000)}
+
+    @router.get("/stream")
+    def stream():
+        return StreamingResponse((json.dumps(row).encode() + b"\n" for row in BIG["rows"]),
+                                 media_type="application/x-ndjson")
+
+    @router.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(dumps(BIG)), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+def test_small_bodies_are_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert len(response.content) < COMPRESS_MIN_BYTES
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_large_bodies_are_compressed(client, encoding):
+    response = client.get("/big", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(dumps({**BIG, "total": 78000}))
+    assert response.json() == {**BIG, "total": 78000}                 # 클라이언트가 풀어 읽는다
+
+
+def test_large_bodies_stay_plain_without_an_accepted_encoding(client):
+    response = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json()["total"] == 78000
+
+
+def test_streaming_bodies_pass_through(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert [json.loads(line) for line in response.text.splitlines()] == BIG["rows"]
+
+
+def test_already_encoded_bodies_are_not_compressed_again(client):
+    response = client.get("/encoded", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == BIG
@@ -0,0 +1,98 @@
+"""결과 캐시 테스트 — 키·동시 미스 공유·예외 비캐시·파일별 비우기. 실행: PYTHONPATH=api pytest api/tests/test_result_cache.py"""
+import threading
+import time
+
+import pytest
+
+import result_cache
+from result_cache import cached_result, clear_result_cache, peek_result
+
+
+@pytest.fixture(autouse=True)
+def _memory_only(monkeypatch, tmp_path):
+    """파일 해시는 파일명 그대로, 디스크 스필 없이 메모리만. 비우기가 실제 스필 디렉터리를 건드리지 않게 한다."""
+    monkeypatch.setattr(result_cache, "RESULTS_DIR", str(tmp_path))
+    monkeypatch.setattr(result_cache, "file_hash_of", lambda filename: f"hash-{filename}")
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_SPILL", False)
+    clear_result_cache()
+    yield
+    clear_result_cache()
+
+
+def test_same_key_is_computed_once_and_none_params_are_ignored():
+    calls = []
+    compute = lambda: calls.append(1) or {"n": len(calls)}
+    first = cached_result("e", "f.csv", {"a": 1, "b": None}, compute)
+    assert cached_result("e", "f.csv", {"a": "1"}, compute) is first
+    assert cached_result("e", "f.csv", {"a": 1}, compute, version=2) == {"n": 2}
+    assert cached_result("e", "g.csv", {"a": 1}, compute) == {"n": 3}
+    assert peek_result("e", "f.csv", {"a": 1}) is first
+
+
+def test_concurrent_misses_share_one_computation():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cached_result("e", "f.csv", {}, compute)))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    started.wait(5)
+    time.sleep(0.05)                       # 나머지 스레드가 in-flight future에서 기다리게
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 1
+    assert len(results) == 4 and all(r is results[0] for r in results)
+
+
+def test_failure_is_shared_with_waiters_but_not_cached():
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            cached_result("e", "f.csv", {}, failing)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for t in threads:
+        t.start()
+    started.wait(5)
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(errors) == 2
+    assert peek_result("e", "f.csv", {}) is None
+    assert cached_result("e", "f.csv", {}, lambda: "ok") == "ok"
+
+
+def test_unknown_hash_bypasses_the_cache(monkeypatch):
+    monkeypatch.setattr(result_cache, "file_hash_of", lambda filename: None)
+    calls = []
+    for _ in range(2):
+        cached_result("e", "missing.csv", {}, lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_clear_by_hash_keeps_other_files():
+    cached_result("e", "f.csv", {}, lambda: "f")
+    cached_result("e", "g.csv", {}, lambda: "g")
+    clear_result_cache("hash-f.csv")
+    assert peek_result("e", "f.csv", {}) is None
+    assert peek_result("e", "g.csv", {}) == "g"
@@ -0,0 +1,24 @@
+"""매출 알림 회귀 테스트 — 세그먼트×월 행렬이 이전(세그먼트별 필터) 구현과 같은 알림을 내는지 고정한다.
+실행: PYTHONPATH=api pytest api/tests/test_sales_alerts.py"""
+import pytest
+
+import dashboard
+from synthetic import digest, use_synthetic_file
+
+DIGEST = "a02bdc00e6339c89"
+
+
+@pytest.fixture(autouse=True)
+def _synthetic_file(monkeypatch):
+    use_synthetic_file(monkeypatch)
+
+
+def test_sales_alerts_match_the_previous_implementation():
+    alerts = dashboard.analyze_sales_performance("synthetic.csv")
+    assert len(alerts) == 24
+    assert alerts[0] == {
+        "context": "이커머스 - 전체", "target": "전월", "status": "bad",
+        "message": "일평균 매출 2.8% 감소, 이익률 2.4%p 개선",
+        "metrics": {"curr_sales": 394379, "curr_margin": 27.2, "base_sales": 405807, "base_margin": 24.7},
+    }
+    assert digest(alerts) == DIGEST
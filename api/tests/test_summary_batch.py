@@ -0,0 +1,82 @@
+"""월 리뷰 일괄 summary 테스트 — json/ndjson 응답이 월·파트별 /summary/와 같은지, 도중 실패가 오류 줄로 끝나는지.
+실행: PYTHONPATH=api pytest api/tests/test_summary_batch.py"""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import monthly_review
+from cancellation import RequestCancelled
+from synthetic import FRAME, use_synthetic_file
+
+URL = "/monthly-review/summary/batch/"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    use_synthetic_file(monkeypatch)
+    app = FastAPI()
+    app.include_router(monthly_review.router)
+    return TestClient(app)
+
+
+def _query(**params):
+    return {"filename": "synthetic.csv", "start_month": "2025-05", "end_month": "2025-06", **params}
+
+
+def _single(month, part):
+    return json.loads(json.dumps(monthly_review.get_summary(filename="synthetic.csv", month=month, part=part,
+                                                            target_file=None, format="json")))
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_json_batch_equals_each_summary(client):
+    response = client.get(URL, params=_query(parts="all,offline"))
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["months"], body["parts"]) == (["2025-05", "2025-06"], ["all", "offline"])
+    for month in body["months"]:
+        for part in body["parts"]:
+            assert body["summaries"][month][part] == _single(month, part)
+
+
+def test_ndjson_batch_streams_one_line_per_month_and_part(client):
+    response = client.get(URL, params=_query(parts="all,offline", format="ndjson"))
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["cache-control"] == "no-store"
+    lines = _ndjson(response)
+    assert [(line["month"], line["part"]) for line in lines] == [
+        ("2025-05", "all"), ("2025-05", "offline"), ("2025-06", "all"), ("2025-06", "offline")]
+    assert all(line["summary"] == _single(line["month"], line["part"]) for line in lines)
+
+
+def test_invalid_part_fails_the_json_batch_and_ends_the_ndjson_stream(client, monkeypatch):
+    use_synthetic_file(monkeypatch, FRAME.drop(columns=["주력 채널"]))
+    response = client.get(URL, params=_query(parts="all,ecommerce"))
+    assert (response.status_code, response.json()["detail"]) == (400, "CSV에 '주력 채널' 컬럼이 없습니다.")
+
+    # 첫 항목(2025-05 all)은 나간 뒤 — 오류는 마지막 줄로
+    response = client.get(URL, params=_query(parts="all,ecommerce", format="ndjson"))
+    assert response.status_code == 200
+    lines = _ndjson(response)
+    assert [(line.get("month"), line.get("part")) for line in lines] == [("2025-05", "all"), (None, None)]
+    assert lines[-1] == {"section": "error", "status": 400, "detail": "CSV에 '주력 채널' 컬럼이 없습니다."}
+
+
+def test_cancelled_month_ends_the_ndjson_stream(client, monkeypatch):
+    build = monthly_review._build_summary
+
+    def build_until_june(agg, month, part, *args, **kwargs):
+        if month == "2025-06":
+            raise RequestCancelled("budget")
+        return build(agg, month, part, *args, **kwargs)
+
+    monkeypatch.setattr(monthly_review, "_build_summary", build_until_june)
+    lines = _ndjson(client.get(URL, params=_query(parts="all", format="ndjson")))
+    assert [line.get("month") for line in lines] == ["2025-05", None]
+    assert (lines[-1]["section"], lines[-1]["status"]) == ("error", 504)
@@ -0,0 +1,88 @@
+"""월 리뷰 섹션 스트리밍 테스트 — ndjson/SSE 섹션을 합치면 json 응답과 같고, 컬럼 오류는 스트리밍 전에 400.
+실행: PYTHONPATH=api pytest api/tests/test_summary_stream.py"""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import monthly_review
+from cancellation import RequestCancelled
+from synthetic import FRAME, use_synthetic_file
+
+URL = "/monthly-review/summary/"
+MISSING_MAIN = "CSV에 '주력 채널' 컬럼이 없습니다."
+
+
+@pytest.fixture
+def client(monkeypatch):
+    use_synthetic_file(monkeypatch)
+    app = FastAPI()
+    app.include_router(monthly_review.router)
+    return TestClient(app)
+
+
+def _get(client, part, fmt):
+    return client.get(URL, params={"filename": "synthetic.csv", "month": "2025-06", "part": part, "format": fmt})
+
+
+def _events(response, fmt):
+    if fmt == "ndjson":
+        return [json.loads(line) for line in response.text.splitlines()]
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        name, data = block.split("\n")
+        event = json.loads(data[len("data: "):])
+        assert name == "event: " + event["section"]
+        events.append(event)
+    return events
+
+
+def _merged(events):
+    by_part: dict = {}
+    for event in events[:-1]:
+        by_part.setdefault(event["part"], {}).update(event["data"])
+    return by_part
+
+
+@pytest.mark.parametrize("fmt,media_type", [("ndjson", "application/x-ndjson"), ("sse", "text/event-stream")])
+@pytest.mark.parametrize("part", ["ecommerce", "*"])
+def test_sections_add_up_to_the_json_response(client, part, fmt, media_type):
+    response = _get(client, part, fmt)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(media_type)
+    assert response.headers["cache-control"] == "no-store"
+    events = _events(response, fmt)
+    assert events[-1] == {"section": "end"}
+    parts = list(monthly_review.PART_LABELS) if part == "*" else [part]
+    # 섹션 순서대로, part="*"는 섹션마다 전 파트 — 모든 chart1이 먼저 나간다
+    assert [(e["part"], e["section"]) for e in events[:len(parts)]] == [(p, "chart1") for p in parts]
+    assert len(events) == len(monthly_review.SUMMARY_SECTIONS) * len(parts) + 1
+
+    expected = _get(client, part, "json").json()
+    assert _merged(events) == (expected["parts"] if part == "*" else {part: expected})
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "sse"])
+@pytest.mark.parametrize("part", ["ecommerce", "*"])
+def test_invalid_column_fails_before_streaming(client, monkeypatch, part, fmt):
+    use_synthetic_file(monkeypatch, FRAME.drop(columns=["주력 채널"]))
+    response = _get(client, part, fmt)
+    assert (response.status_code, response.json()) == (400, {"detail": MISSING_MAIN})
+    assert _get(client, part, "json").status_code == 400          # json 응답과 같은 오류
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "sse"])
+def test_failure_after_the_first_sections_ends_with_an_error_event(client, monkeypatch, fmt):
+    iter_summary = monthly_review._iter_summary
+
+    def cancelled_after_chart2(*args, **kwargs):
+        for name, data in iter_summary(*args, **kwargs):
+            if name == "chart3":
+                raise RequestCancelled("budget")
+            yield name, data
+
+    monkeypatch.setattr(monthly_review, "_iter_summary", cancelled_after_chart2)
+    events = _events(_get(client, "all", fmt), fmt)
+    assert [e["section"] for e in events] == ["chart1", "chart2", "error"]
+    assert (events[-1]["status"], events[-1]["detail"]) == (504, RequestCancelled("budget").detail)
@@ -6,6 +6,30 @@ import axios from 'axios';
 import { API_BASE_URL } from '@/config/api';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, BarChart, Bar, ComposedChart, Legend, LabelList } from 'recharts';
 
+const TYPE_LABELS: Record<string, string> = {
+    'coupang': '쿠팡(로켓)',
+    'naver_zeze': '스팜(제제지크)',
+    'naver_sonreve': '스팜(쏭레브)',
+    '11st': '11st',
+    'ebay': '이베이',
+    'kakao': '카카오',
+    'cj': 'CJ',
+    'babybilly': '베이비빌리',
+    // New Accounts
+    'overseas': '해외',
+    'emart': '이마트',
+    'lotte': '롯데마트',
+    'daiso': '다이소',
+    'agency': '오프라인 대리점'
+};
+
+// 화면에 그리는 스코프만 요청: 스코프 전체, 스코프_브랜드, 카테고리_스코프 (모르는 type은 이커머스)
+const detailSegments = (type: string) => {
+    if (type === 'main') return 'main_overall,main_*,*_main';
+    const scope = type === 'offline' || TYPE_LABELS[type] ? type : 'ecommerce';
+    return `${scope},${scope}_*,*_${scope}`;
+};
+
 interface CategoryData {
     monthly: { Month: string; 판매액: number; 이익률: number; 일평균매출: number }[];
     daily: { Date: string; 판매액: number; 이익률: number }[];
@@ -227,12 +251,12 @@ function DetailsContent() {
         if (!filename) return;
         const fetchData = async () => {
             try {
-                const response = await axios.get(`${API_BASE_URL}/api/dashboard/ecommerce-details`, { params: { filename } });
+                const response = await axios.get(`${API_BASE_URL}/api/dashboard/ecommerce-details`, { params: { filename, segments: detailSegments(type) } });
                 setData(response.data);
             } catch (err) { console.error(err); } finally { setLoading(false); }
         };
         fetchData();
-    }, [filename]);
+    }, [filename, type]);
 
     if (loading) return (
         <div className="min-h-screen bg-white flex items-center justify-center">
@@ -253,23 +277,7 @@ function DetailsContent() {
     if (isOffline) typeLabel = "오프라인";
     else if (isMain) typeLabel = "이커머스 주력채널(쿠팡 제외)";
     else {
-        const typeMap: Record<string, string> = {
-            'coupang': '쿠팡(로켓)',
-            'naver_zeze': '스팜(제제지크)',
-            'naver_sonreve': '스팜(쏭레브)',
-            '11st': '11st',
-            'ebay': '이베이',
-            'kakao': '카카오',
-            'cj': 'CJ',
-            'babybilly': '베이비빌리',
-            // New Accounts
-            'overseas': '해외',
-            'emart': '이마트',
-            'lotte': '롯데마트',
-            'daiso': '다이소',
-            'agency': '오프라인 대리점'
-        };
-        if (typeMap[type]) typeLabel = typeMap[type];
+        if (TYPE_LABELS[type]) typeLabel = TYPE_LABELS[type];
     }
 
     const brandPrefix = isMain ? "주력채널" : (isOffline ? "오프라인" : (type && type !== 'ecommerce' ? typeLabel : "이커머스"));
@@ -34,7 +34,7 @@ export default function DailyReviewPage() {
     setError(null);
     try {
       const res = await axios.get<DailyReview>(`${API_BASE_URL}/api/daily-review/summary/`, {
-        params: { ...(date ? { target_date: date } : {}), t: Date.now() },
+        params: date ? { target_date: date } : {},
         timeout: 60000,
       });
       setData(res.data);
@@ -283,7 +283,9 @@ export default function MonthlyReviewPage() {
   const [month, setMonth] = useState<string>("");
   const [part, setPart] = useState<Part>("all");
 
-  const [summary, setSummary] = useState<SummaryResponse | null>(null);
+  // part="*"로 전 파트를 한 번에 받아 두고 탭 전환은 로컬에서 선택 (재요청 없음)
+  const [summaries, setSummaries] = useState<Record<Part, SummaryResponse> | null>(null);
+  const summary = summaries?.[part] ?? null;
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [uploadingTarget, setUploadingTarget] = useState(false);
@@ -418,19 +420,19 @@ export default function MonthlyReviewPage() {
   // 종합 요약 로드
   useEffect(() => {
     if (!salesFile || !month) {
-      setSummary(null);
+      setSummaries(null);
       return;
     }
     setLoading(true);
     setError(null);
     axios
       .get(`${API_BASE_URL}/api/monthly-review/summary/`, {
-        params: { filename: salesFile, month, part, target_file: targetFile || undefined },
+        params: { filename: salesFile, month, part: "*", target_file: targetFile || undefined },
       })
-      .then((res) => setSummary(res.data))
+      .then((res) => setSummaries(res.data.parts))
       .catch((e) => setError(e?.response?.data?.detail || "데이터 로드 실패"))
       .finally(() => setLoading(false));
-  }, [salesFile, month, part, targetFile]);
+  }, [salesFile, month, targetFile]);
 
   const handleTargetUpload = async (e: React.ChangeEvent<HTMLInputElement>) => {
     const file = e.target.files?.[0];
@@ -20,9 +20,9 @@ interface Row {
   sub?: string;      // 채널 / ERP 원본 / 배지
   badge?: string;    // 변동 큼
   net: number;
-  ref_min: number;
-  ref_max: number;
-  ref_median: number;
+  ref_min: number | null;
+  ref_max: number | null;
+  ref_median: number | null;
   ref_n: number;
   position: string;
   net_60d: number;
@@ -30,15 +30,18 @@ interface Row {
 }
 
 function Bar({ r }: { r: Row }) {
-  const lo = Math.min(r.ref_min, r.net, 0);
-  const hi = Math.max(r.ref_max, r.net);
+  const { ref_min, ref_max } = r;
+  if (ref_min === null || ref_max === null) return null;
+
+  const lo = Math.min(ref_min, r.net, 0);
+  const hi = Math.max(ref_max, r.net);
   const span = hi - lo || 1;
   const pct = (x: number) => ((x - lo) / span) * 100;
   return (
     <div className="relative h-[6px] w-full rounded-[3px]" style={{ background: "#f0f0f0" }}>
       <div
         className="absolute h-full rounded-[3px]"
-        style={{ left: `${pct(r.ref_min)}%`, width: `${pct(r.ref_max) - pct(r.ref_min)}%`, background: "#d9d9d9" }}
+        style={{ left: `${pct(ref_min)}%`, width: `${pct(ref_max) - pct(ref_min)}%`, background: "#d9d9d9" }}
       />
       <div
         className="absolute top-[-3px] h-[12px] w-[2px]"
@@ -37,9 +37,9 @@ export interface AChannelRow {
 interface WatchBase {
   net: number;
   net_60d: number;
-  ref_min: number;
-  ref_max: number;
-  ref_median: number;
+  ref_min: number | null;   // 참조표본(같은 요일 정상코어일)이 아직 없으면 null — position은 '표본 부족'
+  ref_max: number | null;
+  ref_median: number | null;
   ref_n: number;
   position: string;         // 범위 내 / 범위 상단 초과 / 범위 하단 미만 / 표본 부족
 }